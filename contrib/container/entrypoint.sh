@@ -19,4 +19,11 @@ python manage.py migrate --noinput
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]
+then
+    echo "Resetting Prometheus metrics directory..."
+    rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+    mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
 exec "$@"
\ No newline at end of file
@@ -0,0 +1,268 @@
+"""
+Activity log of the changes made to tracked models.
+
+``track_activity`` connects a model's save and delete signals. The field
+diff of a save is taken in ``pre_save`` against the values the instance
+was loaded with (``LoadedValuesMixin``) and queued with the other
+entries of the transaction; entries of a savepoint that rolls back are
+dropped with it. On commit the entries are pushed to a Redis
+list in one round trip, and ``common.tasks.flush_activity_log`` writes
+them to ActivityLog in batches, ``ACTIVITY_LOG_FLUSH_INTERVAL`` seconds
+later, so a request never waits on the log table. Without ``REDIS_URL``
+(tests, runserver) the entries are written right after the commit.
+
+Writes that skip the model signals, such as ``QuerySet.update()`` or
+``bulk_create()``, are not logged.
+"""
+
+import json
+import logging
+import uuid
+from contextvars import ContextVar
+from functools import lru_cache, partial
+
+import redis
+from redis.exceptions import LockError
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import GeneratedField
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from common.models import ActivityActionEnum, ActivityLog
+
+BUFFER_KEY = "otask:activity:buffer"
+SCHEDULED_KEY = "otask:activity:scheduled"
+FLUSH_LOCK_KEY = "otask:activity:flush"
+PROCESSING_KEY = "otask:activity:processing"
+UNTRACKED_FIELDS = {"id", "created_at", "updated_at", "created_by", "updated_by"}
+
+TARGETS = {}
+
+logger = logging.getLogger(__name__)
+
+_request = ContextVar("activity_request", default=None)
+_encoder = DjangoJSONEncoder()
+
+
+def track_activity(model, target):
+    """Log the creation, changes and deletion of ``model`` rows as ``target``."""
+    TARGETS[model] = target
+    uid = f"activity-{model._meta.label_lower}"
+    pre_save.connect(activity_pre_save, sender=model, dispatch_uid=uid)
+    post_save.connect(activity_saved, sender=model, dispatch_uid=uid)
+    post_delete.connect(activity_deleted, sender=model, dispatch_uid=uid)
+
+
+class ActivityMiddleware:
+    """Makes the current request's user the actor of the logged changes."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _request.reset(token)
+
+    async def __acall__(self, request):
+        token = _request.set(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            _request.reset(token)
+
+
+# ------------------------------------------------------------------ #
+# Recording
+# ------------------------------------------------------------------ #
+def activity_pre_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = getattr(instance, "_loaded_values", None)
+    changes = {}
+    for field in tracked_fields(sender):
+        if field.attname not in instance.__dict__:
+            continue  # Deferred, and so not changed.
+        new = getattr(instance, field.attname)
+        if loaded is None or instance._state.adding:
+            if new not in (None, "", {}):
+                changes[field.name] = [None, jsonable(new)]
+        elif field.attname in loaded and loaded[field.attname] != new:
+            changes[field.name] = [jsonable(loaded[field.attname]), jsonable(new)]
+    instance._activity_changes = changes
+
+
+def activity_saved(sender, instance, created=False, raw=False, **kwargs):
+    changes = instance.__dict__.pop("_activity_changes", None)
+    # Other receivers read the old values first, so they are only
+    # replaced once the change is logged.
+    instance._loaded_values = {
+        field.attname: getattr(instance, field.attname)
+        for field in sender._meta.concrete_fields
+        if field.attname in instance.__dict__
+    }
+    if raw or changes is None or (not created and not changes):
+        return
+    action = ActivityActionEnum.CREATED if created else ActivityActionEnum.UPDATED
+    queue_activity(sender, instance, action, changes)
+
+
+def activity_deleted(sender, instance, **kwargs):
+    values = instance.__dict__
+    changes = {
+        field.name: [jsonable(values[field.attname]), None]
+        for field in tracked_fields(sender)
+        if values.get(field.attname) not in (None, "", {})
+    }
+    queue_activity(sender, instance, ActivityActionEnum.DELETED, changes)
+
+
+@lru_cache(maxsize=None)
+def tracked_fields(model):
+    return [
+        field
+        for field in model._meta.concrete_fields
+        if field.name not in UNTRACKED_FIELDS and not isinstance(field, GeneratedField)
+    ]
+
+
+def jsonable(value):
+    if value is None or isinstance(value, (str, int, float, bool, dict, list)):
+        return value
+    return _encoder.default(value)
+
+
+def current_actor(instance, action):
+    request = _request.get()
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return str(user.pk)
+    # Outside a request, fall back to the audit columns.
+    actor = getattr(instance, "updated_by_id", None)
+    if actor is None and action == ActivityActionEnum.CREATED:
+        actor = getattr(instance, "created_by_id", None)
+    return str(actor) if actor else None
+
+
+def queue_activity(model, instance, action, changes):
+    project_id = instance.project_id
+    if not project_id:
+        return
+
+    entry = {
+        "id": str(uuid.uuid4()),
+        "created_at": timezone.now().isoformat(),
+        "project_id": str(project_id),
+        "actor_id": current_actor(instance, action),
+        "target": TARGETS[model],
+        "object_id": str(instance.pk),
+        "action": action,
+        "changes": changes,
+    }
+
+    # Entries share one on_commit hook per savepoint, so Django discards
+    # them with the hook when their savepoint or transaction rolls back.
+    entries = _scheduled_entries()
+    if entries is not None:
+        entries.append(entry)
+    else:
+        transaction.on_commit(partial(flush_pending, [entry]), robust=True)
+
+
+def _scheduled_entries():
+    """The entries of the hook registered under the current savepoint, if any."""
+    connection = transaction.get_connection()
+    savepoints = set(connection.savepoint_ids)
+    for sids, func, _ in connection.run_on_commit:
+        if getattr(func, "func", None) is flush_pending and sids == savepoints:
+            return func.args[0]
+    return None
+
+
+# ------------------------------------------------------------------ #
+# Buffering and writing
+# ------------------------------------------------------------------ #
+def flush_pending(entries):
+    client = get_client()
+    if client is None:
+        write_entries(entries)
+        return
+
+    client.rpush(BUFFER_KEY, *(json.dumps(entry) for entry in entries))
+    interval = settings.ACTIVITY_LOG_FLUSH_INTERVAL
+    if client.set(SCHEDULED_KEY, 1, nx=True, ex=max(int(interval) * 2, 1)):
+        from common.tasks import flush_activity_log
+
+        flush_activity_log.apply_async(countdown=interval)
+
+
+def flush_buffer():
+    """
+    Write the buffered entries in batches of ``ACTIVITY_LOG_BATCH_SIZE``.
+
+    A batch is moved atomically from the buffer to a processing list and
+    only dropped from there once it is written; a flush that died leaves
+    it for the next one to write first. Rewriting an entry is a no-op, so
+    none is lost or logged twice. The lock is renewed for every batch, and
+    a flush that lost it to another stops without dropping anything.
+    """
+    client = get_client()
+    if client is None:
+        return 0
+
+    lock = client.lock(FLUSH_LOCK_KEY, timeout=300, blocking=False)
+    if not lock.acquire():
+        return 0
+    written = 0
+    try:
+        # Entries pushed from now on schedule another flush.
+        client.delete(SCHEDULED_KEY)
+        batch_size = settings.ACTIVITY_LOG_BATCH_SIZE
+        while batch := client.lrange(PROCESSING_KEY, 0, -1) or take_batch(
+            client, batch_size
+        ):
+            write_entries([json.loads(entry) for entry in batch])
+            lock.reacquire()
+            client.delete(PROCESSING_KEY)
+            written += len(batch)
+        lock.release()
+    except LockError:
+        logger.warning("Activity log flush lost its lock, stopping")
+    return written
+
+
+def take_batch(client, batch_size):
+    """Move up to ``batch_size`` entries from the buffer to processing."""
+    pipe = client.pipeline(transaction=True)
+    for _ in range(batch_size):
+        pipe.lmove(BUFFER_KEY, PROCESSING_KEY, "LEFT", "RIGHT")
+    return [entry for entry in pipe.execute() if entry is not None]
+
+
+def write_entries(entries):
+    rows = [
+        ActivityLog(**{**entry, "created_at": parse_datetime(entry["created_at"])})
+        for entry in entries
+    ]
+    ActivityLog.objects.ensure_partitions(row.created_at for row in rows)
+    ActivityLog.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+@lru_cache(maxsize=None)
+def get_client():
+    if getattr(settings, "REDIS_URL", None):
+        return redis.Redis.from_url(settings.REDIS_URL)
+    return None
@@ -1,15 +1,35 @@
+import datetime
+import uuid
+
 from multiprocessing import context
+from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 from rest_framework import permissions
 from rest_framework.views import APIView, Response
 
-from common.serializers import EmailSerializer
+from common.models import (
+    ActivityLog,
+    ActivityTargetEnum,
+    month_start,
+    next_month_start,
+)
+from common.serializers import ActivityLogSerializer, BulkEmailSerializer, EmailSerializer
 from common.services import (
     accept_project_invitation,
+    send_bulk_project_invitations,
     send_project_invitation,
     verify_invite_token,
 )
-from project.models import ProjectMembership
+from otaskmanagement.db import pool_stats
+from otaskmanagement.pagination import (
+    KEYSET_ORDERING,
+    after_cursor,
+    decode_cursor,
+    encode_cursor,
+)
+from otaskmanagement.permissions import CheckAPIPermission
+from project.models import Project, ProjectMembership
+from users.permissions import has_user_permission
 
 
 class SendEmailMember(APIView):
@@ -40,6 +60,33 @@ class SendEmailMember(APIView):
             return Response({"Message": str(e)}, status=500)
 
 
+class SendBulkEmailMember(APIView):
+    """Invites a list of addresses to the project in one request."""
+
+    permission_classes = [permissions.IsAuthenticated]
+    required_permission = "add_projectinvitation"
+
+    def post(self, request, *args, **kwargs):
+        project_id = self.kwargs["pk"]
+        if not has_user_permission(request.user, project_id, self.required_permission):
+            return Response({"detail": "Permission denied."}, status=403)
+
+        serializer = BulkEmailSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            result = send_bulk_project_invitations(
+                project_id=project_id,
+                emails=serializer.validated_data["emails"],
+                role=serializer.validated_data["role"],
+                invited_by=request.user,
+            )
+        except Project.DoesNotExist:
+            return Response({"detail": "Project not found."}, status=404)
+
+        return Response(result, status=200)
+
+
 class VerifyInvitation(APIView):
     permission_classes = [permissions.AllowAny]
 
@@ -82,3 +129,95 @@ class AcceptInvitation(APIView):
             },
             status=201,
         )
+
+
+class DatabasePoolStats(APIView):
+    """Connection pool statistics of the worker process serving the request."""
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(pool_stats())
+
+
+class ProjectActivity(APIView):
+    """
+    A project's activity log, newest first.
+
+    A page never spans two months, so it is read from a single partition
+    through the ``(project, created_at)`` index. A page that reaches the
+    start of a month ends there, possibly short or empty, and its
+    ``next_cursor`` continues with the month before; follow it until it
+    is null. Changes show up once the buffered entries are written.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, CheckAPIPermission]
+    required_permission = "view_project"
+    page_size = 50
+    max_page_size = 200
+
+    def get_project(self):
+        return self.kwargs["project_id"]
+
+    def get_queryset(self):
+        return ActivityLog.objects.filter(project_id=self.kwargs["project_id"])
+
+    def get_page_size(self):
+        value = self.request.query_params.get("page_size")
+        if value is None:
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            raise ValidationError({"page_size": "A valid integer is required."})
+        return max(1, min(page_size, self.max_page_size))
+
+    def get(self, request, *args, **kwargs):
+        page_size = self.get_page_size()
+        cursor = request.query_params.get("cursor")
+        upper = decode_cursor(cursor)[0] if cursor else timezone.now()
+        # The month holding the newest row the page may contain.
+        lower = month_start(upper - datetime.timedelta(microseconds=1))
+
+        activity = self.get_queryset().filter(
+            created_at__gte=lower, created_at__lt=next_month_start(lower)
+        )
+        if cursor:
+            activity = activity.filter(after_cursor(cursor))
+        rows = list(activity.order_by(*KEYSET_ORDERING)[: page_size + 1])
+
+        if len(rows) > page_size:
+            next_cursor = encode_cursor(rows[page_size - 1])
+        elif lower > self.get_oldest():
+            # Every row of the month was returned: go on before its start.
+            next_cursor = encode_cursor({"created_at": lower, "id": MONTH_END_ID})
+        else:
+            next_cursor = None
+
+        return Response(
+            {
+                "next_cursor": next_cursor,
+                "results": ActivityLogSerializer(rows[:page_size], many=True).data,
+            }
+        )
+
+    def get_oldest(self):
+        project = Project.objects.filter(pk=self.kwargs["project_id"])
+        return project.values_list("created_at", flat=True).first() or timezone.now()
+
+
+class IssueActivity(ProjectActivity):
+    """An issue's activity log, paginated as the project's."""
+
+    required_permission = "view_issues"
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .filter(target=ActivityTargetEnum.ISSUE, object_id=self.kwargs["pk"])
+        )
+
+
+# Sorts after every id, so a cursor at a month's start skips all its rows.
+MONTH_END_ID = uuid.UUID(int=(1 << 128) - 1)
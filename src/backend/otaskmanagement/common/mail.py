@@ -0,0 +1,106 @@
+"""
+Mail helpers for the Celery worker.
+
+Each worker process keeps one mail connection open across tasks and
+reconnects when the server has dropped it, so sending an invitation
+costs a message, not a TLS handshake. The invitation template is
+compiled once per process.
+"""
+
+import logging
+import smtplib
+import threading
+from functools import lru_cache
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
+
+logger = logging.getLogger(__name__)
+
+INVITE_TEMPLATE = "email/project_invite.html"
+# smtplib.SMTPException subclasses OSError, so name the connection
+# failures explicitly; anything else is about the message, not the link.
+RECONNECT_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    ConnectionError,
+)
+MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError)
+
+_local = threading.local()
+
+
+def get_mail_connection():
+    """Return this process' open mail connection, opening it if needed."""
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        connection = get_connection(fail_silently=False)
+        connection.open()
+        _local.connection = connection
+    return connection
+
+
+def close_mail_connection(**kwargs):
+    connection = getattr(_local, "connection", None)
+    _local.connection = None
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception as e:
+            logger.warning(f"[ERROR]: closing mail connection: {e}")
+
+
+worker_process_shutdown.connect(close_mail_connection)
+
+
+def send_messages(messages):
+    """
+    Send messages over the pooled connection, one at a time.
+
+    A dropped connection is reopened once per message and sending resumes
+    from the message that failed, so the ones already delivered are not
+    sent again. A message the server refuses is logged and skipped.
+    """
+    sent = 0
+    position = 0
+    reconnected = False
+    while position < len(messages):
+        try:
+            sent += get_mail_connection().send_messages([messages[position]])
+        except MESSAGE_ERRORS as e:
+            logger.warning(f"[ERROR]: mail to {messages[position].to} refused: {e}")
+        except RECONNECT_ERRORS as e:
+            if reconnected:
+                raise
+            logger.info(f"Mail connection lost ({e}), reconnecting")
+            close_mail_connection()
+            reconnected = True
+            continue
+        reconnected = False
+        position += 1
+    return sent
+
+
+@lru_cache(maxsize=None)
+def invite_template():
+    return get_template(INVITE_TEMPLATE)
+
+
+def build_invite_email(to_email, verify_url, project_name):
+    text_content = (
+        f"You have been invited to join project {project_name}.\n"
+        f"Open this link to accept:\n{verify_url}"
+    )
+    html_content = invite_template().render(
+        {"project_name": project_name, "verify_url": verify_url}
+    )
+    email = EmailMultiAlternatives(
+        subject=f"You've been invited to join project {project_name}",
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[to_email],
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
@@ -0,0 +1,157 @@
+"""
+Compare the ModelSerializer list path with the ValuesPlan fast path.
+
+    python manage.py benchmark_serializers --sizes 100,1000,10000
+
+Rows are created inside a transaction that is rolled back at the end, so
+the command can be pointed at any database. Each timing covers the query
+and the rendering to JSON, and the outputs of both paths are checked to
+be identical. Many-to-many lists are compared as sets because neither
+path gives them an order.
+"""
+
+import datetime
+import gc
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from issues.models import Sprint
+from issues.serializers import SprintSerializer
+from otaskmanagement.serializers import get_values_plan
+from project.models import Project, ProjectMembership
+from project.serializers import ProjectMembershipSerializer, ProjectSerializer
+from users.models import CustomUser
+from users.serializers import UserSerializer
+
+PREFIX = "bench-serializers"
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark the list serializers against their .values() fast path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", default="100,1000,10000")
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            sizes = sorted(int(size) for size in options["sizes"].split(","))
+        except ValueError:
+            raise CommandError("--sizes must be a comma separated list of integers.")
+
+        try:
+            with transaction.atomic():
+                cases = self.create_rows(sizes[-1])
+                self.run(cases, sizes, max(options["repeat"], 1))
+                raise Rollback
+        except Rollback:
+            pass
+
+    def create_rows(self, count):
+        today = datetime.date.today()
+        users = CustomUser.objects.bulk_create(
+            CustomUser(email=f"{PREFIX}-{i}@example.com", password="!")
+            for i in range(count)
+        )
+        projects = Project.objects.bulk_create(
+            Project(name=f"{PREFIX} {i}", key=f"BS{i}") for i in range(count)
+        )
+        ProjectMembership.objects.bulk_create(
+            ProjectMembership(project=project, member=users[(i + offset) % count])
+            for i, project in enumerate(projects)
+            for offset in (0, 1)
+        )
+        Sprint.objects.bulk_create(
+            Sprint(
+                name=f"{PREFIX} {i}",
+                project=projects[0],
+                start_date=today,
+                end_date=today,
+            )
+            for i in range(count)
+        )
+        return [
+            (
+                "Sprint",
+                Sprint.objects.filter(project=projects[0]),
+                SprintSerializer,
+            ),
+            (
+                "Project",
+                Project.objects.filter(name__startswith=PREFIX),
+                ProjectSerializer,
+            ),
+            (
+                "ProjectMembership",
+                ProjectMembership.objects.filter(project__name__startswith=PREFIX),
+                ProjectMembershipSerializer,
+            ),
+            (
+                "User",
+                CustomUser.objects.filter(email__startswith=PREFIX),
+                UserSerializer,
+            ),
+        ]
+
+    def run(self, cases, sizes, repeat):
+        renderer = JSONRenderer()
+        header = f"{'serializer':<20}{'rows':>8}{'drf ms':>12}{'values ms':>12}{'x':>8}"
+        self.stdout.write(header)
+        self.stdout.write("-" * len(header))
+
+        for name, queryset, serializer_class in cases:
+            plan = get_values_plan(serializer_class)
+            if plan is None:
+                raise CommandError(f"{serializer_class.__name__} has no values plan.")
+
+            for size in sizes:
+                rows = queryset[:size]
+
+                def drf():
+                    data = serializer_class(rows, many=True).data
+                    return renderer.render(data)
+
+                def fast():
+                    return renderer.render(plan.render(plan.values(rows)))
+
+                drf_time, expected = self.measure(drf, repeat)
+                fast_time, actual = self.measure(fast, repeat)
+                if self.normalize(actual) != self.normalize(expected):
+                    raise CommandError(f"{name}: outputs differ at {size} rows.")
+
+                self.stdout.write(
+                    f"{name:<20}{size:>8}{drf_time * 1000:>12.1f}"
+                    f"{fast_time * 1000:>12.1f}{drf_time / fast_time:>8.1f}"
+                )
+
+    @staticmethod
+    def measure(func, repeat):
+        best, result = None, None
+        gc.disable()
+        try:
+            for _ in range(repeat):
+                started = time.perf_counter()
+                result = func()
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+        finally:
+            gc.enable()
+        return best, result
+
+    @staticmethod
+    def normalize(content):
+        return [
+            {
+                key: sorted(value) if isinstance(value, list) else value
+                for key, value in item.items()
+            }
+            for item in json.loads(content)
+        ]
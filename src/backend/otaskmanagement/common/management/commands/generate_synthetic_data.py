@@ -0,0 +1,403 @@
+"""
+Fill the database with synthetic users, projects and issues.
+
+    python manage.py generate_synthetic_data --users 2000 --projects 100 \\
+        --members-per-project 25 --sprints-per-project 20 --issues 1000000
+
+Rows are written with Postgres ``COPY`` through psycopg 3, a batch of
+issues at a time, so a million issues take minutes rather than hours.
+The database triggers still run: issue counters and the closure table
+are maintained as for any other insert. Django signals do not, so no
+live events are published and no caches are touched.
+
+The data is shaped like a real tenant: issue counts per project follow a
+long tail, each project has a four step status workflow, sprints run two
+weeks back to back up to today with all but the last closed, most tasks
+hang under a user story, and closed sprints hold mostly finished issues.
+Every user signs in with ``--password``. The first user,
+``<prefix>-0@example.com``, is an administrator of every project, which
+makes it the heaviest account for ``run_load_scenarios``.
+
+``--seed`` makes the shape repeatable; the primary keys are random.
+"""
+
+import datetime
+import json
+import random
+import time
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from issues.models import (
+    IssueKeySequence,
+    IssueStatus,
+    Issues,
+    IssueTypeEnum,
+    PriorityEnum,
+    Sprint,
+    StateEnum,
+)
+from project.models import AccessType, Project, ProjectMembership
+from users.models import CustomUser
+from users.ruleset import RoleEnum
+
+BATCH_SIZE = 20000
+SPRINT_DAYS = 14
+
+WORKFLOW = (
+    # name, is_done, is_default
+    ("To Do", False, True),
+    ("In Progress", False, False),
+    ("In Review", False, False),
+    ("Done", True, False),
+)
+ISSUE_TYPES = (
+    (IssueTypeEnum.USERSTORY, 3),
+    (IssueTypeEnum.TASK, 5),
+    (IssueTypeEnum.BUG, 2),
+)
+PRIORITIES = (None, PriorityEnum.LOW, PriorityEnum.MEDIUM, PriorityEnum.HIGH)
+ROLES = (
+    (RoleEnum.ADMINISTRATOR, 1),
+    (RoleEnum.MEMBER, 7),
+    (RoleEnum.VIEWER, 2),
+)
+STORY_POINTS = (1, 2, 3, 5, 8, 13)
+
+FIRST_NAMES = (
+    "An", "Binh", "Chi", "Dung", "Giang", "Hai", "Hoa", "Khanh", "Lan",
+    "Linh", "Minh", "Nam", "Ngoc", "Phuong", "Quan", "Thao", "Trang", "Tuan",
+)
+LAST_NAMES = ("Nguyen", "Tran", "Le", "Pham", "Hoang", "Phan", "Vu", "Dang", "Bui")
+VERBS = (
+    "Add", "Fix", "Refactor", "Remove", "Document", "Speed up", "Validate",
+    "Migrate", "Redesign", "Test", "Localize", "Cache",
+)
+NOUNS = (
+    "login form", "sprint board", "issue export", "invite email", "search",
+    "dashboard", "member list", "burndown chart", "password reset",
+    "notification", "project settings", "API pagination", "audit trail",
+    "file upload", "report", "onboarding",
+)
+WORDS = (
+    "the", "user", "should", "be", "able", "to", "see", "when", "after",
+    "page", "load", "error", "slow", "request", "button", "list", "filter",
+    "update", "project", "issue", "sprint", "status", "data", "mobile",
+)
+
+
+class Command(BaseCommand):
+    help = "Generate synthetic users, projects, sprints and issues with COPY."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--projects", type=int, default=50)
+        parser.add_argument("--members-per-project", type=int, default=20)
+        parser.add_argument("--sprints-per-project", type=int, default=12)
+        parser.add_argument(
+            "--issues", type=int, default=100000, help="Issues across all projects."
+        )
+        parser.add_argument(
+            "--prefix",
+            default="synthetic",
+            help="Prefix of the user emails and project keys.",
+        )
+        parser.add_argument("--password", default="synthetic")
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("COPY needs a PostgreSQL database.")
+        if options["users"] < 1 or options["projects"] < 1:
+            raise CommandError("--users and --projects must be at least 1.")
+
+        prefix = options["prefix"]
+        key_prefix = "".join(char for char in prefix.upper() if char.isalnum())[:6]
+        if not key_prefix:
+            raise CommandError("--prefix needs at least one letter or digit.")
+        if (
+            CustomUser.objects.filter(email__startswith=f"{prefix}-").exists()
+            or Project.objects.filter(key__startswith=key_prefix).exists()
+        ):
+            raise CommandError(
+                f"Data prefixed '{prefix}' already exists. "
+                "Use another --prefix or flush the database."
+            )
+
+        self.random = random.Random(options["seed"])
+        self.now = datetime.datetime.now(datetime.timezone.utc)
+        self.today = self.now.date()
+        started = time.monotonic()
+
+        with transaction.atomic():
+            users = self.create_users(
+                options["users"], prefix, make_password(options["password"])
+            )
+            projects = self.create_projects(
+                options["projects"],
+                key_prefix,
+                users,
+                options["members_per_project"],
+                options["sprints_per_project"],
+            )
+
+        issues = 0
+        for project, count in zip(
+            projects, self.spread(options["issues"], len(projects))
+        ):
+            with transaction.atomic():
+                self.create_issues(project, count)
+            issues += count
+            self.stdout.write(f"{project['key']}: {count} issues")
+
+        self.analyze()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {len(users)} users, {len(projects)} projects and "
+                f"{issues} issues in {time.monotonic() - started:.1f}s."
+            )
+        )
+        self.stdout.write(f"Heaviest user: {prefix}-0@example.com")
+
+    # -------------------------------------------------------------- #
+    # Users, projects, memberships, workflows and sprints
+    # -------------------------------------------------------------- #
+    def create_users(self, count, prefix, password):
+        rows = []
+        for number in range(count):
+            joined = self.past(days=730)
+            rows.append(
+                {
+                    "id": uuid.uuid4(),
+                    "email": f"{prefix}-{number}@example.com",
+                    "password": password,
+                    "first_name": self.random.choice(FIRST_NAMES),
+                    "last_name": self.random.choice(LAST_NAMES),
+                    "is_active": True,
+                    "is_staff": False,
+                    "is_superuser": False,
+                    "date_joined": joined,
+                    "created_at": joined,
+                    "updated_at": joined,
+                }
+            )
+        copy_rows(CustomUser, rows)
+        return [row["id"] for row in rows]
+
+    def create_projects(self, count, key_prefix, users, members, sprints):
+        owner = users[0]
+        projects, memberships, statuses, sprint_rows = [], [], [], []
+
+        for number in range(count):
+            created = self.past(days=365)
+            project = {
+                "id": uuid.uuid4(),
+                "name": f"{self.random.choice(NOUNS).capitalize()} {number}",
+                "key": f"{key_prefix}{number}",
+                "access": self.random.choice(AccessType.values),
+                "created_by_id": owner,
+                "created_at": created,
+                "updated_at": created,
+            }
+            projects.append(project)
+
+            team = [owner] + self.random.sample(
+                users[1:], min(max(members - 1, 0), len(users) - 1)
+            )
+            for member in team:
+                role = (
+                    RoleEnum.ADMINISTRATOR if member == owner else self.weighted(ROLES)
+                )
+                memberships.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "project_id": project["id"],
+                        "member_id": member,
+                        "role": role,
+                        "is_accepted": True,
+                        "created_at": created,
+                        "updated_at": created,
+                    }
+                )
+            project["members"] = team
+
+            project["statuses"] = []
+            for order, (name, is_done, is_default) in enumerate(WORKFLOW):
+                status = {
+                    "id": uuid.uuid4(),
+                    "project_id": project["id"],
+                    # Status names are unique across projects.
+                    "name": f"{name} ({project['key']})",
+                    "is_done": is_done,
+                    "order_index": order,
+                    "is_default": is_default,
+                    "is_active": True,
+                    "created_at": created,
+                    "updated_at": created,
+                }
+                statuses.append(status)
+                project["statuses"].append(status)
+
+            project["sprints"] = []
+            first = self.today - datetime.timedelta(days=SPRINT_DAYS * (sprints - 1))
+            for index in range(sprints):
+                start = first + datetime.timedelta(days=SPRINT_DAYS * index)
+                sprint = {
+                    "id": uuid.uuid4(),
+                    "project_id": project["id"],
+                    "name": f"Sprint {index + 1}",
+                    "start_date": start,
+                    "end_date": start + datetime.timedelta(days=SPRINT_DAYS - 1),
+                    "is_closed": index < sprints - 1,
+                    "created_at": created,
+                    "updated_at": created,
+                }
+                sprint_rows.append(sprint)
+                project["sprints"].append(sprint)
+
+        copy_rows(Project, projects)
+        copy_rows(ProjectMembership, memberships)
+        copy_rows(IssueStatus, statuses)
+        copy_rows(Sprint, sprint_rows)
+        return projects
+
+    # -------------------------------------------------------------- #
+    # Issues
+    # -------------------------------------------------------------- #
+    def create_issues(self, project, count):
+        stories = []
+        for first in range(1, count + 1, BATCH_SIZE):
+            last = min(first + BATCH_SIZE - 1, count)
+            issues = []
+            for number in range(first, last + 1):
+                issue = self.issue(project, number, stories)
+                issues.append(issue)
+                if issue["type"] == IssueTypeEnum.USERSTORY:
+                    stories.append(issue["id"])
+
+            # Parents precede their sub-issues in the batch, which the
+            # closure table trigger relies on.
+            copy_rows(Issues, issues)
+
+        if count:
+            IssueKeySequence.objects.advance_to(project["id"], count)
+
+    def issue(self, project, number, stories):
+        issue_type = self.weighted(ISSUE_TYPES)
+        sprint = None
+        if project["sprints"] and self.random.random() < 0.8:
+            sprint = self.random.choice(project["sprints"])
+
+        if sprint is not None:
+            start = sprint["start_date"] + datetime.timedelta(
+                days=self.random.randrange(SPRINT_DAYS)
+            )
+            created = min(
+                datetime.datetime.combine(
+                    sprint["start_date"], datetime.time(9), datetime.timezone.utc
+                ),
+                self.now,
+            )
+        else:
+            created = self.past(days=365)
+            start = created.date()
+
+        statuses = project["statuses"]
+        if sprint is not None and sprint["is_closed"] and self.random.random() < 0.9:
+            status = statuses[-1]
+        else:
+            status = self.random.choice(statuses)
+
+        parent = None
+        if issue_type == IssueTypeEnum.TASK and stories and self.random.random() < 0.7:
+            parent = self.random.choice(stories[-200:])
+
+        members = project["members"]
+        assignee = self.random.choice(members) if self.random.random() < 0.85 else None
+        reporter = self.random.choice(members)
+        updated = created + datetime.timedelta(minutes=self.random.randrange(60 * 24 * 7))
+        return {
+            "id": uuid.uuid4(),
+            "key": f"{project['key']}-{number}",
+            "title": f"{self.random.choice(VERBS)} {self.random.choice(NOUNS)}",
+            "description": self.sentence() if self.random.random() < 0.6 else None,
+            "start_date": start,
+            "due_date": start + datetime.timedelta(days=self.random.randint(1, 14)),
+            "type": issue_type,
+            "priority": self.random.choice(PRIORITIES),
+            "state": (
+                self.random.choice(StateEnum.values)
+                if self.random.random() < 0.2
+                else None
+            ),
+            "project_id": project["id"],
+            "sprint_id": sprint["id"] if sprint else None,
+            "status_id": status["id"],
+            "parent_id": parent,
+            "assignee_id": assignee,
+            "reporter_id": reporter,
+            "meta": json.dumps(self.meta(issue_type)),
+            "created_by_id": reporter,
+            "created_at": created,
+            "updated_at": min(updated, self.now),
+        }
+
+    def meta(self, issue_type):
+        if issue_type == IssueTypeEnum.USERSTORY:
+            return {"story_point": self.random.choice(STORY_POINTS)}
+        if issue_type == IssueTypeEnum.TASK:
+            return {"task_point": self.random.randint(1, 8)}
+        return {}
+
+    # -------------------------------------------------------------- #
+    # Helpers
+    # -------------------------------------------------------------- #
+    def analyze(self):
+        """Refresh the planner statistics, which COPY leaves stale."""
+        models = (CustomUser, Project, ProjectMembership, IssueStatus, Sprint, Issues)
+        with connection.cursor() as cursor:
+            for model in models:
+                cursor.execute(f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}")
+
+    def spread(self, total, parts):
+        """Split ``total`` over ``parts`` with a long tail, as real tenants are."""
+        weights = [self.random.paretovariate(1.2) for _ in range(parts)]
+        scale = total / sum(weights)
+        counts = [int(weight * scale) for weight in weights]
+        counts[0] += total - sum(counts)
+        return counts
+
+    def weighted(self, choices):
+        values, weights = zip(*choices)
+        return self.random.choices(values, weights)[0]
+
+    def past(self, days):
+        return self.now - datetime.timedelta(seconds=self.random.randrange(days * 86400))
+
+    def sentence(self):
+        words = self.random.choices(WORDS, k=self.random.randint(8, 30))
+        return " ".join(words).capitalize() + "."
+
+
+def copy_rows(model, rows):
+    """
+    Write ``rows`` with one COPY. Rows are dicts keyed by field attname;
+    keys that are not columns of ``model`` are ignored.
+    """
+    if not rows:
+        return
+    columns = {field.attname: field.column for field in model._meta.concrete_fields}
+    attnames = [name for name in rows[0] if name in columns]
+    quote_name = connection.ops.quote_name
+    sql = "COPY {} ({}) FROM STDIN".format(
+        quote_name(model._meta.db_table),
+        ", ".join(quote_name(columns[name]) for name in attnames),
+    )
+
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(sql) as copy:
+            for row in rows:
+                copy.write_row([row[name] for name in attnames])
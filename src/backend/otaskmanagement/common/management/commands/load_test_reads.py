@@ -0,0 +1,86 @@
+"""
+Load test the read endpoints while slow clients hold connections open.
+
+    python manage.py load_test_reads --email me@example.com \\
+        --path /project/ --path /<project_id>/sprint/ \\
+        --clients 20 --slow-clients 30 --duration 15
+
+``--slow-clients`` connections send their request headers one line at a
+time and read the response a few bytes at a time, ``--slow-interval``
+seconds apart, as clients on a bad mobile link do. Meanwhile
+``--clients`` fast clients request the same paths back to back, and the
+command reports their throughput and latency. Run it once against the
+WSGI deployment and once against the uvicorn workers serving
+``asgi.py`` with ``ASYNC_READ_VIEWS=1`` to compare how many requests get
+through while the slow clients are connected.
+
+Requests are sent with ``otaskmanagement.loadtest``, over plain sockets.
+An access token is minted for ``--email`` locally, which requires the
+same SIGNING_KEY as the server.
+"""
+
+import asyncio
+from collections import Counter
+from itertools import chain
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from otaskmanagement.loadtest import LoadTest, percentiles
+from users.models import CustomUser
+
+
+class Command(BaseCommand):
+    help = "Measure read endpoint throughput while slow clients are connected."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--path", action="append", dest="paths")
+        parser.add_argument("--email", help="User to authenticate the requests as.")
+        parser.add_argument("--clients", type=int, default=20)
+        parser.add_argument("--slow-clients", type=int, default=20)
+        parser.add_argument("--slow-interval", type=float, default=0.5)
+        parser.add_argument("--duration", type=float, default=10.0)
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["base_url"])
+        if url.scheme != "http" or not url.hostname:
+            raise CommandError("--base-url must be an http:// URL.")
+
+        headers = [f"Host: {url.netloc}", "Accept: application/json"]
+        if options["email"]:
+            user = CustomUser.objects.filter(email=options["email"]).first()
+            if user is None:
+                raise CommandError(f"No user with email '{options['email']}'.")
+            headers.append(f"Authorization: Bearer {AccessToken.for_user(user)}")
+
+        load_test = LoadTest(
+            host=url.hostname,
+            port=url.port or 80,
+            targets=[(path, path) for path in options["paths"] or ["/project/"]],
+            headers=headers,
+            slow_interval=options["slow_interval"],
+        )
+        asyncio.run(
+            load_test.run(
+                options["clients"], options["slow_clients"], options["duration"]
+            )
+        )
+        self.report(load_test, options["duration"])
+
+    def report(self, load_test, duration):
+        latencies = list(chain.from_iterable(load_test.latencies.values()))
+        self.stdout.write(f"fast requests:  {len(latencies)}")
+        self.stdout.write(f"throughput:     {len(latencies) / duration:.1f} req/s")
+        if latencies:
+            for name, value in percentiles(latencies).items():
+                self.stdout.write(f"latency {name}:    {value * 1000:.1f} ms")
+        self.stdout.write(f"slow requests:  {load_test.slow_completed}")
+        statuses = sum(load_test.statuses.values(), Counter())
+        statuses = ", ".join(
+            f"{status}: {count}" for status, count in sorted(statuses.items())
+        )
+        self.stdout.write(f"statuses:       {statuses}")
+        if load_test.errors:
+            self.stdout.write(f"errors:         {dict(load_test.errors)}")
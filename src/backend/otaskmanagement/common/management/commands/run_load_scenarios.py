@@ -0,0 +1,172 @@
+"""
+Drive the API routes with a scripted mix of requests and report each.
+
+    python manage.py generate_synthetic_data --issues 1000000
+    python manage.py run_load_scenarios --email synthetic-0@example.com \\
+        --clients 20 --duration 60
+
+Every client walks through the selected scenarios in turn, each one a
+real URL route, and the command reports the requests, throughput and
+p50/p95/p99 latency of every scenario. The project, sprint and
+membership the paths point at are looked up for ``--email`` in the
+database, preferring the member's project with the most issues, so run
+the command with the same settings as the server. Access and invitation
+tokens are signed locally with the server's SECRET_KEY and SIGNING_KEY,
+and requests go over plain sockets: nothing but the server and its
+Postgres is needed.
+
+``--warmup`` seconds of the same load run first and are not reported,
+so connection pools and caches start warm.
+"""
+
+import asyncio
+import time
+from urllib.parse import urlencode, urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Sum
+from rest_framework_simplejwt.tokens import AccessToken
+
+from common.services import genarate_user_token
+from issues.models import CounterDimensionEnum, IssueCounter, Sprint
+from otaskmanagement.loadtest import LoadTest, percentiles
+from project.models import ProjectMembership
+from users.models import CustomUser
+
+SCENARIOS = {
+    "project-list": "/project/",
+    "membership-list": "/project/managed/",
+    "membership-detail": "/project/managed/{membership}/",
+    "sprint-list": "/{project}/sprint/",
+    "sprint-detail": "/{project}/sprint/{sprint}/",
+    "sprint-board": "/{project}/sprint/{sprint}/board/",
+    "project-board": "/{project}/board/",
+    "issue-search": "/{project}/issues/search/?q=login",
+    "issue-summary": "/{project}/issues/summary/",
+    "my-work": "/my-work/",
+    "invite-verify": "/email-invite/invite/verify/?{invite}",
+}
+
+
+class Command(BaseCommand):
+    help = "Report per-endpoint latency percentiles and throughput of the API."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--email", default="synthetic-0@example.com")
+        parser.add_argument("--project", help="Project to point the paths at.")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            choices=sorted(SCENARIOS),
+            help="Run only these scenarios. Repeat for several.",
+        )
+        parser.add_argument("--clients", type=int, default=10)
+        parser.add_argument("--duration", type=float, default=30.0)
+        parser.add_argument("--warmup", type=float, default=3.0)
+
+    def handle(self, *args, **options):
+        url = urlsplit(options["base_url"])
+        if url.scheme != "http" or not url.hostname:
+            raise CommandError("--base-url must be an http:// URL.")
+        if options["clients"] < 1 or options["duration"] <= 0:
+            raise CommandError("--clients and --duration must be positive.")
+
+        user = CustomUser.objects.filter(email=options["email"]).first()
+        if user is None:
+            raise CommandError(
+                f"No user with email '{options['email']}'. "
+                "Run generate_synthetic_data first or pass --email."
+            )
+        targets = self.get_targets(user, options["project"], options["scenarios"])
+        headers = [
+            f"Host: {url.netloc}",
+            "Accept: application/json",
+            f"Authorization: Bearer {AccessToken.for_user(user)}",
+        ]
+
+        def load_test():
+            return LoadTest(url.hostname, url.port or 80, targets, headers)
+
+        if options["warmup"] > 0:
+            asyncio.run(load_test().run(options["clients"], 0, options["warmup"]))
+
+        measured = load_test()
+        started = time.monotonic()
+        asyncio.run(measured.run(options["clients"], 0, options["duration"]))
+        self.report(measured, targets, time.monotonic() - started)
+
+    def get_targets(self, user, project_id, scenarios):
+        memberships = ProjectMembership.objects.filter(member=user)
+        if project_id:
+            memberships = memberships.filter(project_id=project_id)
+        else:
+            # The member's project with the most issues.
+            issues = dict(
+                IssueCounter.objects.filter(
+                    project__in=memberships.values("project"),
+                    dimension=CounterDimensionEnum.TYPE,
+                )
+                .values_list("project")
+                .annotate(total=Sum("count"))
+            )
+            project_ids = list(memberships.values_list("project_id", flat=True))
+            if project_ids:
+                project_id = max(project_ids, key=lambda pk: issues.get(pk, 0))
+                memberships = memberships.filter(project_id=project_id)
+
+        membership = memberships.first()
+        if membership is None:
+            raise CommandError(f"{user.email} is not a member of the project.")
+        project_id = membership.project_id
+        sprint = (
+            Sprint.objects.filter(project_id=project_id)
+            .order_by("is_closed", "-start_date")
+            .first()
+        )
+
+        values = {
+            "project": project_id,
+            "membership": membership.pk,
+            "sprint": sprint.pk if sprint else None,
+            # An invitation for an address that is not a member yet.
+            "invite": urlencode(
+                {"token": genarate_user_token(project_id, "load-test@example.com")}
+            ),
+        }
+        targets = []
+        for name in scenarios or SCENARIOS:
+            if "{sprint}" in SCENARIOS[name] and sprint is None:
+                self.stderr.write(f"Skipping {name}: the project has no sprint.")
+                continue
+            targets.append((name, SCENARIOS[name].format(**values)))
+        if not targets:
+            raise CommandError("No scenario can run against this project.")
+
+        self.stdout.write(f"user:     {user.email}")
+        self.stdout.write(f"project:  {project_id}")
+        return targets
+
+    def report(self, load_test, targets, elapsed):
+        self.stdout.write(
+            f"{'scenario':<18} {'requests':>8} {'req/s':>8} {'p50 ms':>8} "
+            f"{'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  statuses"
+        )
+        total = 0
+        for name, _ in targets:
+            latencies = load_test.latencies[name]
+            total += len(latencies)
+            quantiles = {key: value * 1000 for key, value in percentiles(latencies).items()}
+            statuses = ", ".join(
+                f"{status}: {count}"
+                for status, count in sorted(load_test.statuses[name].items())
+            )
+            self.stdout.write(
+                f"{name:<18} {len(latencies):>8} {len(latencies) / elapsed:>8.1f} "
+                f"{quantiles['p50']:>8.1f} {quantiles['p95']:>8.1f} "
+                f"{quantiles['p99']:>8.1f} {quantiles['max']:>8.1f}  {statuses}"
+            )
+        self.stdout.write(f"total: {total} requests, {total / elapsed:.1f} req/s")
+        if load_test.errors:
+            self.stdout.write(f"errors: {dict(load_test.errors)}")
@@ -0,0 +1,118 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:54
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+# Django cannot create partitioned tables, so the table is created here and
+# the model state separately. The primary key has to include the partition
+# key. Monthly partitions are created when rows are written, see
+# ActivityLogManager.ensure_partitions; the index is created on each.
+CREATE_ACTIVITY_LOG = """
+CREATE TABLE common_activitylog (
+    id uuid NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    project_id uuid NOT NULL,
+    actor_id uuid NULL,
+    target varchar(16) NOT NULL,
+    object_id uuid NOT NULL,
+    action varchar(8) NOT NULL,
+    changes jsonb NOT NULL,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+
+CREATE INDEX activitylog_project_created
+ON common_activitylog (project_id, created_at);
+"""
+
+DROP_ACTIVITY_LOG = "DROP TABLE common_activitylog;"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("common", "0001_initial"),
+        ("project", "0004_remove_projectmembership_access_project_access_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    state_operations = [
+        migrations.CreateModel(
+            name="ActivityLog",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField()),
+                (
+                    "target",
+                    models.CharField(
+                        choices=[
+                            ("issue", "Issue"),
+                            ("sprint", "Sprint"),
+                            ("membership", "Membership"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("object_id", models.UUIDField()),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("created", "Created"),
+                            ("updated", "Updated"),
+                            ("deleted", "Deleted"),
+                        ],
+                        max_length=8,
+                    ),
+                ),
+                ("changes", models.JSONField(default=dict)),
+                (
+                    "actor",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "project",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="project.project",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["project", "created_at"],
+                        name="activitylog_project_created",
+                    )
+                ],
+            },
+        ),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(sql=CREATE_ACTIVITY_LOG, reverse_sql=DROP_ACTIVITY_LOG)
+            ],
+            state_operations=state_operations,
+        ),
+    ]
@@ -1,5 +1,9 @@
-from django.db import models
+import datetime
+import uuid
+
+from django.db import connections, models
 from django.conf import settings
+from django.utils.translation import gettext_lazy as _
 from otaskmanagement.models import BaseModel
 from project.models import Project
 from users.ruleset import RoleEnum
@@ -39,3 +43,96 @@ class ProjectInvitation(BaseModel):
                 name="unique_pending_invitation_per_project",
             )
         ]
+
+
+class ActivityTargetEnum(models.TextChoices):
+    ISSUE = "issue", _("Issue")
+    SPRINT = "sprint", _("Sprint")
+    MEMBERSHIP = "membership", _("Membership")
+
+
+class ActivityActionEnum(models.TextChoices):
+    CREATED = "created", _("Created")
+    UPDATED = "updated", _("Updated")
+    DELETED = "deleted", _("Deleted")
+
+
+class ActivityLogManager(models.Manager):
+    def ensure_partitions(self, timestamps):
+        """Create the monthly partitions holding ``timestamps`` if missing."""
+        months = {month_start(timestamp) for timestamp in timestamps}
+        months -= _known_partitions
+        if not months:
+            return
+
+        table = self.model._meta.db_table
+        quote_name = connections[self.db].ops.quote_name
+        with connections[self.db].cursor() as cursor:
+            for start in sorted(months):
+                partition = f"{table}_y{start.year}m{start.month:02d}"
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {quote_name(partition)} "
+                    f"PARTITION OF {quote_name(table)} FOR VALUES FROM (%s) TO (%s)",
+                    [start, next_month_start(start)],
+                )
+        _known_partitions.update(months)
+
+
+# Partitions this process has already created or found.
+_known_partitions = set()
+
+
+def month_start(timestamp):
+    """Start of the UTC month holding ``timestamp``."""
+    timestamp = timestamp.astimezone(datetime.timezone.utc)
+    return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month_start(start):
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+class ActivityLog(models.Model):
+    """
+    Append-only record of the changes made to issues, sprints and
+    memberships. ``changes`` maps every changed field to its
+    ``[old, new]`` values.
+
+    The table is range partitioned by the UTC month of ``created_at``
+    (see migration 0002), and the partitions are created on demand when
+    rows are written. Rows keep the ids of deleted projects and users,
+    so the relations have no database constraint.
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_at = models.DateTimeField()
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+    )
+    actor = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="+",
+    )
+    target = models.CharField(max_length=16, choices=ActivityTargetEnum.choices)
+    object_id = models.UUIDField()
+    action = models.CharField(max_length=8, choices=ActivityActionEnum.choices)
+    changes = models.JSONField(default=dict)
+
+    objects = ActivityLogManager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "created_at"], name="activitylog_project_created"
+            ),
+        ]
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from common.models import ProjectInvitation
+from common.models import ActivityLog, ProjectInvitation
 from users.ruleset import RoleEnum
 
 
@@ -25,3 +25,24 @@ class EmailSerializer(serializers.Serializer):
             )
 
         return attrs
+
+
+class BulkEmailSerializer(serializers.Serializer):
+    emails = serializers.ListField(
+        child=serializers.EmailField(), allow_empty=False, max_length=500
+    )
+    role = serializers.ChoiceField(choices=RoleEnum.choices, required=True)
+
+
+class ActivityLogSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ActivityLog
+        fields = [
+            "id",
+            "created_at",
+            "actor",
+            "target",
+            "object_id",
+            "action",
+            "changes",
+        ]
@@ -5,11 +5,12 @@ from django.core import signing
 from django.utils import timezone
 from django.conf import settings
 from django.db import transaction
+from django.db.models.functions import Lower
 
 from rest_framework.exceptions import ValidationError
 
 from common.models import ProjectInvitation
-from common.tasks import send_project_invite_email
+from common.tasks import send_project_invite_email, send_project_invite_emails
 from project.models import Project, ProjectMembership
 from users.models import CustomUser
 
@@ -54,13 +55,101 @@ def send_project_invitation(project_id, email, role, user):
         expired_at=timezone.now() + timedelta(days=7),
     )
 
-    verify_url = f"{settings.BACKEND_BASE_URL}email/invite/verify?token={token}"
-
     send_project_invite_email.delay(
-        to_email=email, verify_url=verify_url, project_name=project.name
+        to_email=email, verify_url=build_verify_url(token), project_name=project.name
     )
 
 
+def send_bulk_project_invitations(project_id, emails, role, invited_by):
+    """
+    Invite many addresses to a project at once.
+
+    Pending invitations and memberships are looked up with one query
+    each, matching emails case-insensitively. Members and addresses with
+    a live invitation are skipped, expired invitations are replaced, the
+    new rows are written with one bulk_create and every email goes out
+    from a single task. Rows a concurrent request wrote first are skipped
+    rather than failing the batch.
+    """
+    project = Project.objects.get(id=project_id)
+    emails = list(dict.fromkeys(email.strip().lower() for email in emails))
+    now = timezone.now()
+
+    pending = {}
+    for email, expired_at in (
+        ProjectInvitation.objects.annotate(lowered=Lower("email"))
+        .filter(project=project_id, lowered__in=emails, accepted_at__isnull=True)
+        .values_list("lowered", "expired_at")
+    ):
+        pending[email] = max(expired_at, pending.get(email, expired_at))
+    members = set(
+        ProjectMembership.objects.annotate(lowered=Lower("member__email"))
+        .filter(project=project_id, lowered__in=emails)
+        .values_list("lowered", flat=True)
+    )
+    skipped = [
+        email
+        for email in emails
+        if email in members or pending.get(email, now) > now
+    ]
+    expired = [email for email in emails if email in pending and email not in skipped]
+    invited = [email for email in emails if email not in skipped]
+
+    invitations = [
+        ProjectInvitation(
+            project=project,
+            email=email,
+            token=genarate_user_token(project_id, email),
+            role=role,
+            invited_by=invited_by,
+            created_by=invited_by,
+            expired_at=now + timedelta(days=7),
+        )
+        for email in invited
+    ]
+
+    with transaction.atomic():
+        if expired:
+            ProjectInvitation.objects.annotate(lowered=Lower("email")).filter(
+                project=project_id, lowered__in=expired, accepted_at__isnull=True
+            ).delete()
+        ProjectInvitation.objects.bulk_create(invitations, ignore_conflicts=True)
+        # ignore_conflicts does not say which rows were written; ours are
+        # the ones whose primary key made it in.
+        written = set(
+            ProjectInvitation.objects.filter(
+                pk__in=[invitation.pk for invitation in invitations]
+            ).values_list("pk", flat=True)
+        )
+    skipped += [
+        invitation.email for invitation in invitations if invitation.pk not in written
+    ]
+    invitations = [
+        invitation for invitation in invitations if invitation.pk in written
+    ]
+    invited = [invitation.email for invitation in invitations]
+
+    if invitations:
+        messages = [
+            {
+                "to_email": invitation.email,
+                "verify_url": build_verify_url(invitation.token),
+            }
+            for invitation in invitations
+        ]
+        transaction.on_commit(
+            lambda: send_project_invite_emails.delay(
+                messages=messages, project_name=project.name
+            )
+        )
+
+    return {"invited": invited, "skipped": skipped}
+
+
+def build_verify_url(token):
+    return f"{settings.BACKEND_BASE_URL}email/invite/verify?token={token}"
+
+
 def verify_invite_token(token: str, *, max_age_seconds: int = 60 * 60 * 24 * 7):
     try:
         data = signing.loads(
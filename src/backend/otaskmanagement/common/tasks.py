@@ -1,38 +1,17 @@
 import logging
 from celery import shared_task
-from django.conf import settings
+
+from common.mail import build_invite_email, send_messages
 
 logger = logging.getLogger(__name__)
 
 
 @shared_task
 def send_project_invite_email(to_email, verify_url, project_name):
-    subject = f"You've been invited to join project {project_name}"
-    text_content = (
-        f"You have been invited to join project {project_name}.\n"
-        f"Open this link to accept:\n{verify_url}"
-    )
-    from django.template.loader import render_to_string
-
-    html_content = render_to_string(
-        "email/project_invite.html",
-        {
-            "project_name": project_name,
-            "verify_url": verify_url,
-        },
-    )
-
     try:
-        from django.core.mail import EmailMultiAlternatives
-
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[to_email],
+        result = send_messages(
+            [build_invite_email(to_email, verify_url, project_name)]
         )
-        email.attach_alternative(html_content, "text/html")
-        result = email.send(fail_silently=False)
 
         if result == 0:
             logger.warning("No emails were sent.")
@@ -41,3 +20,28 @@ def send_project_invite_email(to_email, verify_url, project_name):
 
     except Exception as e:
         logger.warning(f"[ERROR]: {e}")
+
+
+@shared_task
+def send_project_invite_emails(messages, project_name):
+    """Send a batch of invitations over the worker's pooled connection."""
+    emails = [
+        build_invite_email(message["to_email"], message["verify_url"], project_name)
+        for message in messages
+    ]
+
+    try:
+        sent = send_messages(emails)
+        logger.info(f"Sent {sent} of {len(emails)} invitation emails")
+        return sent
+
+    except Exception as e:
+        logger.warning(f"[ERROR]: {e}")
+
+
+@shared_task
+def flush_activity_log():
+    """Write the buffered activity log entries in batches."""
+    from common.activity import flush_buffer
+
+    return flush_buffer()
@@ -1,3 +1,26 @@
-from django.test import TestCase
+import smtplib
+from unittest import mock
 
-# Create your tests here.
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase
+
+from common import mail
+
+
+class SendMessagesTests(SimpleTestCase):
+    def send(self, *outcomes):
+        connection = mock.Mock()
+        connection.send_messages.side_effect = outcomes
+        messages = [EmailMessage(to=[f"user{n}@example.com"]) for n in range(3)]
+        with mock.patch.object(mail, "get_mail_connection", return_value=connection):
+            with mock.patch.object(mail, "close_mail_connection") as close:
+                sent = mail.send_messages(messages)
+        return sent, close.call_count
+
+    def test_refused_recipient_is_skipped_without_reconnecting(self):
+        refused = smtplib.SMTPRecipientsRefused({"user0@example.com": (550, b"no")})
+        self.assertEqual(self.send(refused, 1, 1), (2, 0))
+
+    def test_each_message_may_reconnect_once(self):
+        dropped = smtplib.SMTPServerDisconnected("gone")
+        self.assertEqual(self.send(dropped, 1, dropped, 1, 1), (3, 2))
@@ -1,5 +1,11 @@
 from django.urls import path
-from common.api import AcceptInvitation, SendEmailMember, VerifyInvitation
+from common.api import (
+    AcceptInvitation,
+    ProjectActivity,
+    SendBulkEmailMember,
+    SendEmailMember,
+    VerifyInvitation,
+)
 
 urlpatterns = [
     path(
@@ -7,6 +13,11 @@ urlpatterns = [
         SendEmailMember.as_view(),
         name="api-send-mail",
     ),
+    path(
+        "send-mail/<uuid:pk>/bulk/",
+        SendBulkEmailMember.as_view(),
+        name="api-send-bulk-mail",
+    ),
     path(
         "invite/verify/",
         VerifyInvitation.as_view(),
@@ -18,3 +29,11 @@ urlpatterns = [
         name="api-accepted-invite",
     ),
 ]
+
+activity_api_urls = [
+    path(
+        "",
+        ProjectActivity.as_view(),
+        name="api-project-activity",
+    ),
+]
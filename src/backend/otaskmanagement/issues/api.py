@@ -1,18 +1,54 @@
+import base64
+import json
+import uuid
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from django.http import Http404, StreamingHttpResponse
+from django.utils.dateparse import parse_date
 from django.shortcuts import get_object_or_404
 
 from rest_framework import permissions
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from issues.models import Sprint
+from issues.archive import archived_tree
+from issues.models import ArchivedIssue, IssueCounter, IssueStatus, Issues, Sprint
+from issues.services import (
+    my_work_cache_key,
+    my_work_issues,
+    my_work_projects,
+    my_work_timeout,
+    project_velocity,
+    sprint_burndown,
+)
+from issues.transfer import FILE_FORMATS, IssueImporter, read_rows, stream_export
 from issues.serializers import (
+    BoardColumnSerializer,
+    IssueCardSerializer,
+    IssueTreeSerializer,
+    MyIssueSerializer,
     SprintSerializer,
 )
+from otaskmanagement.async_views import AsyncReadView
 from otaskmanagement.mixins import (
     ListCreateAPI,
     RetrieveUpdateDestroyAPI,
 )
+from otaskmanagement.pagination import (
+    KEYSET_ORDERING,
+    after_cursor,
+    encode_cursor,
+    keyset_sorted,
+)
+from otaskmanagement.permissions import CheckAPIPermission
 from otaskmanagement.utils import METHOD
 from project.models import Project
+from users.permissions import has_user_permission
 
 
 class SprintMixin:
@@ -40,3 +76,410 @@ class SprintDetail(SprintMixin, RetrieveUpdateDestroyAPI):
         if not project_id:
             raise ValidationError({"project_id": "This field is required."})
         return Sprint.objects.filter(project_id=project_id)
+
+
+class AsyncSprintList(AsyncReadView):
+    sync_view = SprintList
+
+
+class AsyncSprintDetail(AsyncReadView):
+    sync_view = SprintDetail
+
+
+class ArchivedIssuesMixin:
+    """Reads ``include_archived=true|false``, false by default."""
+
+    def include_archived(self):
+        value = self.request.query_params.get("include_archived")
+        if value is None or value.lower() in ("false", "0"):
+            return False
+        if value.lower() in ("true", "1"):
+            return True
+        raise ValidationError({"include_archived": "Expected 'true' or 'false'."})
+
+
+class IssueBoard(ArchivedIssuesMixin, APIView):
+    """
+    Returns the issues of a project, or of one of its sprints, grouped into
+    IssueStatus columns ordered by ``order_index``.
+
+    The first page of every column is loaded by a single windowed query,
+    so the whole board costs two queries however many columns it has.
+    Pass ``status`` and that column's ``cursor`` to load its next page.
+    ``include_archived=true`` runs the same query on ArchivedIssue too.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, CheckAPIPermission]
+    required_permission = "view_issues"
+    page_size = 20
+    max_page_size = 100
+
+    def get_project(self):
+        return self.kwargs["project_id"]
+
+    def get_page_size(self):
+        value = self.request.query_params.get("page_size")
+        if value is None:
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            raise ValidationError({"page_size": "A valid integer is required."})
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_columns(self):
+        columns = IssueStatus.objects.filter(
+            project_id=self.kwargs["project_id"], is_active=True
+        ).order_by("order_index")
+
+        status_id = self.request.query_params.get("status")
+        if status_id is not None:
+            try:
+                columns = columns.filter(pk=uuid.UUID(status_id))
+            except ValueError:
+                raise ValidationError({"status": "A valid UUID is required."})
+        elif "cursor" in self.request.query_params:
+            raise ValidationError({"status": "Required when a cursor is given."})
+
+        return list(columns)
+
+    def get_queryset(self, model=Issues):
+        queryset = model.objects.filter(
+            project_id=self.kwargs["project_id"]
+        ).select_related("assignee")
+
+        sprint_id = self.kwargs.get("sprint_id")
+        if sprint_id is not None:
+            queryset = queryset.filter(sprint_id=sprint_id)
+
+        cursor = self.request.query_params.get("cursor")
+        if cursor:
+            queryset = queryset.filter(after_cursor(cursor))
+        return queryset
+
+    def first_rows(self, queryset, columns, page_size):
+        """The first ``page_size + 1`` issues of every column."""
+        return (
+            queryset.filter(status__in=[column.pk for column in columns])
+            .annotate(
+                position=Window(
+                    RowNumber(),
+                    partition_by=F("status_id"),
+                    order_by=KEYSET_ORDERING,
+                )
+            )
+            .filter(position__lte=page_size + 1)
+            .order_by("status_id", "position")
+        )
+
+    def get(self, request, *args, **kwargs):
+        page_size = self.get_page_size()
+        columns = self.get_columns()
+        include_archived = self.include_archived()
+
+        issues = list(self.first_rows(self.get_queryset(), columns, page_size))
+        if include_archived:
+            archived = self.get_queryset(ArchivedIssue)
+            issues += self.first_rows(archived, columns, page_size)
+
+        grouped = defaultdict(list)
+        for issue in issues:
+            grouped[issue.status_id].append(issue)
+
+        for column in columns:
+            rows = grouped[column.pk]
+            if include_archived:
+                rows = keyset_sorted(rows)
+            column.issues = rows[:page_size]
+            column.next_cursor = (
+                encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+            )
+
+        return Response({"columns": BoardColumnSerializer(columns, many=True).data})
+
+
+class IssueTree(ArchivedIssuesMixin, APIView):
+    """
+    Returns an issue with its ancestor chain, every sub-issue below it and
+    the story/task points rolled up over that subtree.
+    ``include_archived=true`` also finds archived issues, and adds the
+    archived sub-issues to the tree and its points.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, CheckAPIPermission]
+    required_permission = "view_issues"
+
+    def get_project(self):
+        return self.kwargs["project_id"]
+
+    def get(self, request, *args, **kwargs):
+        queryset = Issues.objects.filter(
+            project_id=self.kwargs["project_id"]
+        ).select_related("assignee")
+        if self.include_archived():
+            issue = queryset.filter(pk=self.kwargs["pk"]).first()
+            if issue is None:
+                issue = get_object_or_404(
+                    ArchivedIssue.objects.select_related("assignee"),
+                    project_id=self.kwargs["project_id"],
+                    pk=self.kwargs["pk"],
+                )
+            return Response(IssueTreeSerializer(archived_tree(issue)).data)
+
+        issue = get_object_or_404(queryset, pk=self.kwargs["pk"])
+        data = {
+            "issue": issue,
+            "ancestors": queryset.ancestors(issue),
+            "sub_issues": queryset.subtree(issue, include_self=False),
+            "points": queryset.point_rollup(issue),
+        }
+        return Response(IssueTreeSerializer(data).data)
+
+
+class SprintBurndown(APIView):
+    """Daily remaining/completed points of a sprint, from its snapshots."""
+
+    permission_classes = [permissions.IsAuthenticated, CheckAPIPermission]
+    required_permission = "view_sprint"
+
+    def get_project(self):
+        return self.kwargs["project_id"]
+
+    def get(self, request, *args, **kwargs):
+        sprint = get_object_or_404(
+            Sprint, pk=self.kwargs["pk"], project_id=self.kwargs["project_id"]
+        )
+        return Response({"sprint": sprint.pk, "days": sprint_burndown(sprint.pk)})
+
+
+class ProjectVelocity(APIView):
+    """Committed and completed points of the project's latest sprints."""
+
+    permission_classes = [permissions.IsAuthenticated, CheckAPIPermission]
+    required_permission = "view_sprint"
+    limit = 10
+
+    def get_project(self):
+        return self.kwargs["project_id"]
+
+    def get(self, request, *args, **kwargs):
+        sprints = project_velocity(self.kwargs["project_id"], limit=self.limit)
+        return Response({"sprints": sprints})
+
+
+class IssueExport(ArchivedIssuesMixin, APIView):
+    """
+    Streams every issue of the project as CSV or NDJSON, archived issues
+    included with ``include_archived=true``.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, CheckAPIPermission]
+    required_permission = "view_issues"
+    content_types = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+    def get_project(self):
+        return self.kwargs["project_id"]
+
+    def get(self, request, *args, **kwargs):
+        file_format = self.kwargs["file_format"]
+        if file_format not in FILE_FORMATS:
+            raise Http404
+
+        project = get_object_or_404(Project, pk=self.kwargs["project_id"])
+        response = StreamingHttpResponse(
+            stream_export(project.pk, file_format, self.include_archived()),
+            content_type=self.content_types[file_format],
+        )
+        filename = f"{project.key}-issues.{file_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+
+class IssueImport(APIView):
+    """
+    Imports issues from an uploaded CSV or NDJSON ``file``.
+
+    Valid rows are written in chunks inside one transaction; invalid rows
+    are skipped and reported with their row number. Rows imported without
+    the parent they named are listed under ``warnings``.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+    required_permission = "add_issues"
+
+    def post(self, request, *args, **kwargs):
+        project = get_object_or_404(Project, pk=self.kwargs["project_id"])
+        if not has_user_permission(request.user, project, self.required_permission):
+            raise PermissionDenied()
+
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "This field is required."})
+
+        file_format = request.data.get("file_format") or upload.name.rsplit(".", 1)[-1]
+        if file_format not in FILE_FORMATS:
+            raise ValidationError({"file_format": f"Expected one of {FILE_FORMATS}."})
+
+        rows = read_rows(upload, file_format)
+        report = IssueImporter(project, request.user).run(rows)
+        return Response(report, status=201 if report["imported"] else 400)
+
+
+class IssueSearch(ArchivedIssuesMixin, APIView):
+    """
+    Searches the issues of a project by key, title and description.
+
+    ``q`` accepts web-search syntax (quoted phrases, ``-excluded`` words)
+    and near misses on keys and titles still match through trigrams.
+    ``include_archived=true`` merges in the best archived matches.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, CheckAPIPermission]
+    required_permission = "view_issues"
+    limit = 20
+    max_limit = 100
+
+    def get_project(self):
+        return self.kwargs["project_id"]
+
+    def get(self, request, *args, **kwargs):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise ValidationError({"q": "This field is required."})
+
+        try:
+            limit = int(request.query_params.get("limit", self.limit))
+        except ValueError:
+            raise ValidationError({"limit": "A valid integer is required."})
+        limit = max(1, min(limit, self.max_limit))
+
+        sources = [Issues, ArchivedIssue] if self.include_archived() else [Issues]
+        issues = [
+            issue
+            for model in sources
+            for issue in model.objects.filter(project_id=self.kwargs["project_id"])
+            .search(text)
+            .select_related("assignee")[:limit]
+        ]
+        if len(sources) > 1:
+            issues.sort(key=lambda issue: (issue.rank, issue.similarity), reverse=True)
+            issues = issues[:limit]
+        return Response({"results": IssueCardSerializer(issues, many=True).data})
+
+
+class IssueSummary(ArchivedIssuesMixin, APIView):
+    """
+    Returns a project's issue counts per status, assignee, type and
+    priority, read from IssueCounter rather than grouping the issues.
+    Issues without a status, assignee or priority are counted under null.
+    ``include_archived=true`` adds the archived issues, grouped on demand.
+    """
+
+    permission_classes = [permissions.IsAuthenticated, CheckAPIPermission]
+    required_permission = "view_issues"
+
+    def get_project(self):
+        return self.kwargs["project_id"]
+
+    def get(self, request, *args, **kwargs):
+        summary = IssueCounter.objects.summary(
+            self.kwargs["project_id"], include_archived=self.include_archived()
+        )
+        return Response(summary)
+
+
+class MyIssues(ArchivedIssuesMixin, APIView):
+    """
+    Returns the issues assigned to the requesting user across every project
+    they can view issues in, ordered by due date.
+
+    ``done=true|false`` filters on the status' ``is_done``; ``page_size``
+    and ``cursor`` page through the list. ``include_archived=true`` merges
+    in the user's archived issues. Pages are cached per user for
+    ``MY_WORK_CACHE_TIMEOUT`` seconds and dropped when one of the user's
+    issues is written.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+    page_size = 50
+    max_page_size = 200
+
+    def get_page_size(self):
+        value = self.request.query_params.get("page_size")
+        if value is None:
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            raise ValidationError({"page_size": "A valid integer is required."})
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_done(self):
+        value = self.request.query_params.get("done")
+        if value is None:
+            return None
+        if value.lower() in ("true", "1"):
+            return True
+        if value.lower() in ("false", "0"):
+            return False
+        raise ValidationError({"done": "Expected 'true' or 'false'."})
+
+    @staticmethod
+    def encode_cursor(issue):
+        payload = json.dumps([issue.due_date.isoformat(), str(issue.pk)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def after_cursor(cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            due_date, pk = json.loads(base64.urlsafe_b64decode(padded))
+            due_date = parse_date(due_date)
+            pk = uuid.UUID(pk)
+        except (TypeError, ValueError, AttributeError):
+            due_date = None
+
+        if due_date is None:
+            raise ValidationError({"cursor": "Invalid cursor."})
+        return Q(due_date__gt=due_date) | Q(due_date=due_date, pk__gt=pk)
+
+    def get(self, request, *args, **kwargs):
+        page_size = self.get_page_size()
+        done = self.get_done()
+        cursor = request.query_params.get("cursor")
+        include_archived = self.include_archived()
+        project_ids = sorted(my_work_projects(request.user))
+
+        params = {
+            "done": done,
+            "page_size": page_size,
+            "cursor": cursor,
+            "projects": project_ids,
+            "include_archived": include_archived,
+        }
+        key = my_work_cache_key(request.user.pk, params)
+        data = cache.get(key)
+        if data is None:
+            data = self.load(project_ids, done, cursor, page_size, include_archived)
+            cache.set(key, data, my_work_timeout())
+        return Response(data)
+
+    def load(self, project_ids, done, cursor, page_size, include_archived=False):
+        rows = []
+        for model in (Issues, ArchivedIssue) if include_archived else (Issues,):
+            issues = my_work_issues(
+                self.request.user, project_ids, done, model=model
+            ).select_related("assignee")
+            if cursor:
+                issues = issues.filter(self.after_cursor(cursor))
+            rows += issues[: page_size + 1]
+
+        rows = sorted(rows, key=lambda issue: (issue.due_date, issue.pk))
+        page = rows[:page_size]
+        return {
+            "next_cursor": (
+                self.encode_cursor(page[-1]) if len(rows) > page_size else None
+            ),
+            "results": list(MyIssueSerializer(page, many=True).data),
+        }
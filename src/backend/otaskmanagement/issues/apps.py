@@ -1,6 +1,24 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class IssuesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'issues'
+
+    def ready(self):
+        from common.activity import track_activity
+        from common.models import ActivityTargetEnum
+        from issues.signals import issue_saved, issue_deleted, sprint_changed
+
+        issues = self.get_model("Issues")
+        post_save.connect(issue_saved, sender=issues)
+        post_delete.connect(issue_deleted, sender=issues)
+
+        sprint = self.get_model("Sprint")
+        post_save.connect(sprint_changed, sender=sprint)
+        post_delete.connect(sprint_changed, sender=sprint)
+
+        # After the receivers above, which read the pre-save values.
+        track_activity(issues, ActivityTargetEnum.ISSUE)
+        track_activity(sprint, ActivityTargetEnum.SPRINT)
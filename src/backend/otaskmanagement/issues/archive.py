@@ -0,0 +1,154 @@
+"""
+Archival of the issues of closed sprints.
+
+Issues of a sprint that is closed and ended more than
+``ISSUE_ARCHIVE_AFTER_DAYS`` days ago move from Issues to ArchivedIssue,
+``ISSUE_ARCHIVE_BATCH_SIZE`` issues per transaction, so the hot table and
+its indexes only grow with active work. Each batch is a single statement
+that deletes the issues with their IssueClosure rows and inserts them
+into the archive; the IssueCounter triggers count the delete like any
+other. Rows another transaction holds locked are left for the next run.
+
+Only issues without sub-issues left in Issues move. A parent follows its
+sub-issues in a later batch, and one with a sub-issue outside the
+archived sprints stays where it is. Archived issues have no IssueClosure
+rows, so their trees are walked through ``parent`` one level at a time.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import GeneratedField
+from django.utils import timezone
+
+from issues.models import ArchivedIssue, IssueClosure, Issues, Sprint
+from issues.signals import queue_my_work_invalidation
+from otaskmanagement.events import queue_change
+
+
+def archived_columns():
+    """Columns copied from Issues; the archive fills in the others itself."""
+    return [
+        field.column
+        for field in ArchivedIssue._meta.concrete_fields
+        if not isinstance(field, GeneratedField) and field.name != "archived_at"
+    ]
+
+
+def archive_closed_sprints(days=None, batch_size=None, project_id=None):
+    """Archive the issues of old closed sprints and return how many moved."""
+    if days is None:
+        days = settings.ISSUE_ARCHIVE_AFTER_DAYS
+    batch_size = batch_size or settings.ISSUE_ARCHIVE_BATCH_SIZE
+    cutoff = timezone.localdate() - timedelta(days=days)
+
+    archived = 0
+    while True:
+        with transaction.atomic():
+            rows = archive_batch(cutoff, batch_size, project_id)
+            for project in {project for project, _ in rows}:
+                queue_change(project, "issues")
+            queue_my_work_invalidation({assignee for _, assignee in rows})
+        if not rows:
+            return archived
+        archived += len(rows)
+
+
+def archive_batch(cutoff, batch_size, project_id=None):
+    """
+    Move up to ``batch_size`` issues of sprints closed and ended before
+    ``cutoff``. Returns the ``(project_id, assignee_id)`` of every issue.
+    """
+    issues = Issues._meta.db_table
+    columns = ", ".join(archived_columns())
+    project_filter = "AND i.project_id = %(project)s" if project_id else ""
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH chosen AS (
+                SELECT i.id FROM {issues} i
+                JOIN {Sprint._meta.db_table} s ON s.id = i.sprint_id
+                WHERE s.is_closed AND s.end_date < %(cutoff)s {project_filter}
+                AND NOT EXISTS (SELECT 1 FROM {issues} c WHERE c.parent_id = i.id)
+                LIMIT %(limit)s
+                FOR UPDATE OF i SKIP LOCKED
+            ), unlinked AS (
+                DELETE FROM {IssueClosure._meta.db_table}
+                WHERE descendant_id IN (SELECT id FROM chosen)
+            ), moved AS (
+                DELETE FROM {issues} WHERE id IN (SELECT id FROM chosen)
+                RETURNING {columns}
+            )
+            INSERT INTO {ArchivedIssue._meta.db_table} ({columns})
+            SELECT {columns} FROM moved
+            RETURNING project_id, assignee_id
+            """,
+            {"cutoff": cutoff, "limit": batch_size, "project": project_id},
+        )
+        return cursor.fetchall()
+
+
+def archived_descendants(issue_ids):
+    """Archived issues below the given issues, one query per level."""
+    descendants = []
+    level = list(issue_ids)
+    while level:
+        rows = list(
+            ArchivedIssue.objects.filter(parent__in=level).select_related("assignee")
+        )
+        descendants += rows
+        level = [row.pk for row in rows]
+    return descendants
+
+
+def archived_ancestors(issue):
+    """The parent chain of an archived issue, starting from the root."""
+    chain = []
+    parent_id = issue.parent
+    while parent_id is not None:
+        parent = (
+            ArchivedIssue.objects.filter(pk=parent_id).select_related("assignee").first()
+        )
+        if parent is None:
+            break
+        chain.append(parent)
+        parent_id = parent.parent
+    chain.reverse()
+
+    # The top of the chain may still be in Issues, with its own ancestors.
+    active = Issues.objects.select_related("assignee")
+    parent = active.filter(pk=parent_id).first() if parent_id else None
+    if parent is not None:
+        chain = [*active.ancestors(parent), parent, *chain]
+    return chain
+
+
+def archived_tree(issue):
+    """
+    The IssueTree data of ``issue``, archived or not, including the
+    archived issues below it.
+    """
+    if issue.is_archived:
+        ancestors = archived_ancestors(issue)
+        sub_issues = []
+        points = ArchivedIssue.objects.filter(pk=issue.pk).point_totals()
+    else:
+        active = Issues.objects.select_related("assignee")
+        ancestors = list(active.ancestors(issue))
+        sub_issues = list(active.subtree(issue, include_self=False))
+        points = active.point_rollup(issue)
+
+    archived = archived_descendants([issue.pk, *(row.pk for row in sub_issues)])
+    if archived:
+        totals = ArchivedIssue.objects.filter(
+            pk__in=[row.pk for row in archived]
+        ).point_totals()
+        points = {name: points[name] + totals[name] for name in points}
+    return {
+        "issue": issue,
+        "ancestors": ancestors,
+        "sub_issues": sub_issues + archived,
+        "points": points,
+    }
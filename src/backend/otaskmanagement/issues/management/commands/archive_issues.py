@@ -0,0 +1,35 @@
+"""
+Move the issues of old closed sprints to the archive.
+
+    python manage.py archive_issues [--days 90] [--batch-size 1000] [--project <uuid>]
+
+The same archival runs nightly from Celery beat with the
+ISSUE_ARCHIVE_AFTER_DAYS and ISSUE_ARCHIVE_BATCH_SIZE settings; the
+command overrides them for one run.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from issues.archive import archive_closed_sprints
+
+
+class Command(BaseCommand):
+    help = "Archive the issues of sprints closed more than --days days ago."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Minimum age of the sprints.")
+        parser.add_argument("--batch-size", type=int, help="Issues per transaction.")
+        parser.add_argument("--project", help="Only this project's issues.")
+
+    def handle(self, *args, **options):
+        if options["days"] is not None and options["days"] < 0:
+            raise CommandError("--days must not be negative.")
+        if options["batch_size"] is not None and options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        archived = archive_closed_sprints(
+            days=options["days"],
+            batch_size=options["batch_size"],
+            project_id=options["project"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} issues."))
@@ -0,0 +1,157 @@
+"""
+Time per-project reads and vacuum on the current layout of Issues.
+
+    python manage.py benchmark_issue_layout [--project <uuid>] [--repeat 5]
+    python manage.py partition_issues --partitions 16
+    python manage.py benchmark_issue_layout
+
+Run it before and after ``partition_issues`` to compare the plain and the
+hash partitioned table. The queries are the board, a keyset page and the
+counter recount of one project, by default the one with the most issues.
+For vacuum, ``--churn`` of the project's issues are rewritten in place
+and the relation holding them is vacuumed: the whole table when it is
+plain, the project's partition when it is partitioned. Rewriting leaves
+the rows as they were, but run it against a copy of production rather
+than production itself.
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import F, Sum, Window
+from django.db.models.functions import RowNumber
+
+from issues.models import (
+    CounterDimensionEnum,
+    IssueCounter,
+    Issues,
+    IssueStatus,
+)
+from issues.partitioning import issues_partitions
+from otaskmanagement.pagination import KEYSET_ORDERING
+
+
+class Command(BaseCommand):
+    help = "Benchmark per-project queries and vacuum on the Issues table."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", help="Project to query.")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--churn", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        project_id = options["project"] or self.largest_project()
+        if project_id is None:
+            raise CommandError("There are no issues to benchmark.")
+        repeat = max(options["repeat"], 1)
+        statuses = list(
+            IssueStatus.objects.filter(project_id=project_id).values_list(
+                "pk", flat=True
+            )
+        )
+
+        partitions = issues_partitions()
+        relation = self.project_relation(project_id)
+        self.stdout.write(f"layout:   {partitions or 'no'} partitions")
+        self.stdout.write(f"project:  {project_id}")
+        self.stdout.write(f"relation: {relation}, {self.relation_sizes(relation)}")
+
+        cases = {
+            "board": lambda: self.board(project_id, statuses),
+            "keyset page": lambda: self.keyset_page(project_id),
+            "counter recount": lambda: IssueCounter.objects.expected(project_id),
+        }
+        self.stdout.write(f"{'case':<16} {'median ms':>10} {'min ms':>10}")
+        for name, case in cases.items():
+            case()  # Warm up.
+            self.report(name, [self.timed(case) for _ in range(repeat)])
+
+        churn = options["churn"]
+        self.report(
+            "vacuum",
+            [self.vacuum(project_id, relation, churn) for _ in range(repeat)],
+        )
+
+    def report(self, name, timings):
+        timings = [timing * 1000 for timing in timings]
+        self.stdout.write(
+            f"{name:<16} {statistics.median(timings):>10.1f} {min(timings):>10.1f}"
+        )
+
+    @staticmethod
+    def timed(case):
+        started = time.perf_counter()
+        case()
+        return time.perf_counter() - started
+
+    @staticmethod
+    def largest_project():
+        return (
+            IssueCounter.objects.filter(dimension=CounterDimensionEnum.TYPE)
+            .values("project_id")
+            .annotate(total=Sum("count"))
+            .order_by("-total")
+            .values_list("project_id", flat=True)
+            .first()
+        )
+
+    @staticmethod
+    def project_relation(project_id):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT tableoid::regclass::text FROM {Issues._meta.db_table} "
+                "WHERE project_id = %s LIMIT 1",
+                [project_id],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else Issues._meta.db_table
+
+    @staticmethod
+    def relation_sizes(relation):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_size_pretty(pg_table_size(%s::regclass)), "
+                "pg_size_pretty(pg_indexes_size(%s::regclass))",
+                [relation, relation],
+            )
+            table, indexes = cursor.fetchone()
+        return f"table {table}, indexes {indexes}"
+
+    @staticmethod
+    def board(project_id, statuses):
+        return list(
+            Issues.objects.filter(project_id=project_id, status__in=statuses)
+            .annotate(
+                position=Window(
+                    RowNumber(), partition_by=F("status_id"), order_by=KEYSET_ORDERING
+                )
+            )
+            .filter(position__lte=21)
+            .order_by("status_id", "position")
+        )
+
+    @staticmethod
+    def keyset_page(project_id):
+        return list(
+            Issues.objects.filter(project_id=project_id).order_by(*KEYSET_ORDERING)[:51]
+        )
+
+    @staticmethod
+    def vacuum(project_id, relation, churn):
+        """Time VACUUM of ``relation`` after rewriting ``churn`` issues."""
+        table = Issues._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {table} SET title = title WHERE id IN (
+                    SELECT id FROM {table} WHERE project_id = %s LIMIT %s
+                ) AND project_id = %s
+                """,
+                [project_id, churn, project_id],
+            )
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            cursor.execute(f"VACUUM {relation}")
+        return time.perf_counter() - started
@@ -0,0 +1,48 @@
+"""
+Convert Issues to hash partitions on ``project_id``, or back.
+
+    python manage.py partition_issues --partitions 16 [--batch-size 10000]
+        [--lock-timeout 5] [--swap-timeout 60]
+    python manage.py partition_issues --partitions 0
+
+The table stays readable and writable while its rows are copied; only
+the final swap locks it. The swap gives up, leaving the table as it was,
+after waiting ``--lock-timeout`` seconds for the lock or when a statement
+under it runs longer than ``--swap-timeout`` seconds. See
+``issues.partitioning``.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from issues.partitioning import rebuild_issues_table
+
+
+class Command(BaseCommand):
+    help = "Rebuild Issues with the given number of hash partitions, 0 for none."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--partitions", type=int, required=True)
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument("--lock-timeout", type=float, default=5)
+        parser.add_argument("--swap-timeout", type=float, default=60)
+
+    def handle(self, *args, **options):
+        if options["partitions"] < 0:
+            raise CommandError("--partitions must not be negative.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        if options["lock_timeout"] <= 0 or options["swap_timeout"] <= 0:
+            raise CommandError("--lock-timeout and --swap-timeout must be positive.")
+
+        try:
+            rebuild_issues_table(
+                options["partitions"],
+                options["batch_size"],
+                lock_timeout=options["lock_timeout"],
+                swap_timeout=options["swap_timeout"],
+                log=self.stdout.write,
+            )
+        except (ValueError, DatabaseError) as e:
+            raise CommandError(str(e))
@@ -0,0 +1,44 @@
+"""
+Rebuild or verify the IssueCounter table.
+
+    python manage.py rebuild_issue_counters [--project <uuid>] [--verify-only]
+
+Without ``--verify-only`` the counters are recounted from Issues and then
+verified. With it, nothing is written and the command fails when any
+counter is off, which makes it usable as a periodic consistency check.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from issues.models import IssueCounter
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-project issue counters from Issues and verify them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--project", help="Only this project's counters.")
+        parser.add_argument(
+            "--verify-only",
+            action="store_true",
+            help="Report drifted counters without rebuilding them.",
+        )
+
+    def handle(self, *args, **options):
+        project_id = options["project"]
+
+        if not options["verify_only"]:
+            rows = IssueCounter.objects.rebuild(project_id)
+            self.stdout.write(f"Rebuilt {rows} issue counters.")
+
+        mismatches = IssueCounter.objects.verify(project_id)
+        for (project, dimension, value), (stored, expected) in sorted(
+            mismatches.items()
+        ):
+            self.stderr.write(
+                f"{project} {dimension}={value or '-'}: "
+                f"stored {stored}, expected {expected}"
+            )
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} issue counters are off.")
+        self.stdout.write(self.style.SUCCESS("Issue counters are consistent."))
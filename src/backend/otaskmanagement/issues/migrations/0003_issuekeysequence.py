@@ -0,0 +1,33 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0002_alter_sprint_name_sprint_unique_sprint_project'),
+        ('project', '0004_remove_projectmembership_access_project_access_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueKeySequence',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='project.project')),
+                ('last_value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        # Continue numbering after keys that already follow <KEY>-<n>.
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO issues_issuekeysequence (project_id, last_value)
+                SELECT project_id, MAX(substring(key FROM '-([0-9]+)$')::bigint)
+                FROM issues_issues
+                WHERE key ~ '-[0-9]+$'
+                GROUP BY project_id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0003_issuekeysequence'),
+        ('project', '0004_remove_projectmembership_access_project_access_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='issues',
+            index=models.Index(fields=['project', 'status', '-created_at'], name='issues_issu_project_580eba_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='issues',
+            index=models.Index(fields=['sprint', 'status', '-created_at'], name='issues_issu_sprint__8d4923_idx'),
+        ),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+CLOSURE_TRIGGERS = """
+CREATE FUNCTION issues_closure_on_insert() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO issues_issueclosure (ancestor_id, descendant_id, depth)
+    SELECT ancestor_id, NEW.id, depth + 1
+    FROM issues_issueclosure
+    WHERE descendant_id = NEW.parent_id
+    UNION ALL
+    SELECT NEW.id, NEW.id, 0;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION issues_closure_on_reparent() RETURNS trigger AS $$
+BEGIN
+    IF NEW.parent_id IS NOT NULL AND EXISTS (
+        SELECT 1 FROM issues_issueclosure
+        WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+    ) THEN
+        RAISE EXCEPTION 'Issue % cannot be moved under its own sub-issue', NEW.id
+            USING ERRCODE = 'integrity_constraint_violation';
+    END IF;
+
+    -- Detach the subtree from its old ancestors.
+    DELETE FROM issues_issueclosure
+    WHERE descendant_id IN (
+        SELECT descendant_id FROM issues_issueclosure WHERE ancestor_id = NEW.id
+    )
+    AND ancestor_id IN (
+        SELECT ancestor_id FROM issues_issueclosure
+        WHERE descendant_id = NEW.id AND ancestor_id <> NEW.id
+    );
+
+    -- Attach it below the new parent's ancestors.
+    INSERT INTO issues_issueclosure (ancestor_id, descendant_id, depth)
+    SELECT super.ancestor_id, sub.descendant_id, super.depth + sub.depth + 1
+    FROM issues_issueclosure super
+    JOIN issues_issueclosure sub ON sub.ancestor_id = NEW.id
+    WHERE super.descendant_id = NEW.parent_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER issues_closure_insert
+AFTER INSERT ON issues_issues
+FOR EACH ROW EXECUTE FUNCTION issues_closure_on_insert();
+
+CREATE TRIGGER issues_closure_reparent
+AFTER UPDATE OF parent_id ON issues_issues
+FOR EACH ROW WHEN (OLD.parent_id IS DISTINCT FROM NEW.parent_id)
+EXECUTE FUNCTION issues_closure_on_reparent();
+"""
+
+DROP_CLOSURE_TRIGGERS = """
+DROP TRIGGER IF EXISTS issues_closure_reparent ON issues_issues;
+DROP TRIGGER IF EXISTS issues_closure_insert ON issues_issues;
+DROP FUNCTION IF EXISTS issues_closure_on_reparent();
+DROP FUNCTION IF EXISTS issues_closure_on_insert();
+"""
+
+BACKFILL_CLOSURE = """
+INSERT INTO issues_issueclosure (ancestor_id, descendant_id, depth)
+WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS (
+    SELECT id, id, 0 FROM issues_issues
+    UNION ALL
+    SELECT tree.ancestor_id, child.id, tree.depth + 1
+    FROM tree
+    JOIN issues_issues child ON child.parent_id = tree.descendant_id
+)
+SELECT ancestor_id, descendant_id, depth FROM tree;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0004_issues_board_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='issues.issues')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='issues.issues')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='issues_issu_descend_d48da9_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='unique_issue_closure')],
+            },
+        ),
+        migrations.RunSQL(sql=BACKFILL_CLOSURE, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(sql=CLOSURE_TRIGGERS, reverse_sql=DROP_CLOSURE_TRIGGERS),
+    ]
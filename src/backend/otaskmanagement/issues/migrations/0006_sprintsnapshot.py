@@ -0,0 +1,29 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('issues', '0005_issueclosure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SprintSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('is_done', models.BooleanField(default=False)),
+                ('issue_count', models.PositiveIntegerField(default=0)),
+                ('points', models.PositiveIntegerField(default=0)),
+                ('sprint', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='issues.sprint')),
+                ('status', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='issues.issuestatus')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('sprint', 'day', 'status'), name='unique_sprint_snapshot')],
+            },
+        ),
+    ]
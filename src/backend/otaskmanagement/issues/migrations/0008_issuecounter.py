@@ -0,0 +1,164 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:23
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Every issue counts once per dimension; missing values are keyed by ''.
+DIMENSIONS = """
+CROSS JOIN LATERAL (VALUES
+    ('status', changes.status_id::text),
+    ('assignee', changes.assignee_id::text),
+    ('type', changes.type),
+    ('priority', changes.priority)
+) AS dimensions (dimension, value)
+"""
+
+
+def counter_function(name, changes):
+    """
+    Statement level trigger function applying the net change of every
+    counter touched by the statement, then dropping counters left at 0.
+    Rows are upserted in key order so concurrent writers lock them in
+    the same order.
+    """
+    return f"""
+CREATE FUNCTION {name}() RETURNS trigger AS $$
+DECLARE
+    emptied bigint[];
+BEGIN
+    WITH changes AS ({changes}),
+    deltas AS (
+        SELECT changes.project_id, dimension, COALESCE(value, '') AS value,
+               SUM(changes.delta) AS delta
+        FROM changes
+        {DIMENSIONS}
+        GROUP BY 1, 2, 3
+        HAVING SUM(changes.delta) <> 0
+    ),
+    upserted AS (
+        INSERT INTO issues_issuecounter (project_id, dimension, value, count)
+        SELECT project_id, dimension, value, delta
+        FROM deltas
+        ORDER BY project_id, dimension, value
+        ON CONFLICT (project_id, dimension, value)
+        DO UPDATE SET count = issues_issuecounter.count + EXCLUDED.count
+        RETURNING id, count
+    )
+    SELECT array_agg(id) INTO emptied FROM upserted WHERE count = 0;
+
+    IF emptied IS NOT NULL THEN
+        DELETE FROM issues_issuecounter WHERE id = ANY(emptied);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+COLUMNS = "project_id, status_id, assignee_id, type, priority"
+
+COUNTER_TRIGGERS = (
+    counter_function(
+        "issues_counters_on_insert",
+        f"SELECT {COLUMNS}, 1 AS delta FROM new_rows",
+    )
+    + counter_function(
+        "issues_counters_on_delete",
+        f"SELECT {COLUMNS}, -1 AS delta FROM old_rows",
+    )
+    + counter_function(
+        "issues_counters_on_update",
+        f"SELECT {COLUMNS}, 1 AS delta FROM new_rows "
+        f"UNION ALL SELECT {COLUMNS}, -1 AS delta FROM old_rows",
+    )
+    + """
+CREATE TRIGGER issues_counters_insert
+AFTER INSERT ON issues_issues
+REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION issues_counters_on_insert();
+
+CREATE TRIGGER issues_counters_delete
+AFTER DELETE ON issues_issues
+REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION issues_counters_on_delete();
+
+CREATE TRIGGER issues_counters_update
+AFTER UPDATE ON issues_issues
+REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION issues_counters_on_update();
+"""
+)
+
+DROP_COUNTER_TRIGGERS = """
+DROP TRIGGER IF EXISTS issues_counters_update ON issues_issues;
+DROP TRIGGER IF EXISTS issues_counters_delete ON issues_issues;
+DROP TRIGGER IF EXISTS issues_counters_insert ON issues_issues;
+DROP FUNCTION IF EXISTS issues_counters_on_update();
+DROP FUNCTION IF EXISTS issues_counters_on_delete();
+DROP FUNCTION IF EXISTS issues_counters_on_insert();
+"""
+
+BACKFILL_COUNTERS = f"""
+INSERT INTO issues_issuecounter (project_id, dimension, value, count)
+SELECT changes.project_id, dimension, COALESCE(value, ''), COUNT(*)
+FROM issues_issues changes
+{DIMENSIONS}
+GROUP BY 1, 2, 3;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issues", "0007_issues_search"),
+        ("project", "0004_remove_projectmembership_access_project_access_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueCounter",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "dimension",
+                    models.CharField(
+                        choices=[
+                            ("status", "Status"),
+                            ("assignee", "Assignee"),
+                            ("type", "Type"),
+                            ("priority", "Priority"),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ("value", models.CharField(blank=True, max_length=64)),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "project",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="project.project",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("project", "dimension", "value"),
+                        name="unique_issue_counter",
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(sql=BACKFILL_COUNTERS, reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(sql=COUNTER_TRIGGERS, reverse_sql=DROP_COUNTER_TRIGGERS),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issues", "0008_issuecounter"),
+        ("project", "0004_remove_projectmembership_access_project_access_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="issues",
+            index=models.Index(
+                fields=["assignee", "due_date", "id"],
+                include=("project", "status"),
+                name="issues_assignee_due_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Type specific fields move from the StoryMeta and TaskMeta rows onto their
+# issue. BugMeta rows carry no fields. Rows attached to an issue of another
+# type were never shown consistently and are dropped.
+MOVE_META = """
+UPDATE issues_issues i
+SET meta = jsonb_build_object('story_point', m.story_point)
+FROM issues_storymeta m
+WHERE m.issue_id = i.id AND i.type = 'userstory';
+
+UPDATE issues_issues i
+SET meta = jsonb_build_object('task_point', m.task_point)
+FROM issues_taskmeta m
+WHERE m.issue_id = i.id AND i.type = 'task';
+"""
+
+RESTORE_META = """
+INSERT INTO issues_storymeta (id, issue_id, story_point, created_at, updated_at)
+SELECT gen_random_uuid(), id, (meta ->> 'story_point')::integer, created_at, updated_at
+FROM issues_issues WHERE meta ? 'story_point';
+
+INSERT INTO issues_taskmeta (id, issue_id, task_point, created_at, updated_at)
+SELECT gen_random_uuid(), id, (meta ->> 'task_point')::integer, created_at, updated_at
+FROM issues_issues WHERE meta ? 'task_point';
+
+INSERT INTO issues_bugmeta (id, issue_id, created_at, updated_at)
+SELECT gen_random_uuid(), id, created_at, updated_at
+FROM issues_issues WHERE type = 'bug';
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issues", "0009_issues_assignee_due_idx"),
+        ("project", "0004_remove_projectmembership_access_project_access_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issues",
+            name="meta",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.RunSQL(sql=MOVE_META, reverse_sql=RESTORE_META),
+        migrations.RemoveField(
+            model_name="bugmeta",
+            name="created_by",
+        ),
+        migrations.RemoveField(
+            model_name="bugmeta",
+            name="issue",
+        ),
+        migrations.RemoveField(
+            model_name="bugmeta",
+            name="updated_by",
+        ),
+        migrations.RemoveField(
+            model_name="storymeta",
+            name="created_by",
+        ),
+        migrations.RemoveField(
+            model_name="storymeta",
+            name="issue",
+        ),
+        migrations.RemoveField(
+            model_name="storymeta",
+            name="updated_by",
+        ),
+        migrations.RemoveField(
+            model_name="taskmeta",
+            name="created_by",
+        ),
+        migrations.RemoveField(
+            model_name="taskmeta",
+            name="issue",
+        ),
+        migrations.RemoveField(
+            model_name="taskmeta",
+            name="updated_by",
+        ),
+        migrations.DeleteModel(
+            name="BugMeta",
+        ),
+        migrations.DeleteModel(
+            name="StoryMeta",
+        ),
+        migrations.DeleteModel(
+            name="TaskMeta",
+        ),
+        migrations.AddConstraint(
+            model_name="issues",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("meta__story_point__isnull", True),
+                    models.Q(("meta__story_point__gte", 0), ("type", "userstory")),
+                    _connector="OR",
+                ),
+                name="issues_meta_story_point",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="issues",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("meta__task_point__isnull", True),
+                    models.Q(("meta__task_point__gte", 0), ("type", "task")),
+                    _connector="OR",
+                ),
+                name="issues_meta_task_point",
+            ),
+        ),
+    ]
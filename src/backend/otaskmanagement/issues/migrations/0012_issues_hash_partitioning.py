@@ -0,0 +1,74 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Issues is converted to hash partitions, and back, only by the
+# partition_issues command; see issues.partitioning. This migration
+# leaves the constraints in a shape both layouts can hold, so that the
+# migration state stays true to either.
+#
+# The parent foreign key is created here rather than by Django: the
+# partitioned layout recreates it on (parent_id, project_id).
+PARENT_FK = "issues_issues_parent_fk"
+
+ADD_PARENT_FK = f"""
+ALTER TABLE issues_issues ADD CONSTRAINT {PARENT_FK}
+FOREIGN KEY (parent_id) REFERENCES issues_issues (id)
+DEFERRABLE INITIALLY DEFERRED
+"""
+
+DROP_PARENT_FK = f"ALTER TABLE issues_issues DROP CONSTRAINT IF EXISTS {PARENT_FK}"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issues", "0011_archivedissue"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="issueclosure",
+            name="ancestor",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="descendant_links",
+                to="issues.issues",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="issueclosure",
+            name="descendant",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="ancestor_links",
+                to="issues.issues",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="issues",
+            name="key",
+            field=models.CharField(db_index=True, max_length=108),
+        ),
+        migrations.AddConstraint(
+            model_name="issues",
+            constraint=models.UniqueConstraint(
+                fields=("project", "key"), name="unique_issue_key_per_project"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="issues",
+            name="parent",
+            field=models.ForeignKey(
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="sub_issues",
+                to="issues.issues",
+            ),
+        ),
+        migrations.RunSQL(ADD_PARENT_FK, DROP_PARENT_FK),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issues", "0012_issues_hash_partitioning"),
+        ("project", "0005_project_key_unique"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="archivedissue",
+            index=models.Index(fields=["parent"], name="archivedissue_parent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="archivedissue",
+            index=models.Index(
+                fields=["assignee", "due_date", "id"],
+                name="archivedissue_assignee_due_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:55
+
+from django.db import migrations
+
+# Two concurrent reparents can each pass the cycle check against closure
+# rows the other has not committed yet (A under B and B under A), so
+# reparents within a project take a transaction level advisory lock first.
+REPARENT_FUNCTION = """
+CREATE OR REPLACE FUNCTION issues_closure_on_reparent() RETURNS trigger AS $$
+BEGIN{lock}
+    IF NEW.parent_id IS NOT NULL AND EXISTS (
+        SELECT 1 FROM issues_issueclosure
+        WHERE ancestor_id = NEW.id AND descendant_id = NEW.parent_id
+    ) THEN
+        RAISE EXCEPTION 'Issue % cannot be moved under its own sub-issue', NEW.id
+            USING ERRCODE = 'integrity_constraint_violation';
+    END IF;
+
+    -- Detach the subtree from its old ancestors.
+    DELETE FROM issues_issueclosure
+    WHERE descendant_id IN (
+        SELECT descendant_id FROM issues_issueclosure WHERE ancestor_id = NEW.id
+    )
+    AND ancestor_id IN (
+        SELECT ancestor_id FROM issues_issueclosure
+        WHERE descendant_id = NEW.id AND ancestor_id <> NEW.id
+    );
+
+    -- Attach it below the new parent's ancestors.
+    INSERT INTO issues_issueclosure (ancestor_id, descendant_id, depth)
+    SELECT super.ancestor_id, sub.descendant_id, super.depth + sub.depth + 1
+    FROM issues_issueclosure super
+    JOIN issues_issueclosure sub ON sub.ancestor_id = NEW.id
+    WHERE super.descendant_id = NEW.parent_id;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+PROJECT_LOCK = """
+    PERFORM pg_advisory_xact_lock(hashtext(NEW.project_id::text));
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("issues", "0013_archivedissue_tree_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=REPARENT_FUNCTION.format(lock=PROJECT_LOCK),
+            reverse_sql=REPARENT_FUNCTION.format(lock=""),
+        ),
+    ]
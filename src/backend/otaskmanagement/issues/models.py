@@ -1,10 +1,20 @@
 """Issue database model definitions."""
 
-from django.db import models
+from django.db import connections, models, transaction
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+    TrigramSimilarity,
+)
+from django.db.models.fields.json import KT
+from django.db.models.functions import Cast, Greatest, Now
 from django.utils.translation import gettext_lazy as _
 
-from otaskmanagement.models import BaseModel
+from otaskmanagement.models import BaseModel, LoadedValuesMixin
 from project.models import Project
 
 
@@ -26,7 +36,21 @@ class StateEnum(models.TextChoices):
     APPROVED = "approved", _("Approved")
 
 
-class Sprint(BaseModel):
+# Keys of Issues.meta allowed for each issue type. All of them hold
+# non-negative integers.
+ISSUE_META_FIELDS = {
+    IssueTypeEnum.USERSTORY: ("story_point",),
+    IssueTypeEnum.TASK: ("task_point",),
+    IssueTypeEnum.BUG: (),
+}
+
+
+def meta_value(name):
+    """Integer value of an Issues.meta key, NULL when the key is absent."""
+    return Cast(KT(f"meta__{name}"), models.IntegerField())
+
+
+class Sprint(LoadedValuesMixin, BaseModel):
     name = models.CharField(max_length=256, verbose_name=_("Sprint Name"))
     project = models.ForeignKey(
         Project,
@@ -70,8 +94,137 @@ class IssueStatus(BaseModel):
 """SIGNALS"""
 
 
-class Issues(BaseModel):
-    key = models.CharField(max_length=108, unique=True, db_index=True)
+class IssueKeySequenceManager(models.Manager):
+    def reserve(self, project_id, count=1):
+        """
+        Atomically reserve ``count`` consecutive issue numbers for a project.
+
+        A single upsert bumps the project's counter and returns the new
+        value together with the project key, so concurrent writers never
+        scan Issues or retry on a duplicate key. The counter row is locked
+        only until the surrounding transaction commits.
+
+        Returns ``(project_key, first, last)``, and raises
+        ``Project.DoesNotExist`` when there is no such project.
+        """
+        if count < 1:
+            raise ValueError("count must be a positive integer")
+
+        sequence_table = self.model._meta.db_table
+        project_table = Project._meta.db_table
+
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f"""
+                WITH seq AS (
+                    INSERT INTO {sequence_table} (project_id, last_value)
+                    SELECT id, %s FROM {project_table} WHERE id = %s
+                    ON CONFLICT (project_id) DO UPDATE
+                    SET last_value = {sequence_table}.last_value + EXCLUDED.last_value
+                    RETURNING project_id, last_value
+                )
+                SELECT p.key, seq.last_value FROM seq
+                JOIN {project_table} p ON p.id = seq.project_id
+                """,
+                [count, project_id],
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            raise Project.DoesNotExist(f"Project {project_id} does not exist.")
+        project_key, last = row
+        return project_key, last - count + 1, last
+
+    def advance_to(self, project_id, value):
+        """Make sure numbers up to ``value`` are never handed out again."""
+        sequence_table = self.model._meta.db_table
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {sequence_table} (project_id, last_value)
+                VALUES (%s, %s)
+                ON CONFLICT (project_id) DO UPDATE
+                SET last_value = GREATEST(
+                    {sequence_table}.last_value, EXCLUDED.last_value
+                )
+                """,
+                [project_id, value],
+            )
+
+    def allocate_keys(self, project_id, count=1):
+        """Return ``count`` new keys of the form ``<Project.key>-<n>``."""
+        project_key, first, last = self.reserve(project_id, count)
+        return [f"{project_key}-{number}" for number in range(first, last + 1)]
+
+
+class IssueKeySequence(models.Model):
+    """Last issue number handed out per project."""
+
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    last_value = models.BigIntegerField(default=0)
+
+    objects = IssueKeySequenceManager()
+
+
+class IssuesQuerySet(models.QuerySet):
+    """Hierarchy lookups answered from IssueClosure, and issue search."""
+
+    def subtree(self, issue, include_self=True):
+        """Every issue below ``issue``, at any depth."""
+        lookups = {"ancestor_links__ancestor": issue}
+        if not include_self:
+            lookups["ancestor_links__depth__gt"] = 0
+        return self.filter(**lookups)
+
+    def ancestors(self, issue):
+        """The parent chain of ``issue``, starting from the root."""
+        return self.filter(
+            descendant_links__descendant=issue, descendant_links__depth__gt=0
+        ).order_by("-descendant_links__depth")
+
+    def search(self, text):
+        """
+        Ranked full-text search on key, title and description, combined
+        with trigram matching on key and title to tolerate typos.
+        """
+        query = SearchQuery(text, search_type="websearch", config="simple")
+        return (
+            self.filter(
+                models.Q(search_vector=query)
+                | models.Q(title__trigram_similar=text)
+                | models.Q(key__trigram_similar=text)
+            )
+            .annotate(
+                rank=SearchRank(models.F("search_vector"), query),
+                similarity=Greatest(
+                    TrigramSimilarity("title", text), TrigramSimilarity("key", text)
+                ),
+            )
+            .order_by("-rank", "-similarity")
+        )
+
+    def point_rollup(self, issue):
+        """Sum story and task points over the subtree of ``issue``."""
+        return self.subtree(issue).point_totals()
+
+    def point_totals(self):
+        """Count the issues and sum their story and task points."""
+        return self.aggregate(
+            issue_count=models.Count("id"),
+            story_point=models.Sum(meta_value("story_point"), default=0),
+            task_point=models.Sum(meta_value("task_point"), default=0),
+        )
+
+
+class Issues(LoadedValuesMixin, BaseModel):
+    # Unique per project, as a partitioned layout can hold; project keys
+    # are unique and prefix the issue keys, so keys do not repeat anyway.
+    key = models.CharField(max_length=108, db_index=True)
     title = models.CharField(max_length=208)
     description = models.TextField(null=True, blank=True)
     start_date = models.DateField()
@@ -115,11 +268,15 @@ class Issues(BaseModel):
         null=True,
     )
 
+    # The database foreign key takes a different shape in the plain and
+    # the partitioned layout, so it is created by migration 0012 and by
+    # issues.partitioning instead of Django.
     parent = models.ForeignKey(
         "self",
         on_delete=models.CASCADE,
         related_name="sub_issues",
         null=True,
+        db_constraint=False,
     )
 
     assignee = models.ForeignKey(
@@ -136,29 +293,346 @@ class Issues(BaseModel):
         null=True,
     )
 
+    # Type specific fields, see ISSUE_META_FIELDS. They live on the row so
+    # lists of mixed issue types need no join to show them.
+    meta = models.JSONField(default=dict, blank=True)
+
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("key", "title", weight="A", config="simple")
+            + SearchVector("description", weight="B", config="simple")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = IssuesQuerySet.as_manager()
+
+    is_archived = False
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["project", "status", "-created_at"]),
+            models.Index(fields=["sprint", "status", "-created_at"]),
+            # "My work": an assignee's issues by due date, keyset on id.
+            models.Index(
+                fields=["assignee", "due_date", "id"],
+                include=["project", "status"],
+                name="issues_assignee_due_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="issues_search_vector_gin"),
+            GinIndex(
+                OpClass("title", name="gin_trgm_ops"), name="issues_title_trgm_gin"
+            ),
+            GinIndex(OpClass("key", name="gin_trgm_ops"), name="issues_key_trgm_gin"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=("project", "key"), name="unique_issue_key_per_project"
+            ),
+            models.CheckConstraint(
+                condition=models.Q(meta__story_point__isnull=True)
+                | models.Q(type=IssueTypeEnum.USERSTORY, meta__story_point__gte=0),
+                name="issues_meta_story_point",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(meta__task_point__isnull=True)
+                | models.Q(type=IssueTypeEnum.TASK, meta__task_point__gte=0),
+                name="issues_meta_task_point",
+            ),
+        ]
+
+    @property
+    def story_point(self):
+        return self.meta.get("story_point")
+
+    @property
+    def task_point(self):
+        return self.meta.get("task_point")
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            (self.key,) = IssueKeySequence.objects.allocate_keys(self.project_id)
+        return super().save(*args, **kwargs)
 
-class StoryMeta(BaseModel):
-    issue = models.OneToOneField(
+
+class IssueClosure(models.Model):
+    """
+    Closure table of the Issues.parent hierarchy.
+
+    One row per (ancestor, descendant) pair, including each issue paired
+    with itself at depth 0. Rows are written by database triggers when an
+    issue is inserted or its parent changes, so bulk writes stay in sync.
+    They are deleted with their issues by Django's cascade; there is no
+    database foreign key, which a partitioned Issues could not take.
+    """
+
+    ancestor = models.ForeignKey(
         Issues,
         on_delete=models.CASCADE,
-        limit_choices_to={"type": IssueTypeEnum.USERSTORY},
+        related_name="descendant_links",
+        db_constraint=False,
     )
-    story_point = models.IntegerField()
-
-
-class TaskMeta(BaseModel):
-    issue = models.OneToOneField(
+    descendant = models.ForeignKey(
         Issues,
         on_delete=models.CASCADE,
-        limit_choices_to={"type": IssueTypeEnum.TASK},
+        related_name="ancestor_links",
+        db_constraint=False,
     )
-    task_point = models.IntegerField()
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("ancestor", "descendant"), name="unique_issue_closure"
+            )
+        ]
 
+        indexes = [
+            models.Index(fields=["descendant", "depth"]),
+        ]
 
-class BugMeta(BaseModel):
-    issue = models.OneToOneField(
-        Issues,
+
+class ArchivedIssue(BaseModel):
+    """
+    An issue of a closed sprint, moved out of Issues by
+    ``issues.archive.archive_closed_sprints``.
+
+    The columns mirror Issues so rows move with a single INSERT ... SELECT.
+    Archived issues are read-only and have no IssueClosure rows, so
+    ``parent`` is kept as a plain id. They are not counted by IssueCounter.
+    """
+
+    key = models.CharField(max_length=108, unique=True)
+    title = models.CharField(max_length=208)
+    description = models.TextField(null=True, blank=True)
+    start_date = models.DateField()
+    due_date = models.DateField()
+    type = models.CharField(max_length=10, choices=IssueTypeEnum.choices)
+    priority = models.CharField(max_length=10, choices=PriorityEnum.choices, null=True)
+    state = models.CharField(max_length=10, choices=StateEnum.choices, null=True)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name="+")
+    sprint = models.ForeignKey(
+        Sprint, on_delete=models.SET_NULL, related_name="+", null=True
+    )
+    status = models.ForeignKey(
+        IssueStatus, on_delete=models.SET_NULL, related_name="+", null=True
+    )
+    parent = models.UUIDField(null=True, db_column="parent_id")
+    assignee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+    )
+    reporter = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
+    )
+    meta = models.JSONField(default=dict, blank=True)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("key", "title", weight="A", config="simple")
+            + SearchVector("description", weight="B", config="simple")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+    archived_at = models.DateTimeField(db_default=Now())
+
+    # Only search() and point_totals() apply: there is no closure table
+    # to walk.
+    objects = IssuesQuerySet.as_manager()
+
+    is_archived = True
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            models.Index(fields=["project", "status", "-created_at"]),
+            models.Index(fields=["sprint", "status", "-created_at"]),
+            models.Index(fields=["parent"], name="archivedissue_parent_idx"),
+            models.Index(
+                fields=["assignee", "due_date", "id"],
+                name="archivedissue_assignee_due_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="archivedissue_search_gin"),
+        ]
+
+    story_point = Issues.story_point
+    task_point = Issues.task_point
+
+
+class SprintSnapshot(models.Model):
+    """
+    Daily aggregate of a sprint's issues per status.
+
+    Burndown and velocity are read from these rows instead of replaying
+    the history of every issue in the sprint.
+    """
+
+    sprint = models.ForeignKey(
+        Sprint,
         on_delete=models.CASCADE,
-        limit_choices_to={"type": IssueTypeEnum.BUG},
+        related_name="+",
+    )
+    status = models.ForeignKey(
+        IssueStatus,
+        on_delete=models.SET_NULL,
+        related_name="+",
+        null=True,
     )
-    # SOON: Adding other point or other type for bug
+    day = models.DateField()
+    is_done = models.BooleanField(default=False)
+    issue_count = models.PositiveIntegerField(default=0)
+    points = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("sprint", "day", "status"), name="unique_sprint_snapshot"
+            )
+        ]
+
+
+class CounterDimensionEnum(models.TextChoices):
+    STATUS = "status", _("Status")
+    ASSIGNEE = "assignee", _("Assignee")
+    TYPE = "type", _("Type")
+    PRIORITY = "priority", _("Priority")
+
+
+# Counter dimension -> Issues column it counts.
+COUNTER_COLUMNS = {
+    CounterDimensionEnum.STATUS: "status_id",
+    CounterDimensionEnum.ASSIGNEE: "assignee_id",
+    CounterDimensionEnum.TYPE: "type",
+    CounterDimensionEnum.PRIORITY: "priority",
+}
+
+
+class IssueCounterManager(models.Manager):
+    def expected(self, project_id=None):
+        """
+        Count the issues with one GROUP BY per dimension, returning
+        ``{(project_id, dimension, value): count}`` for non-zero counts.
+        """
+        issues = Issues.objects.order_by()
+        if project_id is not None:
+            issues = issues.filter(project_id=project_id)
+
+        counts = {}
+        for dimension, column in COUNTER_COLUMNS.items():
+            rows = issues.values_list("project_id", column).annotate(
+                count=models.Count("pk")
+            )
+            for project, value, count in rows:
+                counts[(project, dimension.value, self.encode(value))] = count
+        return counts
+
+    def stored(self, project_id=None):
+        counters = self.all()
+        if project_id is not None:
+            counters = counters.filter(project_id=project_id)
+        return {
+            (project, dimension, value): count
+            for project, dimension, value, count in counters.values_list(
+                "project_id", "dimension", "value", "count"
+            )
+        }
+
+    def verify(self, project_id=None):
+        """Return ``{key: (stored, expected)}`` for every counter that is off."""
+        stored = self.stored(project_id)
+        expected = self.expected(project_id)
+        return {
+            key: (stored.get(key, 0), expected.get(key, 0))
+            for key in stored.keys() | expected.keys()
+            if stored.get(key, 0) != expected.get(key, 0)
+        }
+
+    def rebuild(self, project_id=None):
+        """
+        Recount from Issues. Writes to Issues are blocked meanwhile so the
+        triggers cannot race the recount.
+        """
+        with transaction.atomic(using=self.db):
+            with connections[self.db].cursor() as cursor:
+                cursor.execute(f"LOCK TABLE {Issues._meta.db_table} IN SHARE MODE")
+            counters = self.all()
+            if project_id is not None:
+                counters = counters.filter(project_id=project_id)
+            counters.delete()
+
+            expected = self.expected(project_id)
+            self.bulk_create(
+                IssueCounter(
+                    project_id=project, dimension=dimension, value=value, count=count
+                )
+                for (project, dimension, value), count in expected.items()
+            )
+        return len(expected)
+
+    def summary(self, project_id, include_archived=False):
+        """
+        Return ``{dimension: {value: count}}`` plus the project's total.
+        Archived issues are not counted by the triggers, so
+        ``include_archived`` groups them on the spot.
+        """
+        summary = {dimension.value: {} for dimension in CounterDimensionEnum}
+        rows = list(
+            self.filter(project_id=project_id).values_list(
+                "dimension", "value", "count"
+            )
+        )
+        if include_archived:
+            archived = ArchivedIssue.objects.filter(project_id=project_id).order_by()
+            for dimension, column in COUNTER_COLUMNS.items():
+                rows += [
+                    (dimension.value, self.encode(value), count)
+                    for value, count in archived.values_list(column).annotate(
+                        count=models.Count("pk")
+                    )
+                ]
+        for dimension, value, count in rows:
+            counts = summary[dimension]
+            counts[value or None] = counts.get(value or None, 0) + count
+        summary["total"] = sum(summary[CounterDimensionEnum.TYPE].values())
+        return summary
+
+    @staticmethod
+    def encode(value):
+        """Counters key missing values (no status, unassigned) by ''."""
+        return "" if value is None else str(value)
+
+
+class IssueCounter(models.Model):
+    """
+    Number of a project's issues per status, assignee, type and priority.
+
+    Kept in step with Issues by statement level database triggers, so
+    bulk writes are counted too, and read by project summaries instead
+    of grouping every issue. ``value`` is the counted column as text,
+    '' when it is empty.
+    """
+
+    # DO_NOTHING: deleting a project deletes its issues first, and the
+    # triggers drop counters once they reach zero.
+    project = models.ForeignKey(
+        Project,
+        on_delete=models.DO_NOTHING,
+        related_name="+",
+    )
+    dimension = models.CharField(max_length=16, choices=CounterDimensionEnum.choices)
+    value = models.CharField(max_length=64, blank=True)
+    count = models.IntegerField(default=0)
+
+    objects = IssueCounterManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("project", "dimension", "value"), name="unique_issue_counter"
+            )
+        ]
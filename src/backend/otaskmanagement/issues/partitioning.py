@@ -0,0 +1,409 @@
+"""
+Optional hash partitioned layout of Issues on ``project_id``.
+
+``rebuild_issues_table(partitions)`` converts Issues into ``partitions``
+hash partitions, or back into a plain table with ``partitions=0``, while
+the table stays in use:
+
+1. An empty shadow table is created in the target layout with the
+   columns, checks, indexes and outgoing foreign keys of Issues.
+2. A trigger on Issues mirrors every write into the shadow table, and
+   the existing rows are copied in batches, one transaction per batch.
+3. A short transaction locks Issues, moves its triggers to the shadow
+   table, drops Issues and renames the shadow table into its place.
+   Waiting for the lock is bounded by ``lock_timeout`` seconds and each
+   statement under it by ``swap_timeout`` seconds. When either runs out
+   the swap rolls back, the shadow table is dropped and Issues is left
+   as it was.
+
+Primary keys and unique constraints of a partitioned table must include
+the partition key, so the partitioned layout has the primary key
+``(id, project_id)`` and ``parent`` references ``(id, project_id)``.
+That foreign key is checked during the swap, under the lock, after the
+same check ran on the shadow table without it. The other
+constraints are declared by the models in a shape both layouts hold:
+issue keys are unique per project, and no other table has a database
+foreign key to Issues. Queries filtering on ``project_id`` only read the
+project's partition.
+
+Django's migrations only know the plain layout's primary key: convert
+back before a migration that alters ``Issues.id`` or adds a foreign key
+to Issues.
+"""
+
+import logging
+import re
+
+from django.db import IntegrityError, connection, transaction
+
+from issues.models import Issues
+
+ISSUES = Issues._meta.db_table
+SHADOW = f"{ISSUES}_shadow"
+SYNC_FUNCTION = f"{ISSUES}_shadow_sync"
+PARTITION_KEY = "project_id"
+INDEX_DEF = re.compile(r"^CREATE INDEX \S+ ON (?:ONLY )?\S+ (USING .+)$")
+TRIGGER_TABLE = re.compile(r" ON \S+ ")
+
+logger = logging.getLogger(__name__)
+
+
+def issues_partitions():
+    """Number of hash partitions of Issues, 0 for a plain table."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relkind,
+                   (SELECT count(*) FROM pg_inherits WHERE inhparent = c.oid)
+            FROM pg_class c WHERE c.oid = %s::regclass
+            """,
+            [ISSUES],
+        )
+        relkind, partitions = cursor.fetchone()
+    return partitions if relkind == "p" else 0
+
+
+def rebuild_issues_table(
+    partitions, batch_size=10000, lock_timeout=5, swap_timeout=60, log=logger.info
+):
+    """Rebuild Issues with ``partitions`` hash partitions, 0 for none."""
+    if partitions < 0:
+        raise ValueError("partitions must not be negative")
+    if issues_partitions() == partitions:
+        log(f"{ISSUES} already has this layout.")
+        return
+
+    rebuild = IssuesTableRebuild(partitions)
+    referencing = rebuild.referencing_tables()
+    if referencing:
+        raise ValueError(
+            f"{', '.join(referencing)} must not have a foreign key to {ISSUES}."
+        )
+    rebuild.create_shadow()
+    log(f"Created {SHADOW}, mirroring writes to {ISSUES}.")
+    try:
+        copied = rebuild.copy_rows(batch_size, log)
+        log(f"Copied {copied} rows.")
+        rebuild.check_parents()
+        rebuild.swap(lock_timeout, swap_timeout)
+    except Exception:
+        rebuild.drop_shadow()
+        log(f"Dropped {SHADOW}; {ISSUES} is unchanged.")
+        raise
+    log(f"Swapped {SHADOW} in as {ISSUES}.")
+    rebuild.validate()
+
+
+class IssuesTableRebuild:
+    """The three steps of ``rebuild_issues_table``; see the module docstring."""
+
+    def __init__(self, partitions):
+        self.partitions = partitions
+        self.quote = connection.ops.quote_name
+        with connection.cursor() as cursor:
+            self.columns = self.read_columns(cursor)
+            self.keys = self.read_keys(cursor)
+            self.indexes = self.read_indexes(cursor)
+            self.foreign_keys = self.read_foreign_keys(cursor)
+            self.triggers = self.read_triggers(cursor)
+        self.renames = {}
+
+    # -------------------------------------------------------------- #
+    # Catalog
+    # -------------------------------------------------------------- #
+    @staticmethod
+    def read_columns(cursor):
+        """Stored columns, without the generated ones."""
+        cursor.execute(
+            """
+            SELECT attname FROM pg_attribute
+            WHERE attrelid = %s::regclass AND attnum > 0
+            AND NOT attisdropped AND attgenerated = ''
+            ORDER BY attnum
+            """,
+            [ISSUES],
+        )
+        return [name for (name,) in cursor.fetchall()]
+
+    @staticmethod
+    def read_keys(cursor):
+        """``(name, type, columns)`` of the primary key and unique constraints."""
+        cursor.execute(
+            """
+            SELECT c.conname, c.contype, array_agg(a.attname ORDER BY k.n)
+            FROM pg_constraint c
+            CROSS JOIN unnest(c.conkey) WITH ORDINALITY k(attnum, n)
+            JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+            WHERE c.conrelid = %s::regclass AND c.contype IN ('p', 'u')
+            GROUP BY c.conname, c.contype
+            """,
+            [ISSUES],
+        )
+        return cursor.fetchall()
+
+    @staticmethod
+    def read_indexes(cursor):
+        """``(name, definition)`` of the indexes not backing a constraint."""
+        cursor.execute(
+            """
+            SELECT i.relname, pg_get_indexdef(x.indexrelid)
+            FROM pg_index x JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = %s::regclass AND NOT EXISTS (
+                SELECT 1 FROM pg_constraint c
+                WHERE c.conrelid = x.indrelid AND c.conindid = x.indexrelid
+                AND c.contype IN ('p', 'u')
+            )
+            """,
+            [ISSUES],
+        )
+        return cursor.fetchall()
+
+    @staticmethod
+    def read_foreign_keys(cursor):
+        """``(table, name, definition)`` of the foreign keys from and to Issues."""
+        cursor.execute(
+            """
+            SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE contype = 'f' AND conparentid = 0
+            AND (conrelid = %s::regclass OR confrelid = %s::regclass)
+            """,
+            [ISSUES, ISSUES],
+        )
+        return cursor.fetchall()
+
+    @staticmethod
+    def read_triggers(cursor):
+        cursor.execute(
+            """
+            SELECT tgname, pg_get_triggerdef(oid) FROM pg_trigger
+            WHERE tgrelid = %s::regclass AND NOT tgisinternal
+            """,
+            [ISSUES],
+        )
+        return cursor.fetchall()
+
+    def key_columns(self, contype, columns):
+        """
+        Columns of a key in the target layout: the primary key is ``id``,
+        with the partition key when partitioned, and unique constraints
+        get the partition key added when they lack it.
+        """
+        if contype == "p":
+            columns = ["id"]
+        if self.partitions and PARTITION_KEY not in columns:
+            columns = [*columns, PARTITION_KEY]
+        return ", ".join(self.quote(column) for column in columns)
+
+    def is_self_reference(self, table, definition):
+        return table == ISSUES and f"REFERENCES {ISSUES}(" in definition
+
+    def referencing_tables(self):
+        """Other tables with a foreign key to Issues, which the swap would drop."""
+        return sorted(
+            table
+            for table, _, definition in self.foreign_keys
+            if table != ISSUES and f"REFERENCES {ISSUES}(" in definition
+        )
+
+    def parent_keys(self):
+        """``(name, column)`` of the foreign keys from Issues to itself."""
+        for table, name, definition in self.foreign_keys:
+            if self.is_self_reference(table, definition):
+                yield name, re.search(r"FOREIGN KEY \((\w+)", definition).group(1)
+
+    # -------------------------------------------------------------- #
+    # Steps
+    # -------------------------------------------------------------- #
+    def create_shadow(self):
+        partition_by = f"PARTITION BY HASH ({PARTITION_KEY})" if self.partitions else ""
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Leftovers of an interrupted rebuild.
+            self.drop_shadow()
+            cursor.execute(
+                f"""
+                CREATE TABLE {SHADOW} (
+                    LIKE {ISSUES}
+                    INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING GENERATED
+                ) {partition_by}
+                """
+            )
+            for remainder in range(self.partitions):
+                cursor.execute(
+                    f"""
+                    CREATE TABLE {ISSUES}_h{self.partitions}_{remainder}
+                    PARTITION OF {SHADOW} FOR VALUES
+                    WITH (MODULUS {self.partitions}, REMAINDER {remainder})
+                    """
+                )
+
+            for name, contype, columns in self.keys:
+                kind = "PRIMARY KEY" if contype == "p" else "UNIQUE"
+                temporary = self.temporary_name(name)
+                cursor.execute(
+                    f"ALTER TABLE {SHADOW} ADD CONSTRAINT {temporary} "
+                    f"{kind} ({self.key_columns(contype, columns)})"
+                )
+            for name, definition in self.indexes:
+                using = INDEX_DEF.match(definition).group(1)
+                temporary = self.temporary_name(name)
+                cursor.execute(f"CREATE INDEX {temporary} ON {SHADOW} {using}")
+            for table, name, definition in self.foreign_keys:
+                if table == ISSUES and not self.is_self_reference(table, definition):
+                    cursor.execute(
+                        f"ALTER TABLE {SHADOW} ADD CONSTRAINT {name} {definition}"
+                    )
+            self.create_sync_trigger(cursor)
+
+    def drop_shadow(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"DROP FUNCTION IF EXISTS {SYNC_FUNCTION}() CASCADE")
+            cursor.execute(f"DROP TABLE IF EXISTS {SHADOW}")
+
+    def temporary_name(self, name):
+        temporary = f"{name[:57]}_swap"
+        self.renames[temporary] = name
+        return temporary
+
+    def create_sync_trigger(self, cursor):
+        columns = ", ".join(self.quote(column) for column in self.columns)
+        values = ", ".join(f"NEW.{self.quote(column)}" for column in self.columns)
+        updates = ", ".join(
+            f"{self.quote(column)} = EXCLUDED.{self.quote(column)}"
+            for column in self.columns
+            if column != "id"
+        )
+        conflict = self.key_columns("p", ["id"])
+        cursor.execute(
+            f"""
+            CREATE FUNCTION {SYNC_FUNCTION}() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND
+                    (OLD.id, OLD.{PARTITION_KEY}) IS DISTINCT FROM
+                    (NEW.id, NEW.{PARTITION_KEY})) THEN
+                    DELETE FROM {SHADOW}
+                    WHERE id = OLD.id AND {PARTITION_KEY} = OLD.{PARTITION_KEY};
+                END IF;
+                IF TG_OP <> 'DELETE' THEN
+                    INSERT INTO {SHADOW} ({columns}) VALUES ({values})
+                    ON CONFLICT ({conflict}) DO UPDATE SET {updates};
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+            """
+        )
+        cursor.execute(
+            f"""
+            CREATE TRIGGER {SYNC_FUNCTION}
+            AFTER INSERT OR UPDATE OR DELETE ON {ISSUES}
+            FOR EACH ROW EXECUTE FUNCTION {SYNC_FUNCTION}()
+            """
+        )
+
+    def copy_rows(self, batch_size, log=logger.info):
+        """
+        Copy the rows in id order. A batch holds its rows with FOR SHARE
+        until it commits, so the trigger's copy of a concurrent write is
+        never overwritten by an older one.
+        """
+        columns = ", ".join(self.quote(column) for column in self.columns)
+        last_id = None
+        copied = 0
+        while True:
+            after = "WHERE id > %(last)s" if last_id else ""
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(
+                    f"""
+                    WITH batch AS (
+                        SELECT {columns} FROM {ISSUES} {after}
+                        ORDER BY id LIMIT %(limit)s
+                        FOR SHARE
+                    ), copied AS (
+                        INSERT INTO {SHADOW} ({columns})
+                        SELECT {columns} FROM batch
+                        ON CONFLICT DO NOTHING
+                    )
+                    SELECT count(*), (SELECT id FROM batch ORDER BY id DESC LIMIT 1)
+                    FROM batch
+                    """,
+                    {"last": last_id, "limit": batch_size},
+                )
+                count, last_id = cursor.fetchone()
+            if not count:
+                return copied
+            copied += count
+            log(f"  {copied} rows copied")
+
+    def check_parents(self):
+        """
+        Fail before the swap if a parent is missing from the shadow table
+        or, when partitioned, belongs to another project, as the foreign
+        key added under the lock would.
+        """
+        match = f"p.{PARTITION_KEY} = i.{PARTITION_KEY}" if self.partitions else "TRUE"
+        with connection.cursor() as cursor:
+            for _, column in self.parent_keys():
+                cursor.execute(
+                    f"""
+                    SELECT count(*) FROM {SHADOW} i
+                    WHERE i.{column} IS NOT NULL AND NOT EXISTS (
+                        SELECT 1 FROM {SHADOW} p
+                        WHERE p.id = i.{column} AND {match}
+                    )
+                    """
+                )
+                (orphans,) = cursor.fetchone()
+                if orphans:
+                    raise IntegrityError(
+                        f"{orphans} issues have a {column} the new layout "
+                        "cannot reference."
+                    )
+
+    def swap(self, lock_timeout, swap_timeout):
+        self.unvalidated = []
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = '{float(lock_timeout)}s'")
+            cursor.execute(f"LOCK TABLE {ISSUES} IN ACCESS EXCLUSIVE MODE")
+            # Bounds each statement under the lock, the longest being the
+            # check of a partitioned table's parent foreign key.
+            cursor.execute(f"SET LOCAL statement_timeout = '{float(swap_timeout)}s'")
+            cursor.execute(f"DROP TRIGGER {SYNC_FUNCTION} ON {ISSUES}")
+            cursor.execute(f"DROP FUNCTION {SYNC_FUNCTION}()")
+
+            for name, definition in self.triggers:
+                definition = TRIGGER_TABLE.sub(f" ON {SHADOW} ", definition, count=1)
+                cursor.execute(definition)
+
+            cursor.execute(f"DROP TABLE {ISSUES}")
+            cursor.execute(f"ALTER TABLE {SHADOW} RENAME TO {ISSUES}")
+            for temporary, name in self.renames.items():
+                cursor.execute(f"ALTER INDEX {temporary} RENAME TO {name}")
+
+            for name, column in self.parent_keys():
+                if self.partitions:
+                    # A partitioned table cannot take a NOT VALID foreign key.
+                    cursor.execute(
+                        f"""
+                        ALTER TABLE {ISSUES} ADD CONSTRAINT {name}
+                        FOREIGN KEY ({column}, {PARTITION_KEY})
+                        REFERENCES {ISSUES} (id, {PARTITION_KEY})
+                        DEFERRABLE INITIALLY DEFERRED
+                        """
+                    )
+                    continue
+                cursor.execute(
+                    f"""
+                    ALTER TABLE {ISSUES} ADD CONSTRAINT {name}
+                    FOREIGN KEY ({column}) REFERENCES {ISSUES} (id)
+                    DEFERRABLE INITIALLY DEFERRED NOT VALID
+                    """
+                )
+                self.unvalidated.append(name)
+
+    def validate(self):
+        """Check the NOT VALID foreign keys now that writes are unblocked."""
+        with connection.cursor() as cursor:
+            for name in self.unvalidated:
+                cursor.execute(f"ALTER TABLE {ISSUES} VALIDATE CONSTRAINT {name}")
+            cursor.execute(f"ANALYZE {ISSUES}")
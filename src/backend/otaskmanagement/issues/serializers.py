@@ -1,6 +1,15 @@
 from rest_framework import serializers
 
-from .models import Sprint
+from users.models import CustomUser
+
+from .models import (
+    IssueStatus,
+    IssueTypeEnum,
+    Issues,
+    PriorityEnum,
+    Sprint,
+    StateEnum,
+)
 
 
 class SprintSerializer(serializers.ModelSerializer):
@@ -29,3 +38,92 @@ class SprintSerializer(serializers.ModelSerializer):
             )
 
         return attrs
+
+
+class IssueAssigneeSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CustomUser
+        fields = ["id", "email", "first_name", "last_name"]
+
+
+class IssueCardSerializer(serializers.ModelSerializer):
+    """Compact issue representation used by the board columns."""
+
+    assignee = IssueAssigneeSerializer(read_only=True)
+    story_point = serializers.IntegerField(read_only=True)
+    task_point = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Issues
+        fields = [
+            "id",
+            "key",
+            "title",
+            "type",
+            "priority",
+            "state",
+            "start_date",
+            "due_date",
+            "sprint",
+            "parent",
+            "assignee",
+            "story_point",
+            "task_point",
+            "is_archived",
+        ]
+
+
+class MyIssueSerializer(IssueCardSerializer):
+    """Issue card with the project and status it belongs to."""
+
+    class Meta(IssueCardSerializer.Meta):
+        fields = IssueCardSerializer.Meta.fields + ["project", "status"]
+
+
+class BoardColumnSerializer(serializers.ModelSerializer):
+    issues = IssueCardSerializer(many=True, read_only=True)
+    next_cursor = serializers.CharField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = IssueStatus
+        fields = ["id", "name", "is_done", "order_index", "issues", "next_cursor"]
+
+
+class IssueTreeSerializer(serializers.Serializer):
+    issue = IssueCardSerializer(read_only=True)
+    ancestors = IssueCardSerializer(many=True, read_only=True)
+    sub_issues = IssueCardSerializer(many=True, read_only=True)
+    points = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+
+
+class IssueImportSerializer(serializers.Serializer):
+    """
+    Validates one row of an issue import.
+
+    Related rows are given by natural key: status and sprint by name,
+    parent by issue key and users by email.
+    """
+
+    key = serializers.CharField(max_length=108, required=False)
+    title = serializers.CharField(max_length=208)
+    description = serializers.CharField(required=False, allow_null=True)
+    type = serializers.ChoiceField(
+        choices=IssueTypeEnum.choices, default=IssueTypeEnum.TASK
+    )
+    priority = serializers.ChoiceField(
+        choices=PriorityEnum.choices, required=False, allow_null=True
+    )
+    state = serializers.ChoiceField(
+        choices=StateEnum.choices, required=False, allow_null=True
+    )
+    start_date = serializers.DateField()
+    due_date = serializers.DateField()
+    status = serializers.CharField(required=False, allow_null=True)
+    sprint = serializers.CharField(required=False, allow_null=True)
+    parent = serializers.CharField(required=False, allow_null=True)
+    assignee = serializers.EmailField(required=False, allow_null=True)
+    reporter = serializers.EmailField(required=False, allow_null=True)
+    story_point = serializers.IntegerField(
+        required=False, allow_null=True, min_value=0
+    )
+    task_point = serializers.IntegerField(required=False, allow_null=True, min_value=0)
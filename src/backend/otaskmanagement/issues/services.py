@@ -0,0 +1,199 @@
+"""
+Sprint burndown and velocity built on SprintSnapshot aggregates, and the
+cached cross-project "my work" query.
+"""
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from issues.models import ArchivedIssue, Issues, Sprint, SprintSnapshot, meta_value
+from users.permissions import resolver
+
+
+def issue_points():
+    """Story or task points of an issue; bugs and issues without points count 0."""
+    return Coalesce(meta_value("story_point"), meta_value("task_point"), Value(0))
+
+
+def refresh_sprint_snapshots(sprint_ids, day=None):
+    """
+    Recompute the ``day`` snapshot rows of the given sprints.
+
+    One GROUP BY over the sprints' issues, and one over their archived
+    issues, replaces whatever rows the day already had, so repeated
+    refreshes are idempotent. The sprint rows stay locked from the
+    aggregate to the write, so concurrent refreshes of a sprint run one
+    after the other instead of racing on ``unique_sprint_snapshot``.
+    """
+    day = day or timezone.localdate()
+    sprint_ids = list(sprint_ids)
+    if not sprint_ids:
+        return 0
+
+    with transaction.atomic():
+        # Locked in a fixed order so overlapping refreshes cannot deadlock.
+        sprint_ids = list(
+            Sprint.objects.select_for_update()
+            .filter(pk__in=sprint_ids)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        snapshots = sprint_snapshots(sprint_ids, day)
+        SprintSnapshot.objects.filter(sprint_id__in=sprint_ids, day=day).delete()
+        SprintSnapshot.objects.bulk_create(snapshots)
+    return len(snapshots)
+
+
+def sprint_snapshots(sprint_ids, day):
+    """Unsaved ``day`` snapshot rows of the given sprints."""
+    totals = {}
+    for model in (Issues, ArchivedIssue):
+        rows = (
+            model.objects.filter(sprint_id__in=sprint_ids)
+            .order_by()
+            .values_list("sprint_id", "status_id", "status__is_done")
+            .annotate(issue_count=Count("id"), points=Sum(issue_points(), default=0))
+        )
+        for sprint_id, status_id, is_done, issue_count, points in rows:
+            total = totals.setdefault((sprint_id, status_id, bool(is_done)), [0, 0])
+            total[0] += issue_count
+            total[1] += points
+
+    return [
+        SprintSnapshot(
+            sprint_id=sprint_id,
+            status_id=status_id,
+            day=day,
+            is_done=is_done,
+            issue_count=issue_count,
+            points=points,
+        )
+        for (sprint_id, status_id, is_done), (issue_count, points) in totals.items()
+    ]
+
+
+def snapshot_open_sprints(day=None):
+    """Snapshot every sprint that has started and is not closed yet."""
+    day = day or timezone.localdate()
+    sprint_ids = Sprint.objects.filter(
+        is_closed=False, start_date__lte=day
+    ).values_list("id", flat=True)
+    return refresh_sprint_snapshots(sprint_ids, day)
+
+
+def sprint_burndown(sprint_id):
+    """Remaining and completed points per day, with the per-status rows."""
+    days = {}
+    snapshots = SprintSnapshot.objects.filter(sprint_id=sprint_id).order_by(
+        "day", "status_id"
+    )
+    for snapshot in snapshots:
+        entry = days.setdefault(
+            snapshot.day,
+            {"day": snapshot.day, "remaining": 0, "completed": 0, "statuses": []},
+        )
+        entry["completed" if snapshot.is_done else "remaining"] += snapshot.points
+        entry["statuses"].append(
+            {
+                "status": snapshot.status_id,
+                "is_done": snapshot.is_done,
+                "issue_count": snapshot.issue_count,
+                "points": snapshot.points,
+            }
+        )
+    return list(days.values())
+
+
+def project_velocity(project_id, limit=10):
+    """Committed and completed points of the latest sprints, newest first."""
+    last_day = (
+        SprintSnapshot.objects.filter(sprint_id=OuterRef("sprint_id"))
+        .order_by("-day")
+        .values("day")[:1]
+    )
+    return list(
+        SprintSnapshot.objects.filter(
+            sprint__project_id=project_id, day=Subquery(last_day)
+        )
+        .values(
+            "sprint_id",
+            name=F("sprint__name"),
+            start_date=F("sprint__start_date"),
+            end_date=F("sprint__end_date"),
+        )
+        .annotate(
+            committed=Sum("points"),
+            completed=Sum("points", filter=Q(is_done=True), default=0),
+        )
+        .order_by("-start_date")[:limit]
+    )
+
+
+MY_WORK_VERSION_CACHE_KEY = "issues:my-work-version:{user_id}"
+MY_WORK_CACHE_KEY = "issues:my-work:{user_id}:{version}:{params}"
+
+
+def my_work_projects(user, permission="view_issues"):
+    """Ids of the user's projects whose role grants ``permission``."""
+    role_permissions = resolver.role_permissions()
+    return [
+        project_id
+        for project_id, role in resolver.membership_roles(user.pk).items()
+        if user.is_superuser or permission in role_permissions.get(role, ())
+    ]
+
+
+def my_work_issues(user, project_ids, done=None, model=Issues):
+    """
+    Issues assigned to the user in the given projects, by due date.
+
+    Served by the (assignee, due_date, id) index; ``done`` filters on the
+    status' ``is_done``, issues without a status counting as not done.
+    Pass ``model=ArchivedIssue`` for the archived ones.
+    """
+    issues = model.objects.filter(
+        assignee_id=user.pk, project_id__in=project_ids
+    ).order_by("due_date", "id")
+    if done is True:
+        issues = issues.filter(status__is_done=True)
+    elif done is False:
+        issues = issues.filter(Q(status__is_done=False) | Q(status__isnull=True))
+    return issues
+
+
+def my_work_cache_key(user_id, params):
+    """
+    Cache key of one "my work" page. Keys embed the user's current
+    version, so invalidating is a matter of replacing the version.
+    """
+    version_key = MY_WORK_VERSION_CACHE_KEY.format(user_id=user_id)
+    version = cache.get(version_key)
+    if version is None:
+        version = uuid.uuid4().hex
+        cache.add(version_key, version, None)
+        version = cache.get(version_key, version)
+
+    digest = hashlib.md5(repr(sorted(params.items())).encode()).hexdigest()
+    return MY_WORK_CACHE_KEY.format(user_id=user_id, version=version, params=digest)
+
+
+def my_work_timeout():
+    return getattr(settings, "MY_WORK_CACHE_TIMEOUT", 30)
+
+
+def invalidate_my_work(user_ids):
+    """Drop the cached "my work" pages of the given users."""
+    keys = {
+        MY_WORK_VERSION_CACHE_KEY.format(user_id=user_id): uuid.uuid4().hex
+        for user_id in user_ids
+        if user_id
+    }
+    if keys:
+        cache.set_many(keys, None)
@@ -0,0 +1,62 @@
+from copy import copy
+
+from django.db import transaction
+
+from otaskmanagement.events import queue_change
+
+# Attnames whose change can move a sprint's snapshot: the status and sprint
+# of an issue, and its type and meta, which hold the story/task points.
+TRACKED_FIELDS = ("status_id", "sprint_id", "type", "meta")
+
+
+def queue_sprint_snapshot_refresh(sprint_ids):
+    sprint_ids = sorted(str(sprint_id) for sprint_id in sprint_ids if sprint_id)
+    if not sprint_ids:
+        return
+
+    from issues.tasks import refresh_sprint_snapshot
+
+    transaction.on_commit(lambda: refresh_sprint_snapshot.delay(sprint_ids))
+
+
+def queue_my_work_invalidation(user_ids):
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return
+
+    from issues.services import invalidate_my_work
+
+    transaction.on_commit(lambda: invalidate_my_work(user_ids))
+
+
+def issue_saved(sender, instance, created=False, **kwargs):
+    queue_change(instance.project_id, "issues", instance.pk)
+    loaded = getattr(instance, "_loaded_values", None)
+    # Any write can change what an assignee's "my work" list shows.
+    queue_my_work_invalidation(
+        {instance.assignee_id, loaded.get("assignee_id") if loaded else None}
+    )
+
+    changed = created or loaded is None or any(
+        loaded.get(field) != getattr(instance, field) for field in TRACKED_FIELDS
+    )
+    if not changed:
+        return
+
+    previous_sprint = loaded.get("sprint_id") if loaded else None
+    queue_sprint_snapshot_refresh({instance.sprint_id, previous_sprint})
+
+    instance._loaded_values = {
+        **(loaded or {}),
+        **{field: copy(getattr(instance, field)) for field in TRACKED_FIELDS},
+    }
+
+
+def issue_deleted(sender, instance, **kwargs):
+    queue_change(instance.project_id, "issues", instance.pk)
+    queue_sprint_snapshot_refresh({instance.sprint_id})
+    queue_my_work_invalidation({instance.assignee_id})
+
+
+def sprint_changed(sender, instance, **kwargs):
+    queue_change(instance.project_id, "sprints", instance.pk)
@@ -0,0 +1,25 @@
+from celery import shared_task
+
+
+@shared_task
+def snapshot_sprints():
+    """Daily burndown snapshot of every open sprint."""
+    from issues.services import snapshot_open_sprints
+
+    return snapshot_open_sprints()
+
+
+@shared_task
+def refresh_sprint_snapshot(sprint_ids):
+    """Refresh today's snapshot rows after issues of the sprints changed."""
+    from issues.services import refresh_sprint_snapshots
+
+    return refresh_sprint_snapshots(sprint_ids)
+
+
+@shared_task
+def archive_sprints():
+    """Move the issues of old closed sprints out of Issues."""
+    from issues.archive import archive_closed_sprints
+
+    return archive_closed_sprints()
@@ -1,3 +1,406 @@
+import datetime
+import io
+import json
+from unittest import mock
+
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
 
-# Create your tests here.
+from rest_framework.exceptions import ValidationError
+
+from issues.archive import archive_closed_sprints, archived_tree
+from issues.models import (
+    ArchivedIssue,
+    CounterDimensionEnum,
+    IssueClosure,
+    IssueCounter,
+    Issues,
+    IssueStatus,
+    IssueTypeEnum,
+    PriorityEnum,
+    Sprint,
+)
+from issues.partitioning import issues_partitions, rebuild_issues_table
+from issues.transfer import IssueImporter, read_rows
+from project.models import Project
+from users.models import CustomUser
+
+TODAY = datetime.date(2026, 1, 5)
+
+
+class IssueFactoryMixin:
+    @classmethod
+    def create_project(cls, key):
+        return Project.objects.create(name=f"{key} project", key=key)
+
+    def create_issue(self, title, project=None, **fields):
+        return Issues.objects.create(
+            project=project or self.project,
+            title=title,
+            start_date=TODAY,
+            due_date=TODAY,
+            **fields,
+        )
+
+
+class IssueClosureTests(IssueFactoryMixin, TestCase):
+    """The closure triggers and the hierarchy lookups built on them."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = cls.create_project("CLOSURE")
+
+    def setUp(self):
+        self.root = self.create_issue("root")
+        self.child = self.create_issue("child", parent=self.root)
+        self.grandchild = self.create_issue("grandchild", parent=self.child)
+
+    def links(self, issue):
+        return set(
+            IssueClosure.objects.filter(descendant=issue).values_list(
+                "ancestor__title", "depth"
+            )
+        )
+
+    def test_insert_links_every_ancestor(self):
+        self.assertEqual(
+            self.links(self.grandchild),
+            {("grandchild", 0), ("child", 1), ("root", 2)},
+        )
+        self.assertEqual(self.links(self.root), {("root", 0)})
+
+    def test_subtree_and_ancestors(self):
+        subtree = Issues.objects.subtree(self.root, include_self=False)
+        self.assertEqual(
+            set(subtree.values_list("title", flat=True)), {"child", "grandchild"}
+        )
+        ancestors = Issues.objects.ancestors(self.grandchild)
+        self.assertEqual(
+            list(ancestors.values_list("title", flat=True)), ["root", "child"]
+        )
+
+    def test_reparent_moves_the_subtree(self):
+        other = self.create_issue("other")
+        self.child.parent = other
+        self.child.save()
+
+        self.assertEqual(
+            self.links(self.grandchild),
+            {("grandchild", 0), ("child", 1), ("other", 2)},
+        )
+        self.assertFalse(Issues.objects.subtree(self.root, include_self=False).exists())
+
+    def test_reparent_to_root(self):
+        self.child.parent = None
+        self.child.save()
+
+        self.assertEqual(self.links(self.child), {("child", 0)})
+        self.assertEqual(
+            self.links(self.grandchild), {("grandchild", 0), ("child", 1)}
+        )
+
+    def test_reparent_under_own_sub_issue_is_rejected(self):
+        self.root.parent = self.grandchild
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            self.root.save()
+
+    def test_delete_drops_the_subtree_and_its_links(self):
+        ids = [self.child.pk, self.grandchild.pk]
+        self.child.delete()
+
+        self.assertFalse(Issues.objects.filter(pk__in=ids).exists())
+        self.assertFalse(
+            IssueClosure.objects.filter(descendant_id__in=ids).exists()
+            or IssueClosure.objects.filter(ancestor_id__in=ids).exists()
+        )
+        self.assertEqual(self.links(self.root), {("root", 0)})
+
+    def test_point_rollup(self):
+        self.root.type = IssueTypeEnum.USERSTORY
+        self.root.meta = {"story_point": 5}
+        self.root.save()
+        self.create_issue(
+            "task", parent=self.child, type=IssueTypeEnum.TASK, meta={"task_point": 3}
+        )
+        self.create_issue("bug", parent=self.root, type=IssueTypeEnum.BUG)
+
+        self.assertEqual(
+            Issues.objects.point_rollup(self.root),
+            {"issue_count": 5, "story_point": 5, "task_point": 3},
+        )
+        self.assertEqual(
+            Issues.objects.point_rollup(self.child),
+            {"issue_count": 3, "story_point": 0, "task_point": 3},
+        )
+
+
+class IssueCounterTests(IssueFactoryMixin, TestCase):
+    """The counter triggers keep IssueCounter equal to a recount."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = cls.create_project("COUNTER")
+        cls.todo, cls.doing, cls.done = (
+            IssueStatus.objects.create(
+                project=cls.project, name=f"COUNTER {name}", order_index=index
+            )
+            for index, name in enumerate(("todo", "doing", "done"))
+        )
+
+    def assertCountersMatch(self):
+        self.assertEqual(IssueCounter.objects.verify(self.project.pk), {})
+
+    def status_counts(self):
+        return IssueCounter.objects.summary(self.project.pk)[
+            CounterDimensionEnum.STATUS
+        ]
+
+    def test_insert_update_delete(self):
+        issues = [
+            self.create_issue(f"issue {n}", status=self.todo, type=IssueTypeEnum.TASK)
+            for n in range(3)
+        ]
+        self.assertCountersMatch()
+
+        issues[0].status = self.doing
+        issues[0].type = IssueTypeEnum.BUG
+        issues[0].priority = PriorityEnum.HIGH
+        issues[0].save()
+        self.assertCountersMatch()
+
+        issues[1].delete()
+        self.assertCountersMatch()
+        self.assertEqual(
+            self.status_counts(),
+            {str(self.todo.pk): 1, str(self.doing.pk): 1},
+        )
+
+    def test_bulk_update_across_statuses(self):
+        for n in range(4):
+            self.create_issue(f"todo {n}", status=self.todo)
+        for n in range(2):
+            self.create_issue(f"doing {n}", status=self.doing)
+
+        Issues.objects.filter(project=self.project, status=self.todo).update(
+            status=self.done
+        )
+        Issues.objects.filter(project=self.project, status=self.doing).update(
+            status=self.todo
+        )
+        self.assertCountersMatch()
+        self.assertEqual(
+            self.status_counts(),
+            {str(self.todo.pk): 2, str(self.done.pk): 4},
+        )
+
+        Issues.objects.filter(project=self.project).delete()
+        self.assertCountersMatch()
+        self.assertEqual(self.status_counts(), {})
+
+
+class ArchivedTreeTests(IssueFactoryMixin, TestCase):
+    """Issue trees across Issues and ArchivedIssue."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = cls.create_project("ARCHIVE")
+        cls.sprint = Sprint.objects.create(
+            project=cls.project,
+            name="ARCHIVE sprint",
+            start_date=TODAY,
+            end_date=TODAY,
+            is_closed=True,
+        )
+
+    def setUp(self):
+        self.root = self.create_issue(
+            "root", type=IssueTypeEnum.USERSTORY, meta={"story_point": 5}
+        )
+        self.child = self.create_issue("child", parent=self.root, sprint=self.sprint)
+        self.leaf = self.create_issue(
+            "leaf",
+            parent=self.child,
+            sprint=self.sprint,
+            type=IssueTypeEnum.TASK,
+            meta={"task_point": 2},
+        )
+        self.create_issue("open", parent=self.root)
+        archive_closed_sprints(days=-1, project_id=self.project.pk)
+
+    def titles(self, issues):
+        return [issue.title for issue in issues]
+
+    def test_active_issue_includes_archived_sub_issues(self):
+        tree = archived_tree(self.root)
+        self.assertEqual(self.titles(tree["sub_issues"]), ["open", "child", "leaf"])
+        self.assertEqual(
+            tree["points"], {"issue_count": 4, "story_point": 5, "task_point": 2}
+        )
+
+    def test_archived_issue_ancestors(self):
+        leaf = ArchivedIssue.objects.get(pk=self.leaf.pk)
+        tree = archived_tree(leaf)
+        self.assertEqual(self.titles(tree["ancestors"]), ["root", "child"])
+        self.assertEqual(tree["sub_issues"], [])
+        self.assertEqual(
+            tree["points"], {"issue_count": 1, "story_point": 0, "task_point": 2}
+        )
+
+
+class PartitioningTests(IssueFactoryMixin, TestCase):
+    """Converting Issues to hash partitions and back keeps its data."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = cls.create_project("PARTITION")
+        cls.status = IssueStatus.objects.create(
+            project=cls.project, name="PARTITION todo", order_index=0
+        )
+
+    def setUp(self):
+        self.root = self.create_issue("root", status=self.status)
+        self.child = self.create_issue("child", parent=self.root)
+
+    def snapshot(self):
+        return {
+            "issues": Issues.objects.count(),
+            "closure": IssueClosure.objects.count(),
+            "subtree": set(
+                Issues.objects.subtree(self.root).values_list("title", flat=True)
+            ),
+        }
+
+    def assertConverted(self, partitions, expected):
+        # Every step commits on its own outside of tests. Inside the test's
+        # transaction, deferred foreign key checks would stay pending and
+        # keep the tables from being altered, so they run right away.
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        rebuild_issues_table(partitions)
+        self.assertEqual(issues_partitions(), partitions)
+        self.assertEqual(self.snapshot(), expected)
+        self.assertEqual(IssueCounter.objects.verify(self.project.pk), {})
+
+    def test_round_trip(self):
+        expected = self.snapshot()
+        self.assertConverted(4, expected)
+
+        # Writes after the swap go through the moved triggers.
+        self.create_issue("grandchild", parent=self.child, status=self.status)
+        expected = {
+            "issues": expected["issues"] + 1,
+            "closure": expected["closure"] + 3,
+            "subtree": expected["subtree"] | {"grandchild"},
+        }
+        self.assertEqual(self.snapshot(), expected)
+        self.assertEqual(IssueCounter.objects.verify(self.project.pk), {})
+
+        self.assertConverted(0, expected)
+
+
+class SprintSnapshotSignalTests(IssueFactoryMixin, TestCase):
+    """Saving an issue refreshes its sprint's snapshot only when it matters."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = cls.create_project("SNAP")
+        cls.sprint = Sprint.objects.create(
+            project=cls.project, name="SNAP sprint", start_date=TODAY, end_date=TODAY
+        )
+
+    def save_refreshes(self, change):
+        issue = self.create_issue("pointed", sprint=self.sprint)
+        issue = Issues.objects.get(pk=issue.pk)
+        change(issue)
+        with mock.patch("issues.signals.queue_sprint_snapshot_refresh") as refresh:
+            issue.save()
+        return refresh.called
+
+    def test_points_and_type_are_tracked(self):
+        self.assertTrue(
+            self.save_refreshes(lambda i: setattr(i, "meta", {"task_point": 5}))
+        )
+        self.assertTrue(
+            self.save_refreshes(lambda i: setattr(i, "type", IssueTypeEnum.BUG))
+        )
+
+    def test_title_is_not_tracked(self):
+        self.assertFalse(self.save_refreshes(lambda i: setattr(i, "title", "x")))
+
+
+class IssueImportTests(IssueFactoryMixin, TestCase):
+    """Importing an export of one project into another."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.source = cls.create_project("IMPSRC")
+        cls.project = cls.create_project("IMPDST")
+        cls.user = CustomUser.objects.create_user(
+            email="importer@example.com", password="secret"
+        )
+
+    def import_lines(self, *lines):
+        upload = io.BytesIO("\n".join(lines).encode())
+        rows = read_rows(upload, "ndjson")
+        return IssueImporter(self.project, self.user).run(rows)
+
+    def row(self, key, parent=None, **fields):
+        record = {
+            "key": key,
+            "title": key,
+            "type": IssueTypeEnum.TASK,
+            "start_date": str(TODAY),
+            "due_date": str(TODAY),
+            "parent": parent,
+            **fields,
+        }
+        return json.dumps({k: v for k, v in record.items() if v is not None})
+
+    def test_foreign_keys_are_rekeyed_with_their_parents(self):
+        root = self.create_issue("root", project=self.source)
+        child = self.create_issue("child", project=self.source, parent=root)
+        existing = self.create_issue("existing")
+
+        report = self.import_lines(
+            self.row(child.key, parent=root.key),
+            self.row(root.key),
+            self.row("IMPDST-100", parent=existing.key),
+        )
+
+        self.assertEqual((report["imported"], report["error_count"]), (3, 0))
+        imported = {
+            issue.title: issue
+            for issue in Issues.objects.filter(project=self.project).exclude(
+                pk=existing.pk
+            )
+        }
+        self.assertEqual(imported["IMPDST-100"].key, "IMPDST-100")
+        self.assertEqual(imported["IMPDST-100"].parent_id, existing.pk)
+        self.assertTrue(imported[child.key].key.startswith("IMPDST-"))
+        self.assertEqual(imported[child.key].parent_id, imported[root.key].pk)
+
+    def test_duplicate_keys_in_the_project_are_rejected(self):
+        existing = self.create_issue("existing")
+        report = self.import_lines(self.row(existing.key), self.row("IMPDST-7"))
+        self.assertEqual((report["imported"], report["error_count"]), (1, 1))
+        self.assertEqual(report["errors"][0]["row"], 1)
+
+    def test_unknown_parent_is_a_warning(self):
+        report = self.import_lines(self.row("IMPDST-1", parent="NOPE-1"))
+        self.assertEqual((report["imported"], report["error_count"]), (1, 0))
+        self.assertEqual(report["warnings"][0]["row"], 1)
+        self.assertIsNone(Issues.objects.get(key="IMPDST-1").parent_id)
+
+    def test_undecodable_ndjson_line_is_a_row_error(self):
+        upload = io.BytesIO(b"\xff\xfe{}\n" + self.row("IMPDST-1").encode())
+        report = IssueImporter(self.project, self.user).run(
+            read_rows(upload, "ndjson")
+        )
+        self.assertEqual((report["imported"], report["error_count"]), (1, 1))
+        self.assertEqual(report["errors"][0]["row"], 1)
+
+    def test_undecodable_csv_is_rejected(self):
+        upload = io.BytesIO(b"title,type\nfine,TASK\n\xff,TASK\n")
+        with self.assertRaises(ValidationError) as raised:
+            list(read_rows(upload, "csv"))
+        self.assertIn("file", raised.exception.detail)
@@ -0,0 +1,432 @@
+"""
+Bulk export and import of a project's issues as CSV or NDJSON.
+
+Exports stream rows from a server-side cursor, and imports read the
+upload line by line and write in chunks, so memory stays flat however
+many issues a project holds; an import only keeps the keys it re-keyed.
+
+Imported keys of the form ``<Project.key>-<n>`` are kept. Keys of another
+project are source keys: the issue gets a new key of the target project,
+and ``parent`` references to the source key follow it.
+"""
+
+import codecs
+import csv
+import heapq
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from rest_framework.exceptions import ValidationError
+
+from issues.models import (
+    ISSUE_META_FIELDS,
+    ArchivedIssue,
+    IssueKeySequence,
+    IssueStatus,
+    Issues,
+    Sprint,
+)
+from issues.serializers import IssueImportSerializer
+from issues.signals import queue_my_work_invalidation, queue_sprint_snapshot_refresh
+from otaskmanagement.events import queue_change
+from users.models import CustomUser
+
+FILE_FORMATS = ("csv", "ndjson")
+CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 500
+
+# Exported column -> ORM lookup. Related rows are referenced by natural
+# keys so that an export can be imported into another project.
+COLUMNS = (
+    ("key", "key"),
+    ("title", "title"),
+    ("description", "description"),
+    ("type", "type"),
+    ("priority", "priority"),
+    ("state", "state"),
+    ("start_date", "start_date"),
+    ("due_date", "due_date"),
+    ("status", "status__name"),
+    ("sprint", "sprint__name"),
+    ("parent", "parent__key"),
+    ("assignee", "assignee__email"),
+    ("reporter", "reporter__email"),
+    ("story_point", "meta__story_point"),
+    ("task_point", "meta__task_point"),
+)
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+# ------------------------------------------------------------------ #
+# Export
+# ------------------------------------------------------------------ #
+class Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(project_id, include_archived=False, chunk_size=CHUNK_SIZE):
+    """
+    Yield one dict per issue of the project, keyed by exported column.
+    Archived issues are merged in creation order with ``include_archived``.
+    """
+    lookups = [lookup for _, lookup in COLUMNS]
+    sources = [
+        Issues.objects.filter(project_id=project_id).values_list(
+            *lookups, "created_at", "id"
+        )
+    ]
+    if include_archived:
+        # The parent of an archived issue may be archived or not.
+        parent_key = Coalesce(
+            Subquery(Issues.objects.filter(pk=OuterRef("parent")).values("key")),
+            Subquery(ArchivedIssue.objects.filter(pk=OuterRef("parent")).values("key")),
+        )
+        archived_lookups = [
+            "parent_key" if lookup == "parent__key" else lookup for lookup in lookups
+        ]
+        sources.append(
+            ArchivedIssue.objects.filter(project_id=project_id)
+            .annotate(parent_key=parent_key)
+            .values_list(*archived_lookups, "created_at", "id")
+        )
+
+    rows = heapq.merge(
+        *(
+            source.order_by("created_at", "id").iterator(chunk_size=chunk_size)
+            for source in sources
+        ),
+        key=lambda row: row[-2:],
+    )
+    names = [name for name, _ in COLUMNS]
+    for row in rows:
+        yield dict(zip(names, row))
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow([name for name, _ in COLUMNS])
+    for row in rows:
+        yield writer.writerow(row.values())
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def stream_export(project_id, file_format, include_archived=False):
+    rows = export_rows(project_id, include_archived)
+    if file_format == "csv":
+        return stream_csv(rows)
+    return stream_ndjson(rows)
+
+
+# ------------------------------------------------------------------ #
+# Import
+# ------------------------------------------------------------------ #
+def read_rows(upload, file_format):
+    """
+    Yield ``(row_number, record, error)`` for every row of the upload.
+
+    Empty CSV cells are dropped so that optional fields fall back to
+    their defaults instead of failing validation. An NDJSON line that is
+    not valid UTF-8 is reported as a row error; a CSV file that cannot be
+    decoded or parsed is rejected as a whole, since later rows depend on
+    where the broken one ends.
+    """
+    if file_format == "csv":
+        reader = csv.DictReader(codecs.iterdecode(upload, "utf-8-sig"))
+        try:
+            for number, record in enumerate(reader, start=1):
+                record = {k: v for k, v in record.items() if v not in ("", None)}
+                yield number, record, None
+        except (UnicodeDecodeError, csv.Error) as exc:
+            raise ValidationError(
+                {"file": [f"Unreadable CSV at line {reader.line_num + 1}: {exc}"]}
+            )
+        return
+
+    number = 0
+    encoding = "utf-8-sig"
+    for raw in upload:
+        try:
+            line = raw.decode(encoding)
+        except UnicodeDecodeError:
+            line = None
+        encoding = "utf-8"
+        if line is not None and not line.strip():
+            continue
+        number += 1
+        if line is None:
+            yield number, None, {"non_field_errors": ["Line is not valid UTF-8."]}
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, None, {"non_field_errors": [f"Invalid JSON: {exc}"]}
+            continue
+        if not isinstance(record, dict):
+            yield number, None, {"non_field_errors": ["Expected a JSON object."]}
+            continue
+        yield number, record, None
+
+
+class IssueImporter:
+    """Validates rows and writes them with chunked bulk_create."""
+
+    def __init__(self, project, user, chunk_size=CHUNK_SIZE):
+        self.project = project
+        self.user = user
+        self.chunk_size = chunk_size
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+        self.warnings = []
+        self.seen_keys = set()
+        # Source key -> new key of the issues imported under a new key.
+        self.new_keys = {}
+        self.parent_links = []
+        self.sprint_ids = set()
+        self.assignee_ids = set()
+
+        self.statuses = dict(
+            IssueStatus.objects.filter(project=project).values_list("name", "id")
+        )
+        self.sprints = dict(
+            Sprint.objects.filter(project=project).values_list("name", "id")
+        )
+        self.users = {}
+
+    def add_error(self, number, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": number, "errors": errors})
+
+    def add_warning(self, number, warnings):
+        """Report a row that was imported, but not quite as given."""
+        if len(self.warnings) < MAX_REPORTED_ERRORS:
+            self.warnings.append({"row": number, "warnings": warnings})
+
+    def run(self, rows):
+        with transaction.atomic():
+            for chunk in chunked(rows, self.chunk_size):
+                self.import_chunk(chunk)
+            self.link_parents()
+
+        queue_sprint_snapshot_refresh(self.sprint_ids)
+        queue_my_work_invalidation(self.assignee_ids)
+        if self.imported:
+            queue_change(self.project.pk, "issues")
+        return {
+            "imported": self.imported,
+            "error_count": self.error_count,
+            "errors": self.errors,
+            "warnings": self.warnings,
+        }
+
+    def resolve_users(self, records):
+        emails = {
+            record[field]
+            for _, record in records
+            for field in ("assignee", "reporter")
+            if record.get(field) and record[field] not in self.users
+        }
+        if emails:
+            self.users.update(
+                CustomUser.objects.filter(email__in=emails).values_list("email", "id")
+            )
+
+    def validate(self, chunk):
+        valid = []
+        for number, record, error in chunk:
+            if error:
+                self.add_error(number, error)
+                continue
+            serializer = IssueImportSerializer(data=record)
+            if not serializer.is_valid():
+                self.add_error(number, serializer.errors)
+                continue
+            valid.append((number, serializer.validated_data))
+
+        keys = [data["key"] for _, data in valid if self.is_own_key(data.get("key"))]
+        # Keys stay unique across the project's archive too.
+        existing = {
+            key
+            for model in (Issues, ArchivedIssue)
+            for key in model.objects.filter(
+                project=self.project, key__in=keys
+            ).values_list("key", flat=True)
+        }
+        self.resolve_users(valid)
+
+        rows = []
+        for number, data in valid:
+            errors = self.check_references(data, existing)
+            if errors:
+                self.add_error(number, errors)
+                continue
+            if data.get("key"):
+                self.seen_keys.add(data["key"])
+            rows.append((number, data))
+        return rows
+
+    def check_references(self, data, existing_keys):
+        errors = {}
+        key = data.get("key")
+        if key in self.seen_keys:
+            errors["key"] = ["This key appears more than once in the file."]
+        elif key in existing_keys:
+            errors["key"] = ["An issue with this key already exists in this project."]
+        for field, known in (("status", self.statuses), ("sprint", self.sprints)):
+            if data.get(field) and data[field] not in known:
+                errors[field] = [f"Unknown {field} '{data[field]}' in this project."]
+        for field in ("assignee", "reporter"):
+            if data.get(field) and data[field] not in self.users:
+                errors[field] = [f"No user with email '{data[field]}'."]
+        if data.get("parent") and data.get("parent") == key:
+            errors["parent"] = ["An issue cannot be its own parent."]
+        return errors
+
+    def import_chunk(self, chunk):
+        rows = self.validate(chunk)
+        if not rows:
+            return
+
+        kept_keys = [
+            data["key"] for _, data in rows if self.is_own_key(data.get("key"))
+        ]
+        missing_keys = len(rows) - len(kept_keys)
+        new_keys = iter(
+            IssueKeySequence.objects.allocate_keys(self.project.pk, missing_keys)
+            if missing_keys
+            else ()
+        )
+
+        self.advance_sequence(kept_keys)
+
+        issues = []
+        for number, data in rows:
+            source_key = data.get("key")
+            if self.is_own_key(source_key):
+                key = source_key
+            else:
+                key = next(new_keys)
+                if source_key:
+                    self.new_keys[source_key] = key
+            issue = Issues(
+                key=key,
+                title=data["title"],
+                description=data.get("description"),
+                type=data["type"],
+                priority=data.get("priority") or None,
+                state=data.get("state") or None,
+                start_date=data["start_date"],
+                due_date=data["due_date"],
+                project=self.project,
+                status_id=self.statuses.get(data.get("status")),
+                sprint_id=self.sprints.get(data.get("sprint")),
+                assignee_id=self.users.get(data.get("assignee")),
+                reporter_id=self.users.get(data.get("reporter")),
+                meta=self.build_meta(data),
+                created_by=self.user,
+                updated_by=self.user,
+            )
+            issues.append(issue)
+            if data.get("parent"):
+                self.parent_links.append((number, issue.pk, data["parent"]))
+            if issue.sprint_id:
+                self.sprint_ids.add(issue.sprint_id)
+            if issue.assignee_id:
+                self.assignee_ids.add(issue.assignee_id)
+
+        Issues.objects.bulk_create(issues)
+        self.imported += len(issues)
+
+    def is_own_key(self, key):
+        """Whether ``key`` has the form ``<Project.key>-<n>`` of this project."""
+        prefix = f"{self.project.key}-"
+        return bool(key) and key.startswith(prefix) and key[len(prefix) :].isdigit()
+
+    def advance_sequence(self, keys):
+        """Move the key sequence past imported ``<Project.key>-<n>`` keys."""
+        prefix = f"{self.project.key}-"
+        numbers = [int(key[len(prefix) :]) for key in keys]
+        if numbers:
+            IssueKeySequence.objects.advance_to(self.project.pk, max(numbers))
+
+    def build_meta(self, data):
+        """The row's fields that belong to its issue type; others are ignored."""
+        return {
+            name: data[name]
+            for name in ISSUE_META_FIELDS[data["type"]]
+            if data.get(name) is not None
+        }
+
+    def link_parents(self):
+        """
+        Set the parents once every row is written, as a parent may come
+        later in the file. Rows whose parent cannot be set stay imported
+        as top-level issues and are reported as warnings.
+        """
+        for links in chunked(self.parent_links, self.chunk_size):
+            keys = {
+                self.new_keys.get(parent_key, parent_key) for _, _, parent_key in links
+            }
+            parents = dict(
+                Issues.objects.filter(project=self.project, key__in=keys).values_list(
+                    "key", "id"
+                )
+            )
+            updates = []
+            for number, issue_id, parent_key in links:
+                parent_id = parents.get(self.new_keys.get(parent_key, parent_key))
+                if parent_id is None:
+                    self.add_warning(
+                        number,
+                        {
+                            "parent": [
+                                f"Unknown parent issue '{parent_key}'; "
+                                "imported without a parent."
+                            ]
+                        },
+                    )
+                    continue
+                updates.append((number, Issues(pk=issue_id, parent_id=parent_id)))
+
+            try:
+                with transaction.atomic():
+                    Issues.objects.bulk_update(
+                        [issue for _, issue in updates], ["parent"]
+                    )
+            except IntegrityError:
+                self.link_one_by_one(updates)
+
+    def link_one_by_one(self, updates):
+        """Find the rows whose parent would close a cycle."""
+        for number, issue in updates:
+            try:
+                with transaction.atomic():
+                    Issues.objects.filter(pk=issue.pk).update(parent_id=issue.parent_id)
+            except IntegrityError:
+                self.add_warning(
+                    number,
+                    {
+                        "parent": [
+                            "Parent would create a cycle of sub-issues; "
+                            "imported without a parent."
+                        ]
+                    },
+                )
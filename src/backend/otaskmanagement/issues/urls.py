@@ -1,15 +1,93 @@
 from django.urls import include, path
-from issues.api import SprintDetail, SprintList
+from common.api import IssueActivity
+from issues.api import (
+    AsyncSprintDetail,
+    AsyncSprintList,
+    IssueBoard,
+    IssueExport,
+    IssueImport,
+    IssueSearch,
+    IssueSummary,
+    IssueTree,
+    MyIssues,
+    ProjectVelocity,
+    SprintBurndown,
+)
+from otaskmanagement.async_views import read_view
 
 sprint_api_urls = [
     path(
         "",
-        SprintList.as_view(),
+        read_view(AsyncSprintList),
         name="api-sprint-list-create",
     ),
     path(
         "<uuid:pk>/",
-        SprintDetail.as_view(),
+        read_view(AsyncSprintDetail),
         name="api-sprint-detail",
     ),
+    path(
+        "<uuid:sprint_id>/board/",
+        IssueBoard.as_view(),
+        name="api-sprint-board",
+    ),
+    path(
+        "<uuid:pk>/burndown/",
+        SprintBurndown.as_view(),
+        name="api-sprint-burndown",
+    ),
+    path(
+        "velocity/",
+        ProjectVelocity.as_view(),
+        name="api-sprint-velocity",
+    ),
+]
+
+board_api_urls = [
+    path(
+        "",
+        IssueBoard.as_view(),
+        name="api-project-board",
+    ),
+]
+
+issue_api_urls = [
+    path(
+        "search/",
+        IssueSearch.as_view(),
+        name="api-issue-search",
+    ),
+    path(
+        "summary/",
+        IssueSummary.as_view(),
+        name="api-issue-summary",
+    ),
+    path(
+        "export/<str:file_format>/",
+        IssueExport.as_view(),
+        name="api-issue-export",
+    ),
+    path(
+        "import/",
+        IssueImport.as_view(),
+        name="api-issue-import",
+    ),
+    path(
+        "<uuid:pk>/tree/",
+        IssueTree.as_view(),
+        name="api-issue-tree",
+    ),
+    path(
+        "<uuid:pk>/activity/",
+        IssueActivity.as_view(),
+        name="api-issue-activity",
+    ),
+]
+
+my_work_api_urls = [
+    path(
+        "",
+        MyIssues.as_view(),
+        name="api-my-issues",
+    ),
 ]
@@ -0,0 +1,163 @@
+"""
+Async read views for deployments served through ``asgi.py``.
+
+An ``AsyncReadView`` wraps one of the regular DRF views. GET requests
+reuse that view's authentication, permission and throttle checks, its
+queryset, pagination and conditional GET validators, but load the rows
+with Django's async ORM and render them through the serializer's
+ValuesPlan, so the worker's event loop is free while the database or a
+slow client is busy. Every other method, and every GET the fast path
+does not cover (errors, missing rows, browsable API, serializers without
+a plan), is handed to the wrapped view unchanged.
+
+The views are mounted with ``read_view()``, which only picks them when
+``ASYNC_READ_VIEWS`` is enabled; under WSGI the sync views are used.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.cache import get_conditional_response
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import BasePermission
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from otaskmanagement.mixins import ConditionalGetMixin, has_updated_at
+from otaskmanagement.serializers import get_values_plan
+
+
+class AsyncReadView(View):
+    """Serves GET for ``sync_view`` through the async ORM."""
+
+    sync_view = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # As with APIView, CSRF is left to the wrapped view's authentication
+        # classes; the middleware would reject token-authenticated requests.
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method == "GET":
+            return await self.get(request, *args, **kwargs)
+        return await self.run_sync_view(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        view = await sync_to_async(self.initial_view)(request, *args, **kwargs)
+        if view is None:
+            return await self.run_sync_view(request, *args, **kwargs)
+
+        if self.is_detail(view):
+            response = await self.retrieve(view)
+        else:
+            response = await self.list(view)
+        if response is None:
+            return await self.run_sync_view(request, *args, **kwargs)
+
+        response = view.finalize_response(view.request, response)
+        if isinstance(response, Response):
+            response.render()
+        return response
+
+    async def run_sync_view(self, request, *args, **kwargs):
+        view = self.sync_view.as_view()
+        return await sync_to_async(view)(request, *args, **kwargs)
+
+    def initial_view(self, request, *args, **kwargs):
+        """
+        Set up the sync view for this request and run its checks, as
+        ``APIView.dispatch`` does. Returns None when the request has to go
+        through the sync view instead.
+        """
+        view = self.sync_view()
+        view.setup(request, *args, **kwargs)
+        view.request = view.initialize_request(request, *args, **kwargs)
+        view.headers = view.default_response_headers
+        try:
+            view.initial(view.request, *args, **kwargs)
+            view.plan = get_values_plan(view.get_serializer_class())
+            view.base_queryset = view.filter_queryset(view.get_queryset())
+        except APIException:
+            return None
+
+        if not isinstance(view, ConditionalGetMixin) or view.plan is None:
+            return None
+        if not has_updated_at(view.base_queryset.model):
+            return None
+        if self.is_detail(view) and has_object_permissions(view):
+            return None
+        if not isinstance(view.request.accepted_renderer, JSONRenderer):
+            return None
+        return view
+
+    @staticmethod
+    def is_detail(view):
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        return view.kwargs.get(lookup_url_kwarg) is not None
+
+    async def list(self, view):
+        request = view.request
+        queryset = view.base_queryset
+        state = await queryset.aaggregate(**view.get_list_aggregates())
+        etag, last_modified = view.get_list_validators(request, state)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            rows = view.plan.values(queryset)
+            try:
+                page = await self.paginate(view, rows)
+            except APIException:
+                return None
+            if page is not None:
+                response = view.get_paginated_response(await view.plan.arender(page))
+            else:
+                rows = [row async for row in rows]
+                response = Response(await view.plan.arender(rows))
+        return view.add_validators(response, etag, last_modified)
+
+    @staticmethod
+    async def paginate(view, rows):
+        paginator = view.paginator
+        if paginator is None or not hasattr(paginator, "apaginate_queryset"):
+            return None
+        return await paginator.apaginate_queryset(rows, view.request)
+
+    async def retrieve(self, view):
+        request = view.request
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        lookup = {view.lookup_field: view.kwargs[lookup_url_kwarg]}
+        row = await view.plan.values(view.base_queryset).filter(**lookup).afirst()
+        if row is None:
+            return None
+
+        state = {"pk": row[view.plan.pk_column], "updated_at": row["updated_at"]}
+        etag, last_modified = view.get_validators(request, state, row["updated_at"])
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            data = await view.plan.arender([row])
+            response = Response(data[0])
+        return view.add_validators(response, etag, last_modified)
+
+
+def has_object_permissions(view):
+    """Whether a permission class checks objects, which needs an instance."""
+    return any(
+        type(permission).has_object_permission
+        is not BasePermission.has_object_permission
+        for permission in view.get_permissions()
+    )
+
+
+def read_view(view_class):
+    """
+    Return the view function for a URL pattern: the async view when
+    ``ASYNC_READ_VIEWS`` is enabled, otherwise the sync view it wraps.
+    """
+    if getattr(settings, "ASYNC_READ_VIEWS", False):
+        return view_class.as_view()
+    return view_class.sync_view.as_view()
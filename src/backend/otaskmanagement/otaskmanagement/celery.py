@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import worker_process_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'otaskmanagement.settings')
 
@@ -7,4 +8,11 @@ app = Celery('otaskmanagement')
 
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
-app.autodiscover_tasks()
\ No newline at end of file
+app.autodiscover_tasks()
+
+
+@worker_process_init.connect
+def open_own_database_pools(**kwargs):
+    from otaskmanagement.db import discard_inherited_pools
+
+    discard_inherited_pools()
@@ -0,0 +1,39 @@
+"""
+Helpers around Django's PostgreSQL connection pool (psycopg 3).
+
+Every process, whether a web worker or a Celery worker child, owns one
+pool per database alias, bounded by the ``DB_POOL_*`` settings. Pools are
+created lazily on the first query, after the process has forked.
+"""
+
+import os
+
+from django.db import connections
+from django.db.backends.postgresql.base import DatabaseWrapper
+
+# Pools inherited through fork() are kept referenced, see below.
+_inherited_pools = []
+
+
+def get_pools():
+    """Return this process' open connection pools by database alias."""
+    pools = DatabaseWrapper._connection_pools
+    return {alias: pools[alias] for alias in connections if alias in pools}
+
+
+def pool_stats():
+    """Return the pid and the psycopg pool statistics of this process."""
+    return {
+        "pid": os.getpid(),
+        "pools": {alias: pool.get_stats() for alias, pool in get_pools().items()},
+    }
+
+
+def discard_inherited_pools():
+    """
+    Make a forked process open its own pools. The inherited ones share
+    their sockets with the parent, so they are dropped without being
+    closed, which would end the parent's sessions too.
+    """
+    _inherited_pools.extend(DatabaseWrapper._connection_pools.values())
+    DatabaseWrapper._connection_pools.clear()
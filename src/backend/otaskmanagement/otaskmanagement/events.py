@@ -0,0 +1,254 @@
+"""
+Live change events of a project, pushed to connected clients.
+
+Writes to a project's issues, sprints and memberships queue a change
+event. The events queued during a transaction are merged and published
+once, on commit, through a broker: Redis pub/sub when ``REDIS_URL`` is
+set, otherwise an in-process broker (tests, runserver). Every process
+holds one Redis subscription for the projects its clients follow and
+fans the messages out to their streams, and each stream debounces what
+it receives before writing, so a bulk edit reaches the client as one
+message.
+
+A message maps every changed kind to the changed primary keys, or to
+None when more than ``MAX_EVENT_IDS`` changed and the client should
+reload that kind as a whole:
+
+    {"project": "<uuid>", "issues": ["<uuid>", ...], "sprints": None}
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from collections import Counter
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
+import redis
+import redis.asyncio
+from django.conf import settings
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "otask:events:"
+EVENT_KINDS = ("issues", "sprints", "memberships")
+MAX_EVENT_IDS = 100
+RETRY_MILLISECONDS = 3000
+
+_pending = threading.local()
+
+
+def channel_name(project_id):
+    return f"{CHANNEL_PREFIX}{project_id}"
+
+
+# ------------------------------------------------------------------ #
+# Publishing
+# ------------------------------------------------------------------ #
+def queue_change(project_id, kind, pk=None):
+    """
+    Queue a change of ``kind`` in a project, published with the other
+    changes of the transaction once it commits. ``pk=None`` marks the
+    whole kind as changed.
+    """
+    if not project_id:
+        return
+
+    scheduled = _flush_scheduled()
+    if not scheduled:
+        # Changes left over from a rolled back transaction are dropped.
+        # Those of a rolled back savepoint are still sent, which only
+        # makes clients refetch rows that did not change.
+        _pending.changes = {}
+
+    kinds = _pending.changes.setdefault(str(project_id), {})
+    pks = kinds.get(kind, set())
+    if pk is None or pks is None:
+        kinds[kind] = None
+    else:
+        pks.add(str(pk))
+        kinds[kind] = pks
+
+    if not scheduled:
+        transaction.on_commit(flush_changes, robust=True)
+
+
+def _flush_scheduled():
+    connection = transaction.get_connection()
+    return any(func is flush_changes for _, func, _ in connection.run_on_commit)
+
+
+def flush_changes():
+    changes = getattr(_pending, "changes", None) or {}
+    _pending.changes = {}
+
+    broker = get_broker()
+    for project_id, kinds in changes.items():
+        message = {"project": project_id}
+        merge_message(message, {kind: _listed(pks) for kind, pks in kinds.items()})
+        broker.publish(channel_name(project_id), message)
+
+
+def _listed(pks):
+    if pks is None or len(pks) > MAX_EVENT_IDS:
+        return None
+    return sorted(pks)
+
+
+def merge_message(merged, message):
+    """Fold ``message`` into ``merged``, keeping at most MAX_EVENT_IDS per kind."""
+    for kind in EVENT_KINDS:
+        if kind not in message:
+            continue
+        pks = message[kind]
+        if pks is None or (kind in merged and merged[kind] is None):
+            merged[kind] = None
+            continue
+        pks = sorted(set(merged.get(kind, ())) | set(pks))
+        merged[kind] = pks if len(pks) <= MAX_EVENT_IDS else None
+    return merged
+
+
+# ------------------------------------------------------------------ #
+# Brokers
+# ------------------------------------------------------------------ #
+class InMemoryBroker:
+    """Delivers messages to the listeners of the current process only."""
+
+    def __init__(self):
+        self._listeners = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            listeners = list(self._listeners.get(channel, ()))
+        for loop, queue in listeners:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, message)
+            except RuntimeError:
+                # The listener's event loop is already closed.
+                pass
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        listener = (asyncio.get_running_loop(), asyncio.Queue())
+        with self._lock:
+            self._listeners.setdefault(channel, set()).add(listener)
+        try:
+            yield listener[1]
+        finally:
+            with self._lock:
+                listeners = self._listeners.get(channel, set())
+                listeners.discard(listener)
+                if not listeners:
+                    self._listeners.pop(channel, None)
+
+
+class RedisBroker:
+    """
+    Publishes through Redis pub/sub. Subscriptions share one connection
+    per process, subscribed to the channels that have local listeners,
+    and its messages are handed to those listeners in memory.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self._client = None
+        self._local = InMemoryBroker()
+        self._pubsub = None
+        self._pubsub_loop = None
+        self._reader = None
+        self._counts = Counter()
+
+    def publish(self, channel, message):
+        if self._client is None:
+            self._client = redis.Redis.from_url(self.url)
+        self._client.publish(channel, json.dumps(message))
+
+    @asynccontextmanager
+    async def subscribe(self, channel):
+        async with self._local.subscribe(channel) as queue:
+            pubsub = self._get_pubsub()
+            self._counts[channel] += 1
+            try:
+                if self._counts[channel] == 1:
+                    await pubsub.subscribe(channel)
+                if self._reader is None or self._reader.done():
+                    self._reader = asyncio.create_task(self._read(pubsub))
+                yield queue
+            finally:
+                self._counts[channel] -= 1
+                if not self._counts[channel]:
+                    del self._counts[channel]
+                    await pubsub.unsubscribe(channel)
+
+    def _get_pubsub(self):
+        # uvicorn runs one event loop per worker process, but the
+        # connection is rebuilt if the loop ever changes.
+        loop = asyncio.get_running_loop()
+        if self._pubsub_loop is not loop:
+            client = redis.asyncio.Redis.from_url(self.url)
+            self._pubsub = client.pubsub(ignore_subscribe_messages=True)
+            self._pubsub_loop = loop
+            self._reader = None
+            self._counts.clear()
+        return self._pubsub
+
+    async def _read(self, pubsub):
+        while True:
+            try:
+                message = await pubsub.get_message(timeout=1.0)
+            except Exception:
+                logger.exception("Reading live events from Redis failed.")
+                await asyncio.sleep(1.0)
+                continue
+            if message is None or message["type"] != "message":
+                continue
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            self._local.publish(channel, json.loads(message["data"]))
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    if getattr(settings, "REDIS_URL", None):
+        return RedisBroker(settings.REDIS_URL)
+    return InMemoryBroker()
+
+
+# ------------------------------------------------------------------ #
+# Streaming
+# ------------------------------------------------------------------ #
+async def event_stream(project_id):
+    """
+    Yield the Server-Sent Events of a project. Messages are held until
+    no new one arrived for ``LIVE_EVENTS_DEBOUNCE`` seconds, or at most
+    ``LIVE_EVENTS_MAX_DELAY`` seconds, and sent as one merged event.
+    """
+    debounce = settings.LIVE_EVENTS_DEBOUNCE
+    max_delay = settings.LIVE_EVENTS_MAX_DELAY
+    keepalive = settings.LIVE_EVENTS_KEEPALIVE
+    loop = asyncio.get_running_loop()
+
+    yield f"retry: {RETRY_MILLISECONDS}\n\n"
+    async with get_broker().subscribe(channel_name(project_id)) as queue:
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+
+            merged = merge_message({"project": str(project_id)}, message)
+            deadline = loop.time() + max_delay
+            while (remaining := min(debounce, deadline - loop.time())) > 0:
+                try:
+                    message = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                merge_message(merged, message)
+
+            yield f"event: change\ndata: {json.dumps(merged)}\n\n"
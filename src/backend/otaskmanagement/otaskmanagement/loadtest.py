@@ -0,0 +1,112 @@
+"""
+Minimal HTTP load generator shared by the load test commands.
+
+Requests are sent over plain sockets with ``Connection: close``, so no
+HTTP client dependency is needed and nothing leaves the machine. Every
+target is a ``(name, path)`` pair and the results are kept per name.
+"""
+
+import asyncio
+import statistics
+import time
+from collections import Counter, defaultdict
+
+SLOW_READ_SIZE = 256
+
+
+def percentiles(latencies):
+    """Return p50, p95, p99 and max of ``latencies``, in seconds."""
+    latencies = sorted(latencies)
+    if len(latencies) < 2:
+        value = latencies[0] if latencies else 0.0
+        return {"p50": value, "p95": value, "p99": value, "max": value}
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50": quantiles[49],
+        "p95": quantiles[94],
+        "p99": quantiles[98],
+        "max": latencies[-1],
+    }
+
+
+class LoadTest:
+    """
+    Runs fast clients that request the targets back to back, and
+    optionally slow clients that trickle their requests and read the
+    responses a few bytes at a time, ``slow_interval`` seconds apart.
+    """
+
+    def __init__(self, host, port, targets, headers, slow_interval=0.5):
+        self.host = host
+        self.port = port
+        self.targets = targets
+        self.headers = headers
+        self.slow_interval = slow_interval
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+        self.errors = Counter()
+        self.slow_completed = 0
+
+    def request_lines(self, path):
+        lines = [f"GET {path} HTTP/1.1", *self.headers, "Connection: close", ""]
+        return [f"{line}\r\n".encode() for line in lines]
+
+    async def run(self, clients, slow_clients, duration):
+        deadline = time.monotonic() + duration
+        slow = [
+            asyncio.create_task(self.slow_client(number, deadline))
+            for number in range(slow_clients)
+        ]
+        if slow:
+            # Let the slow clients occupy their connections first.
+            await asyncio.sleep(min(self.slow_interval, duration / 10))
+        fast = [self.fast_client(number, deadline) for number in range(clients)]
+        await asyncio.gather(*fast)
+        for task in slow:
+            task.cancel()
+        await asyncio.gather(*slow, return_exceptions=True)
+
+    async def fast_client(self, number, deadline):
+        count = number
+        while time.monotonic() < deadline:
+            name, path = self.targets[count % len(self.targets)]
+            count += 1
+            started = time.monotonic()
+            try:
+                status = await self.request(path)
+            except (OSError, asyncio.IncompleteReadError) as exc:
+                self.errors[type(exc).__name__] += 1
+                continue
+            self.latencies[name].append(time.monotonic() - started)
+            self.statuses[name][status] += 1
+
+    async def slow_client(self, number, deadline):
+        count = number
+        while time.monotonic() < deadline:
+            _, path = self.targets[count % len(self.targets)]
+            count += 1
+            try:
+                await self.request(path, slow=True)
+            except (OSError, asyncio.IncompleteReadError):
+                await asyncio.sleep(self.slow_interval)
+                continue
+            self.slow_completed += 1
+
+    async def request(self, path, slow=False):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            for line in self.request_lines(path):
+                writer.write(line)
+                await writer.drain()
+                if slow:
+                    await asyncio.sleep(self.slow_interval)
+            status_line = await reader.readuntil(b"\r\n")
+            while True:
+                chunk = await reader.read(SLOW_READ_SIZE if slow else 65536)
+                if not chunk:
+                    break
+                if slow:
+                    await asyncio.sleep(self.slow_interval)
+        finally:
+            writer.close()
+        return int(status_line.split()[1])
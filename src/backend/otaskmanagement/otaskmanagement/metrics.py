@@ -0,0 +1,230 @@
+"""
+Per-request latency and SQL instrumentation exported to Prometheus.
+
+``QueryMetricsMiddleware`` times every request and labels it with the
+resolved URL name. A ``METRICS_SAMPLE_RATE`` fraction of the requests
+also records their queries through a database execute wrapper, which
+gives the query count and database time per request, and counts a
+suspected N+1 pattern when the same query shape runs at least
+``METRICS_N_PLUS_ONE_THRESHOLD`` times in one request. Requests that are
+not sampled only pay for a context variable lookup per query.
+
+``metrics_view`` serves the histograms in the Prometheus text format.
+When ``PROMETHEUS_MULTIPROC_DIR`` is set the values of all worker
+processes are aggregated, as gunicorn needs; the entrypoint empties the
+directory before the server starts.
+"""
+
+import logging
+import os
+import random
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden, HttpResponseNotFound
+from django.utils.crypto import constant_time_compare
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter as PrometheusCounter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+logger = logging.getLogger(__name__)
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+UNRESOLVED = "<unresolved>"
+
+REQUESTS = PrometheusCounter(
+    "otask_http_requests_total",
+    "Requests by URL name, method and status code.",
+    ("view", "method", "status"),
+)
+REQUEST_SECONDS = Histogram(
+    "otask_http_request_duration_seconds",
+    "Time spent producing the response.",
+    ("view", "method"),
+    buckets=SECONDS_BUCKETS,
+)
+SAMPLED_REQUESTS = PrometheusCounter(
+    "otask_sampled_requests_total",
+    "Requests whose queries were recorded.",
+    ("view", "method"),
+)
+REQUEST_QUERIES = Histogram(
+    "otask_db_queries_per_request",
+    "SQL queries run by a sampled request.",
+    ("view", "method"),
+    buckets=QUERY_BUCKETS,
+)
+REQUEST_DB_SECONDS = Histogram(
+    "otask_db_duration_seconds",
+    "Time a sampled request spent in SQL queries.",
+    ("view", "method"),
+    buckets=SECONDS_BUCKETS,
+)
+N_PLUS_ONE = PrometheusCounter(
+    "otask_db_n_plus_one_suspected_total",
+    "Sampled requests that repeated one query shape past the threshold.",
+    ("view", "method"),
+)
+
+# "IN (%s, %s, %s)" -> "IN (%s)", so lists of any length share a shape.
+PLACEHOLDER_LIST = re.compile(r"%s(?:, %s)+")
+
+_collector = ContextVar("query_collector", default=None)
+
+
+class QueryCollector:
+    __slots__ = ("count", "seconds", "shapes")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+
+    def add(self, sql, seconds):
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[sql] += 1
+
+    def repeated_shapes(self, threshold):
+        shapes = Counter()
+        for sql, count in self.shapes.items():
+            if "%s, %s" in sql:
+                sql = PLACEHOLDER_LIST.sub("%s", sql)
+            shapes[sql] += count
+        return [(sql, count) for sql, count in shapes.items() if count >= threshold]
+
+
+def record_query(execute, sql, params, many, context):
+    collector = _collector.get()
+    if collector is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        collector.add(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(sender=None, connection=connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class QueryMetricsMiddleware:
+    """Records request latency and, for sampled requests, their queries."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "METRICS_SAMPLE_RATE", 0.1)
+        self.threshold = getattr(settings, "METRICS_N_PLUS_ONE_THRESHOLD", 5)
+        # Connections opened later, including the ones of the threads
+        # that run the async ORM, record through the same wrapper.
+        connection_created.connect(
+            install_query_recorder, dispatch_uid="otask-query-metrics"
+        )
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        install_query_recorder()
+        started, collector, token = self.start()
+        response = None
+        try:
+            response = self.get_response(request)
+            return response
+        finally:
+            self.finish(request, response, started, collector, token)
+
+    async def __acall__(self, request):
+        started, collector, token = self.start()
+        response = None
+        try:
+            response = await self.get_response(request)
+            return response
+        finally:
+            self.finish(request, response, started, collector, token)
+
+    def start(self):
+        collector = None
+        if self.sample_rate >= 1 or random.random() < self.sample_rate:
+            collector = QueryCollector()
+        return time.perf_counter(), collector, _collector.set(collector)
+
+    def finish(self, request, response, started, collector, token):
+        elapsed = time.perf_counter() - started
+        _collector.reset(token)
+
+        view = view_name(request)
+        method = request.method
+        status = response.status_code if response is not None else 500
+        REQUESTS.labels(view, method, status).inc()
+        REQUEST_SECONDS.labels(view, method).observe(elapsed)
+        if collector is None:
+            return
+
+        SAMPLED_REQUESTS.labels(view, method).inc()
+        REQUEST_QUERIES.labels(view, method).observe(collector.count)
+        REQUEST_DB_SECONDS.labels(view, method).observe(collector.seconds)
+        repeated = collector.repeated_shapes(self.threshold)
+        if repeated:
+            N_PLUS_ONE.labels(view, method).inc()
+            sql, count = max(repeated, key=lambda shape: shape[1])
+            logger.warning(
+                "Suspected N+1 in %s %s: %d runs of %s", method, view, count, sql[:500]
+            )
+
+
+def view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNRESOLVED
+    return match.view_name or match.route
+
+
+def get_registry():
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def metrics_view(request):
+    """
+    Prometheus scrape endpoint. The scraper must send ``METRICS_TOKEN`` as
+    a bearer token; without a token configured the endpoint is not served.
+    """
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not getattr(settings, "METRICS_ENABLED", True) or not token:
+        return HttpResponseNotFound()
+
+    header = request.headers.get("Authorization", "")
+    if not constant_time_compare(header, f"Bearer {token}"):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST
+    )
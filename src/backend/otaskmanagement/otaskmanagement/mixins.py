@@ -1,22 +1,146 @@
 """Custom mixins for (API) view in the whole project"""
 
+import hashlib
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
 from rest_framework import mixins, generics, status
 from rest_framework.response import Response
 
+from otaskmanagement.pagination import KeysetPagination
+from otaskmanagement.serializers import get_values_plan
+
+
+class ValuesListMixin:
+    """
+    Renders list responses from ``.values()`` rows through the serializer's
+    ValuesPlan, falling back to the serializer when it has no plan.
+    """
+
+    def list(self, request, *args, **kwargs):
+        plan = get_values_plan(self.get_serializer_class())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = plan.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(queryset))
+
+
+class ConditionalGetMixin:
+    """
+    Answers conditional GETs (``If-None-Match`` / ``If-Modified-Since``)
+    with 304 before anything is serialized.
+
+    Lists are validated by an ETag over the newest ``updated_at`` and the
+    row count of the view's queryset, which the views already scope to the
+    project, and details by the row's own ``updated_at``. ``conditional_related`` names
+    relations whose rows are part of the list output, such as a project's
+    memberships, so that changes to them invalidate the list too.
+    """
+
+    conditional_related = ()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if not has_updated_at(queryset.model):
+            return super().list(request, *args, **kwargs)
+
+        state = queryset.aggregate(**self.get_list_aggregates())
+        etag, last_modified = self.get_list_validators(request, state)
+
+        # A deletion leaves the newest updated_at unchanged, so lists are
+        # only revalidated by the ETag, which also covers the row count.
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().list(request, *args, **kwargs)
+        return self.add_validators(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        if not has_updated_at(type(instance)):
+            return Response(self.get_serializer(instance).data)
 
-class ListAPI(generics.ListAPIView):
+        state = {"pk": instance.pk, "updated_at": instance.updated_at}
+        etag, last_modified = self.get_validators(request, state, instance.updated_at)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = Response(self.get_serializer(instance).data)
+        return self.add_validators(response, etag, last_modified)
+
+    def get_list_aggregates(self):
+        aggregates = {
+            "updated_at": Max("updated_at"),
+            "count": Count("pk", distinct=bool(self.conditional_related)),
+        }
+        for lookup in self.conditional_related:
+            aggregates[f"{lookup}__updated_at"] = Max(f"{lookup}__updated_at")
+            aggregates[f"{lookup}__count"] = Count(lookup)
+        return aggregates
+
+    def get_list_validators(self, request, state):
+        moments = [
+            value
+            for key, value in state.items()
+            if key.endswith("updated_at") and value is not None
+        ]
+        return self.get_validators(request, state, max(moments, default=None))
+
+    def get_validators(self, request, state, updated_at):
+        """
+        Return a weak ETag of the state for this URL and format, and the
+        ``updated_at`` as a Last-Modified timestamp.
+        """
+        parts = [request.get_full_path(), request.accepted_renderer.format]
+        parts += [f"{key}={value}" for key, value in sorted(state.items())]
+        digest = hashlib.md5("|".join(parts).encode()).hexdigest()
+        last_modified = int(updated_at.timestamp()) if updated_at else None
+        return f'W/"{digest}"', last_modified
+
+    def add_validators(self, response, etag, last_modified):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        patch_vary_headers(response, ("Authorization",))
+        return response
+
+
+def has_updated_at(model):
+    try:
+        model._meta.get_field("updated_at")
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+class ListAPI(ConditionalGetMixin, ValuesListMixin, generics.ListAPIView):
     """Provides a read-only list API for the model."""
 
+    pagination_class = KeysetPagination
 
-class ListCreateAPI(generics.ListCreateAPIView):
+
+class ListCreateAPI(ConditionalGetMixin, ValuesListMixin, generics.ListCreateAPIView):
     """Provides a list and create view for the model"""
 
+    pagination_class = KeysetPagination
+
 
-class RetrieveUpdateDestroyAPI(generics.RetrieveUpdateDestroyAPIView):
+class RetrieveUpdateDestroyAPI(
+    ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """Provides a detail view API for the model."""
 
 
 class OtaskMixinDetailView(
+    ConditionalGetMixin,
+    ValuesListMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
@@ -28,6 +152,7 @@ class OtaskMixinDetailView(
 
     lookup_field = "pk"
     lookup_url_kwarg = "pk"
+    pagination_class = KeysetPagination
 
     def get(self, request, *args, **kwargs):
         """Custom get method to pass kwargs."""
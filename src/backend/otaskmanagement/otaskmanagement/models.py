@@ -50,3 +50,17 @@ class BaseModel(models.Model):
         abstract = True
         get_latest_by = "created_at"
         ordering = ("-created_at",)
+
+
+class LoadedValuesMixin:
+    """
+    Remembers the values an instance was loaded with in
+    ``_loaded_values``, keyed by attname, so signal receivers can tell
+    which fields a save changes.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
@@ -0,0 +1,177 @@
+"""
+Keyset (cursor) pagination helpers shared by the API views.
+
+Rows are ordered by BaseModel's ``-created_at`` with ``id`` as a
+tie-breaker, so a cursor is simply the position of the last row returned
+and every page is an index range scan on ``created_at``.
+"""
+
+import base64
+import json
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+KEYSET_ORDERING = ("-created_at", "id")
+
+
+def encode_cursor(instance):
+    """
+    Encode the keyset position of a model instance, or of a ``.values()``
+    row holding ``created_at`` and ``id``, as an opaque string.
+    """
+    if isinstance(instance, dict):
+        payload = [instance["created_at"].isoformat(), str(instance["id"])]
+    else:
+        payload = [instance.created_at.isoformat(), str(instance.pk)]
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Decode a cursor into ``(created_at, pk)``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded))
+        created_at = parse_datetime(created_at)
+        pk = uuid.UUID(pk)
+    except (TypeError, ValueError, AttributeError):
+        created_at = None
+
+    if created_at is None:
+        raise ValidationError({"cursor": "Invalid cursor."})
+    return created_at, pk
+
+
+def after_cursor(cursor):
+    """Return a filter selecting the rows that follow the cursor."""
+    created_at, pk = decode_cursor(cursor)
+    return Q(created_at__lt=created_at) | Q(created_at=created_at, pk__gt=pk)
+
+
+def keyset_sorted(instances):
+    """Sort model instances from several querysets in KEYSET_ORDERING."""
+    instances = sorted(instances, key=lambda instance: instance.pk)
+    return sorted(instances, key=lambda instance: instance.created_at, reverse=True)
+
+
+def estimate_count(queryset):
+    """Return the planner's row estimate for a queryset instead of COUNT(*)."""
+    sql, params = queryset.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]["Plan Rows"]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Opt-in cursor pagination for BaseModel querysets.
+
+    Requests without ``page_size`` or ``cursor`` are left unpaginated, so
+    existing clients keep receiving plain lists. Every page is a range
+    scan after the previous cursor, so deep pages cost the same as the
+    first one. The total is only computed on request: ``count=exact``
+    runs ``COUNT(*)`` and ``count=estimate`` reads the planner estimate.
+    """
+
+    page_size = 50
+    max_page_size = 200
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+
+    def is_requested(self, request):
+        params = request.query_params
+        return (
+            self.page_size_query_param in params or self.cursor_query_param in params
+        )
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            raise ValidationError(
+                {self.page_size_query_param: "A valid integer is required."}
+            )
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param)
+        if mode is None:
+            return None
+        if mode == "exact":
+            return queryset.count()
+        if mode == "estimate":
+            return estimate_count(queryset)
+        raise ValidationError(
+            {self.count_query_param: "Expected 'exact' or 'estimate'."}
+        )
+
+    async def aget_count(self, queryset, request):
+        if request.query_params.get(self.count_query_param) == "exact":
+            return await queryset.acount()
+        if self.count_query_param not in request.query_params:
+            return None
+        return await sync_to_async(self.get_count)(queryset, request)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = self.get_count(queryset, request)
+        return self.get_page(list(self.get_page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """``paginate_queryset`` through the async ORM, for the async views."""
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = await self.aget_count(queryset, request)
+        page_queryset = self.get_page_queryset(queryset, request)
+        return self.get_page([row async for row in page_queryset])
+
+    def get_page_queryset(self, queryset, request):
+        """Return the unevaluated query for the page and one row past it."""
+        queryset = queryset.order_by(*KEYSET_ORDERING)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(after_cursor(cursor))
+        return queryset[: self.page_size + 1]
+
+    def get_page(self, rows):
+        self.has_next = len(rows) > self.page_size
+        page = rows[: self.page_size]
+        self.next_cursor = encode_cursor(page[-1]) if self.has_next else None
+        return page
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.count_query_param)
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        payload = {"next": self.get_next_link(), "next_cursor": self.next_cursor}
+        if self.count is not None:
+            payload["count"] = self.count
+        payload["results"] = data
+        return Response(payload)
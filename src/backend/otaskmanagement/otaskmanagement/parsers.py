@@ -0,0 +1,45 @@
+"""
+orjson backed JSON parser for the REST API.
+
+Enabled through ``USE_ORJSON`` in settings, next to ORJSONRenderer.
+"""
+
+import io
+import re
+
+import orjson
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from otaskmanagement.renderers import ORJSONRenderer
+
+UTF8_NAMES = ("utf-8", "utf8")
+# orjson reads integers wider than 64 bits as floats; leave any body with
+# a 19+ digit run to the stdlib parser, which keeps them exact.
+LONG_NUMBER = re.compile(rb"[0-9]{19}")
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser decoding with orjson.
+
+    Bodies orjson rejects, or might read differently, are handed to the
+    stock parser, which either accepts them or raises the same ParseError
+    clients get today.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if encoding.lower() not in UTF8_NAMES:
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if not LONG_NUMBER.search(body):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
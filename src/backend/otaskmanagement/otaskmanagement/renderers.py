@@ -0,0 +1,68 @@
+"""
+orjson backed JSON renderer for the REST API.
+
+Enabled through ``USE_ORJSON`` in settings. UUIDs, dates, datetimes and
+dicts are encoded natively by orjson, and everything else goes through
+DRF's own encoder, so responses are byte for byte the ones the stock
+JSONRenderer produces with the default compact, unicode settings.
+"""
+
+import re
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+# Floats that orjson writes in a different notation than Python's repr():
+# exponents ("1e16" for "1e+16") and small fixed-point ("0.000025" for
+# "2.5e-05"). One pattern per character a number can follow, because
+# patterns starting with a literal are scanned much faster. Strings may
+# match too, which only costs a re-render.
+REPR_MISMATCHES = tuple(
+    re.compile(prefix + rb"-?(?:[0-9][0-9.]*e|0\.0000)")
+    for prefix in (rb":", rb",", rb"\[")
+)
+
+
+def has_repr_mismatch(content):
+    return any(pattern.search(content) for pattern in REPR_MISMATCHES)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson.
+
+    Indented output (the browsable API, ``; indent=`` media types),
+    ASCII-only or non-compact settings, and payloads orjson refuses, such
+    as integers wider than 64 bits, are rendered by the stock renderer, as
+    are the rare payloads holding floats that need exponent notation.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+    default = staticmethod(encoders.JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        if (
+            isinstance(data, float)
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if has_repr_mismatch(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, keeping the output a JavaScript subset.
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
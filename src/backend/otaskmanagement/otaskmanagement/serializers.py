@@ -0,0 +1,181 @@
+"""
+Read-only fast path for list endpoints.
+
+A ``ValuesPlan`` is derived once from a ``ModelSerializer`` class: each
+readable field becomes a ``.values()`` column and the field's own
+``to_representation``, so rows are rendered straight from the database
+tuples without building model instances or walking DRF's per-field
+machinery, while producing exactly the same output as the serializer.
+Serializers with fields that cannot be read from a single column
+(nested serializers, method fields, properties, dotted sources) have no
+plan and keep using the regular serializer.
+"""
+
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, PKOnlyObject, RelatedField
+
+
+class ValuesPlan:
+    """Precomputed columns and converters for one serializer class."""
+
+    def __init__(self, model, fields, many_fields):
+        self.model = model
+        self.pk_column = model._meta.pk.attname
+        # (output name, values() column, converter)
+        self.fields = fields
+        # (output name, related model, related query name, converter)
+        self.many_fields = many_fields
+        columns = [column for _, column, _ in fields if column is not None]
+        for column in (self.pk_column, "created_at", "updated_at"):
+            if column not in columns and _has_field(model, column):
+                columns.append(column)
+        self.columns = columns
+
+    def values(self, queryset):
+        """Turn the view's queryset into the rows this plan renders."""
+        return queryset.values(*self.columns)
+
+    def related_values(self, rows):
+        """Load every many-to-many field for a page of rows, one query each."""
+        pks = [row[self.pk_column] for row in rows]
+        related = {}
+        for name, model, query_name, convert in self.many_fields:
+            grouped = {}
+            for owner, pk in _related_pairs(model, query_name, pks):
+                grouped.setdefault(owner, []).append(convert(pk))
+            related[name] = grouped
+        return related
+
+    async def arelated_values(self, rows):
+        """``related_values`` through the async ORM."""
+        pks = [row[self.pk_column] for row in rows]
+        related = {}
+        for name, model, query_name, convert in self.many_fields:
+            grouped = {}
+            async for owner, pk in _related_pairs(model, query_name, pks):
+                grouped.setdefault(owner, []).append(convert(pk))
+            related[name] = grouped
+        return related
+
+    async def arender(self, rows):
+        """Render rows already fetched by an async view."""
+        if self.many_fields and rows:
+            return self.render(rows, await self.arelated_values(rows))
+        return self.render(rows, {})
+
+    def render(self, rows, related=None):
+        rows = list(rows)
+        if related is None:
+            related = self.related_values(rows) if self.many_fields and rows else {}
+        pk_column = self.pk_column
+        fields = self.fields
+        data = []
+        for row in rows:
+            item = {}
+            for name, column, convert in fields:
+                if column is None:
+                    item[name] = related[name].get(row[pk_column], [])
+                    continue
+                value = row[column]
+                item[name] = None if value is None else convert(value)
+            data.append(item)
+        return data
+
+
+def _related_pairs(model, query_name, pks):
+    return model._default_manager.filter(**{f"{query_name}__in": pks}).values_list(
+        query_name, "pk"
+    )
+
+
+def _has_field(model, name):
+    try:
+        model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def _pk_converter(field):
+    if field.pk_field is None:
+        # PrimaryKeyRelatedField renders the bare primary key.
+        return _identity
+    return lambda pk: field.to_representation(PKOnlyObject(pk=pk))
+
+
+def _identity(value):
+    return value
+
+
+def _converter(field):
+    """
+    Return the cheapest callable equivalent to ``field.to_representation``
+    for values read from the field's own column.
+    """
+    field_type = type(field)
+    if field_type is serializers.CharField or field_type is serializers.EmailField:
+        return str
+    if field_type is serializers.UUIDField and field.uuid_format == "hex_verbose":
+        return str
+    if field_type is serializers.BooleanField:
+        return _identity
+    if field_type is serializers.IntegerField:
+        return int
+    return field.to_representation
+
+
+@lru_cache(maxsize=None)
+def get_values_plan(serializer_class):
+    """
+    Return the ``ValuesPlan`` of a serializer class, or None when one of
+    its fields cannot be rendered from a ``.values()`` row.
+    """
+    if not issubclass(serializer_class, serializers.ModelSerializer):
+        return None
+
+    model = serializer_class.Meta.model
+    serializer = serializer_class()
+    fields, many_fields = [], []
+
+    for field in serializer._readable_fields:
+        if len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+
+        if isinstance(field, ManyRelatedField):
+            child = field.child_relation
+            if not model_field.many_to_many or not model_field.concrete:
+                return None
+            if not isinstance(child, serializers.PrimaryKeyRelatedField):
+                return None
+            many_fields.append(
+                (
+                    field.field_name,
+                    model_field.related_model,
+                    model_field.related_query_name(),
+                    _pk_converter(child),
+                )
+            )
+            fields.append((field.field_name, None, None))
+        elif isinstance(field, RelatedField):
+            if not isinstance(field, serializers.PrimaryKeyRelatedField):
+                return None
+            if not (model_field.many_to_one or model_field.one_to_one):
+                return None
+            fields.append((field.field_name, field.source, _pk_converter(field)))
+        elif isinstance(
+            field, (serializers.BaseSerializer, serializers.SerializerMethodField)
+        ):
+            return None
+        else:
+            if model_field.is_relation or not model_field.concrete:
+                return None
+            fields.append((field.field_name, field.source, _converter(field)))
+
+    return ValuesPlan(model, fields, many_fields)
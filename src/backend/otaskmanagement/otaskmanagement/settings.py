@@ -3,6 +3,7 @@ import os
 import dj_database_url
 from pathlib import Path
 from datetime import timedelta
+from celery.schedules import crontab
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 STATIC_URL = 'static/'
@@ -45,6 +46,7 @@ DJANGO_SYSTEM_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",
 ]
 
 ALLAUTH_APPS = [
@@ -81,6 +83,8 @@ PROJECT_APP_LABELS = {app.split(".")[-1] for app in PROJECT_APPS}
 # Middleware
 # ------------------------------------------------------------------ #
 MIDDLEWARE = [
+    "otaskmanagement.metrics.QueryMetricsMiddleware",
+    "common.activity.ActivityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -156,11 +160,92 @@ CELERY_TIMEZONE = "Asia/Ho_Chi_Minh"
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+CELERY_BEAT_SCHEDULE = {
+    "snapshot-sprint-burndown": {
+        "task": "issues.tasks.snapshot_sprints",
+        "schedule": crontab(hour=23, minute=55),
+    },
+    "archive-closed-sprints": {
+        "task": "issues.tasks.archive_sprints",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    # Catches activity log entries whose scheduled flush was lost.
+    "flush-activity-log": {
+        "task": "common.tasks.flush_activity_log",
+        "schedule": 60.0,
+    },
+}
+
 # ------------------------------------------------------------------ #
-# URLs / WSGI
+# Cache
+# ------------------------------------------------------------------ #
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# Shared (Redis) and in-process lifetimes of cached project roles, in seconds
+PERMISSION_CACHE_TIMEOUT = int(os.getenv("PERMISSION_CACHE_TIMEOUT", 300))
+PERMISSION_CACHE_LOCAL_TTL = int(os.getenv("PERMISSION_CACHE_LOCAL_TTL", 30))
+
+# Lifetime of a user's cached "my work" pages, in seconds
+MY_WORK_CACHE_TIMEOUT = int(os.getenv("MY_WORK_CACHE_TIMEOUT", 30))
+
+# Issues of sprints closed and ended this many days ago move to the archive,
+# ISSUE_ARCHIVE_BATCH_SIZE issues per transaction
+ISSUE_ARCHIVE_AFTER_DAYS = int(os.getenv("ISSUE_ARCHIVE_AFTER_DAYS", 90))
+ISSUE_ARCHIVE_BATCH_SIZE = int(os.getenv("ISSUE_ARCHIVE_BATCH_SIZE", 1000))
+
+# Activity log entries wait in Redis this many seconds before a Celery task
+# writes them, in inserts of at most ACTIVITY_LOG_BATCH_SIZE rows
+ACTIVITY_LOG_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_LOG_FLUSH_INTERVAL", 5))
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", 1000))
+
+# Request metrics served on /metrics/: the fraction of requests whose SQL
+# queries are recorded, how often one query shape may repeat in a request
+# before it counts as a suspected N+1, and the scraper's bearer token
+METRICS_ENABLED = str(os.getenv("METRICS_ENABLED", "1")).lower() in (
+    "1",
+    "true",
+    "yes",
+    "on",
+)
+METRICS_SAMPLE_RATE = float(os.getenv("METRICS_SAMPLE_RATE", 0.1))
+METRICS_N_PLUS_ONE_THRESHOLD = int(os.getenv("METRICS_N_PLUS_ONE_THRESHOLD", 5))
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Live change events: quiet period and longest hold before a merged event
+# is sent, and the interval of keepalive comments, in seconds
+LIVE_EVENTS_DEBOUNCE = float(os.getenv("LIVE_EVENTS_DEBOUNCE", 0.5))
+LIVE_EVENTS_MAX_DELAY = float(os.getenv("LIVE_EVENTS_MAX_DELAY", 2))
+LIVE_EVENTS_KEEPALIVE = float(os.getenv("LIVE_EVENTS_KEEPALIVE", 15))
+
+# ------------------------------------------------------------------ #
+# URLs / WSGI / ASGI
 # ------------------------------------------------------------------ #
 ROOT_URLCONF = "otaskmanagement.urls"
 WSGI_APPLICATION = "otaskmanagement.wsgi.application"
+ASGI_APPLICATION = "otaskmanagement.asgi.application"
+
+# Serve the hot read endpoints (projects, memberships, sprints) from async
+# views. Only useful when running asgi.py under uvicorn workers.
+ASYNC_READ_VIEWS = str(os.getenv("ASYNC_READ_VIEWS", "0")).lower() in (
+    "1",
+    "true",
+    "yes",
+    "on",
+)
 
 # ------------------------------------------------------------------ #
 # Templates
@@ -203,6 +288,24 @@ else:
         }
     }
 
+# Pooled connections (psycopg 3). Each web or Celery worker process keeps
+# at most DB_POOL_MAX_SIZE connections and waits DB_POOL_TIMEOUT seconds
+# for a free one before failing. With a pool, Django (>= 5.1) turns
+# CONN_HEALTH_CHECKS into the pool's check=ConnectionPool.check_connection,
+# so connections are checked on checkout; passing "check" in the pool
+# options as well is rejected as a duplicate argument.
+DB_POOL = str(os.getenv("DB_POOL", "1")).lower() in ("1", "true", "yes", "on")
+
+if DB_POOL:
+    DATABASES["default"].update(CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=True)
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 1)),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 4)),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+        "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", 1800)),
+    }
+
 # ------------------------------------------------------------------ #
 # Password validation
 # ------------------------------------------------------------------ #
@@ -241,11 +344,31 @@ DJ_REST_AUTH = {"TOKEN_MODEL": None}
 
 REST_AUTH_TOKEN_MODEL = None
 
+# orjson renderer/parser, byte compatible with DRF's stdlib JSON ones.
+USE_ORJSON = str(os.getenv("USE_ORJSON", "1")).lower() in ("1", "true", "yes", "on")
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_RENDERER_CLASSES": (
+        (
+            "otaskmanagement.renderers.ORJSONRenderer"
+            if USE_ORJSON
+            else "rest_framework.renderers.JSONRenderer"
+        ),
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        (
+            "otaskmanagement.parsers.ORJSONParser"
+            if USE_ORJSON
+            else "rest_framework.parsers.JSONParser"
+        ),
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
 }
 
 SIMPLE_JWT = {
@@ -13,9 +13,13 @@ from django.urls import path, include
 from dj_rest_auth.views import PasswordResetView, PasswordResetConfirmView
 from rest_framework_simplejwt.views import TokenRefreshView
 
+from common.api import DatabasePoolStats
+from otaskmanagement.metrics import metrics_view
 from users.allauth import GoogleLogin, me_google
 
+import common.urls
 import issues.urls
+import project.urls
 import users.tests
 
 
@@ -50,9 +54,16 @@ urlpatterns = [
     path("<uuid:project_id>/", include([
         path("user/", include("users.urls")),
         path("sprint/", include(issues.urls.sprint_api_urls)),
+        path("board/", include(issues.urls.board_api_urls)),
+        path("issues/", include(issues.urls.issue_api_urls)),
+        path("events/", include(project.urls.event_api_urls)),
+        path("activity/", include(common.urls.activity_api_urls)),
     ])),
+    path("my-work/", include(issues.urls.my_work_api_urls)),
     path("email-invite/", include("common.urls")),
     path("project/", include("project.urls")),
+    path("health/db-pool/", DatabasePoolStats.as_view(), name="db-pool-stats"),
+    path("metrics/", metrics_view, name="metrics"),
     # -------------------------
     # API Testing
     # -------------------------
@@ -1,7 +1,15 @@
 """Provides JSON API endpoints for the Project app."""
 
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views import View
 from rest_framework import permissions
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
 
+from otaskmanagement.async_views import AsyncReadView
+from otaskmanagement.events import event_stream
 from otaskmanagement.mixins import OtaskMixinDetailView, ListAPI
 from otaskmanagement.permissions import CheckAPIPermission
 
@@ -12,6 +20,7 @@ from .serializers import (
 )
 from .models import Project, ProjectMembership
 from otaskmanagement.utils import METHOD
+from users.permissions import has_user_permission
 
 
 class ProjectAPIView(ListAPI):
@@ -21,6 +30,8 @@ class ProjectAPIView(ListAPI):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     required_permission = "view_project"
+    # The serialized members come from the memberships.
+    conditional_related = ("project_memberships",)
 
 
 class ProjectMembershipAPIView(OtaskMixinDetailView):
@@ -47,3 +58,67 @@ class ProjectMembershipAPIView(OtaskMixinDetailView):
         response = super().patch(request, *args, **kwargs)
         response.data = {"MESSAGE": "SUCCESSFULLY", "DATA": response.data}
         return response
+
+
+class AsyncProjectAPIView(AsyncReadView):
+    sync_view = ProjectAPIView
+
+
+class AsyncProjectMembershipAPIView(AsyncReadView):
+    sync_view = ProjectMembershipAPIView
+
+
+class ProjectEventStream(View):
+    """
+    Server-Sent Events stream of a project's issue, sprint and membership
+    changes, see ``otaskmanagement.events``.
+
+    Browsers' EventSource cannot set headers, so the access token may
+    also be passed as the ``access_token`` query parameter. The stream
+    holds its connection open and is only served under ASGI.
+    """
+
+    required_permission = "view_project"
+
+    async def get(self, request, project_id):
+        if not isinstance(request, ASGIRequest):
+            return JsonResponse(
+                {"detail": "Live events are only served by the ASGI application."},
+                status=501,
+            )
+
+        user = await sync_to_async(self.authenticate)(request)
+        if user is None:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=401,
+            )
+        allowed = await sync_to_async(has_user_permission)(
+            user, project_id, self.required_permission
+        )
+        if not allowed:
+            return JsonResponse(
+                {"detail": "You do not have permission to perform this action."},
+                status=403,
+            )
+
+        response = StreamingHttpResponse(
+            event_stream(project_id), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # Keep nginx from buffering the stream.
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    @staticmethod
+    def authenticate(request):
+        authentication = JWTAuthentication()
+        try:
+            raw_token = request.GET.get("access_token")
+            if raw_token:
+                token = authentication.get_validated_token(raw_token.encode())
+                return authentication.get_user(token)
+            result = authentication.authenticate(request)
+        except APIException:
+            return None
+        return result[0] if result else None
@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class ProjectConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'project'
+
+    def ready(self):
+        from common.activity import track_activity
+        from common.models import ActivityTargetEnum
+        from project.signals import membership_changed
+
+        membership = self.get_model("ProjectMembership")
+        post_save.connect(membership_changed, sender=membership)
+        post_delete.connect(membership_changed, sender=membership)
+        track_activity(membership, ActivityTargetEnum.MEMBERSHIP)
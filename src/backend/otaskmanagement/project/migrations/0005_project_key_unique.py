@@ -0,0 +1,81 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:18
+
+import sys
+
+from django.db import migrations, models
+from django.db.models import Count, Value
+from django.db.models.functions import Concat, Substr
+
+
+def rekey_duplicate_projects(apps, schema_editor):
+    """
+    Give every project but the oldest of each duplicated key a free
+    ``<key><n>`` key, and move its issue keys to the new prefix.
+
+    Issue numbers are kept, so each project's IssueKeySequence only has to
+    be raised to the highest number its issues already use.
+    """
+    Project = apps.get_model("project", "Project")
+    Issues = apps.get_model("issues", "Issues")
+    ArchivedIssue = apps.get_model("issues", "ArchivedIssue")
+    IssueKeySequence = apps.get_model("issues", "IssueKeySequence")
+
+    duplicated = (
+        Project.objects.values("key")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .values_list("key", flat=True)
+    )
+    taken = set(Project.objects.values_list("key", flat=True))
+
+    for key in sorted(duplicated):
+        projects = Project.objects.filter(key=key).order_by("created_at", "id")
+        for project in projects[1:]:
+            suffix = 2
+            while f"{key}{suffix}" in taken:
+                suffix += 1
+            new_key = f"{key}{suffix}"
+            taken.add(new_key)
+
+            Project.objects.filter(pk=project.pk).update(key=new_key)
+            last_value = 0
+            for model in (Issues, ArchivedIssue):
+                issues = model.objects.filter(
+                    project=project, key__startswith=f"{key}-"
+                )
+                issues.update(
+                    key=Concat(Value(f"{new_key}-"), Substr("key", len(key) + 2))
+                )
+                for issue_key in model.objects.filter(project=project).values_list(
+                    "key", flat=True
+                ):
+                    number = issue_key.rpartition("-")[2]
+                    if number.isdigit():
+                        last_value = max(last_value, int(number))
+
+            sequence, _ = IssueKeySequence.objects.get_or_create(project=project)
+            if sequence.last_value < last_value:
+                sequence.last_value = last_value
+                sequence.save(update_fields=["last_value"])
+
+            sys.stdout.write(
+                f"\n  Project {project.pk} ({project.name}) re-keyed "
+                f"from {key} to {new_key}"
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("project", "0004_remove_projectmembership_access_project_access_and_more"),
+        ("issues", "0012_issues_hash_partitioning"),
+    ]
+
+    operations = [
+        migrations.RunPython(rekey_duplicate_projects, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="project",
+            name="key",
+            field=models.CharField(unique=True, verbose_name="Project key"),
+        ),
+    ]
@@ -3,7 +3,7 @@
 from django.conf import settings
 
 from django.db import models
-from otaskmanagement.models import BaseModel
+from otaskmanagement.models import BaseModel, LoadedValuesMixin
 from django.utils.translation import gettext_lazy as _
 from users.ruleset import RoleEnum
 
@@ -20,7 +20,8 @@ class Project(BaseModel):
     """Model for Project"""
 
     name = models.CharField(verbose_name=_("Project name"))
-    key = models.CharField(verbose_name=_("Project key"))
+    # Issue keys are "<key>-<n>", so project keys must not repeat.
+    key = models.CharField(unique=True, verbose_name=_("Project key"))
     members = models.ManyToManyField(
         settings.AUTH_USER_MODEL,
         through="ProjectMembership",
@@ -35,7 +36,7 @@ class Project(BaseModel):
         return f"{self.name} - {self.key}"
 
 
-class ProjectMembership(BaseModel):
+class ProjectMembership(LoadedValuesMixin, BaseModel):
     """Model for ProjectMembership"""
 
     member = models.ForeignKey(
@@ -0,0 +1,5 @@
+from otaskmanagement.events import queue_change
+
+
+def membership_changed(sender, instance, **kwargs):
+    queue_change(instance.project_id, "memberships", instance.pk)
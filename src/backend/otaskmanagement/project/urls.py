@@ -1,18 +1,28 @@
 """Provides URLs for the Project app."""
 
 from django.urls import path
-from .api import ProjectMembershipAPIView, ProjectAPIView
+from otaskmanagement.async_views import read_view
+
+from .api import (
+    AsyncProjectAPIView,
+    AsyncProjectMembershipAPIView,
+    ProjectEventStream,
+)
 
 urlpatterns = [
-    path("", ProjectAPIView.as_view(), name="project-list"),
+    path("", read_view(AsyncProjectAPIView), name="project-list"),
     path(
         "managed/",
-        ProjectMembershipAPIView.as_view(),
+        read_view(AsyncProjectMembershipAPIView),
         name="project-membership-list-create",
     ),
     path(
         "managed/<uuid:pk>/",
-        ProjectMembershipAPIView.as_view(),
+        read_view(AsyncProjectMembershipAPIView),
         name="project-membership-detail",
     ),
 ]
+
+event_api_urls = [
+    path("", ProjectEventStream.as_view(), name="project-event-stream"),
+]
@@ -1,10 +1,12 @@
 # api/views.py
 from rest_framework import generics
 
+from otaskmanagement.mixins import ValuesListMixin
+
 from .serializers import UserSerializer
 from .models import CustomUser as User
 
 
-class UserAPIView(generics.ListAPIView):
+class UserAPIView(ValuesListMixin, generics.ListAPIView):
     serializer_class = UserSerializer
     queryset = User.objects.all()
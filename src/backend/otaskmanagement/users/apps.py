@@ -1,10 +1,29 @@
-from django.apps import AppConfig
-from django.db.models.signals import post_migrate
+from django.apps import AppConfig, apps
+from django.conf import settings
+from django.db.models.signals import post_migrate, post_save, post_delete
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
     
     def ready(self):
-        from users.signals import seed_role_permissions
-        post_migrate.connect(seed_role_permissions, sender=self)
+        from users.signals import (
+            seed_role_permissions,
+            invalidate_role_permissions,
+            invalidate_membership_roles,
+        )
+        # Seed once the last project app has had its permissions created.
+        project_apps = [
+            config
+            for config in apps.get_app_configs()
+            if config.label in settings.PROJECT_APP_LABELS
+        ]
+        post_migrate.connect(seed_role_permissions, sender=project_apps[-1])
+
+        role_permission = self.get_model("RolePermission")
+        post_save.connect(invalidate_role_permissions, sender=role_permission)
+        post_delete.connect(invalidate_role_permissions, sender=role_permission)
+
+        membership = "project.ProjectMembership"
+        post_save.connect(invalidate_membership_roles, sender=membership)
+        post_delete.connect(invalidate_membership_roles, sender=membership)
@@ -1,3 +1,145 @@
+"""
+Resolves project scoped permissions for a user.
+
+A user's permissions inside a project come from the role of their
+ProjectMembership, and each role maps to a set of Permission codenames
+through RolePermission. Both lookups are cached in two tiers: a short
+lived in-process tier and the shared Django cache (Redis in deployment),
+so a warm permission check does not hit the database at all.
+"""
+
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+ROLE_PERMISSIONS_CACHE_KEY = "users:role-permissions"
+MEMBERSHIP_ROLES_CACHE_KEY = "users:membership-roles:{user_id}"
+
+
+class PermissionResolver:
+    """
+    Caches role -> permission codenames and user -> {project: role}.
+
+    The in-process tier is only trusted for ``local_ttl`` seconds, which
+    bounds how long another process can serve a stale entry after an
+    invalidation. The shared tier is cleared directly by the signals.
+    """
+
+    def __init__(self, timeout=None, local_ttl=None, max_local_entries=10000):
+        self.timeout = timeout
+        self.local_ttl = local_ttl
+        self.max_local_entries = max_local_entries
+        self._local = {}
+        self._lock = threading.Lock()
+
+    def _get_timeout(self):
+        if self.timeout is not None:
+            return self.timeout
+        return getattr(settings, "PERMISSION_CACHE_TIMEOUT", 300)
+
+    def _get_local_ttl(self):
+        if self.local_ttl is not None:
+            return self.local_ttl
+        return getattr(settings, "PERMISSION_CACHE_LOCAL_TTL", 30)
+
+    def _local_get(self, key):
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._local.pop(key, None)
+            return None
+        return value
+
+    def _local_set(self, key, value):
+        with self._lock:
+            if len(self._local) >= self.max_local_entries:
+                self._local.clear()
+            self._local[key] = (time.monotonic() + self._get_local_ttl(), value)
+
+    def _get(self, key, loader):
+        value = self._local_get(key)
+        if value is not None:
+            return value
+
+        value = cache.get(key)
+        if value is None:
+            value = loader()
+            cache.set(key, value, self._get_timeout())
+
+        self._local_set(key, value)
+        return value
+
+    def _delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+        cache.delete_many(keys)
+
+    def role_permissions(self):
+        """Return ``{role: frozenset(codenames)}`` for every role."""
+        return self._get(ROLE_PERMISSIONS_CACHE_KEY, self._load_role_permissions)
+
+    def membership_roles(self, user_id):
+        """Return ``{project_id: role}`` for every project of the user."""
+        key = MEMBERSHIP_ROLES_CACHE_KEY.format(user_id=user_id)
+        return self._get(key, lambda: self._load_membership_roles(user_id))
+
+    def get_role(self, user, project):
+        """Return the user's role in the project, or None if not a member."""
+        project_id = getattr(project, "pk", project)
+        if project_id is None:
+            return None
+        return self.membership_roles(user.pk).get(str(project_id))
+
+    def has_permission(self, user, project, permission):
+        """Check if the user's project role grants the permission codename."""
+        if not user or not user.is_authenticated:
+            return False
+        if user.is_superuser:
+            return True
+
+        role = self.get_role(user, project)
+        if role is None:
+            return False
+        return permission in self.role_permissions().get(role, ())
+
+    def invalidate_role_permissions(self):
+        self._delete(ROLE_PERMISSIONS_CACHE_KEY)
+
+    def invalidate_membership(self, user_id):
+        self._delete(MEMBERSHIP_ROLES_CACHE_KEY.format(user_id=user_id))
+
+    def clear_local(self):
+        with self._lock:
+            self._local.clear()
+
+    @staticmethod
+    def _load_role_permissions():
+        from users.models import RolePermission
+
+        mapping = {}
+        rows = RolePermission.objects.values_list("role", "permission__codename")
+        for role, codename in rows:
+            mapping.setdefault(role, set()).add(codename)
+        return {role: frozenset(codenames) for role, codenames in mapping.items()}
+
+    @staticmethod
+    def _load_membership_roles(user_id):
+        from project.models import ProjectMembership
+
+        rows = ProjectMembership.objects.filter(member_id=user_id).values_list(
+            "project_id", "role"
+        )
+        return {str(project_id): role for project_id, role in rows}
+
+
+resolver = PermissionResolver()
+
+
 def has_user_permission(user, project, permission):
-    print(user, project, permission)
-    """"""
\ No newline at end of file
+    """Return True if the user holds the permission inside the project."""
+    return resolver.has_permission(user, project, permission)
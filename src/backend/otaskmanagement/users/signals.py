@@ -1,27 +1,84 @@
+import sys
+from functools import partial
+
 from django.conf import settings
-from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth.models import Permission
+from django.db import transaction
 from users.models import RolePermission, RoleEnum
 
 
-def seed_role_permissions(sender, **kwargs):
-    content_type = ContentType.objects.filter(app_label__in=settings.PROJECT_APP_LABELS)
-    permission = Permission.objects.filter(content_type__in=content_type)
-    
+ROLE_PERMISSION_RULES = {
+    RoleEnum.ADMINISTRATOR: lambda codename: True,
+    RoleEnum.MEMBER: lambda codename: codename.endswith("issues"),
+    RoleEnum.VIEWER: lambda codename: codename.startswith("view_"),
+}
+
+
+def seed_role_permissions(sender, verbosity=1, stdout=None, **kwargs):
+    """
+    Sync RolePermission rows with ROLE_PERMISSION_RULES.
+
+    The wanted (role, permission) pairs are diffed against the existing
+    rows, so a migrate costs a fixed number of queries however many
+    models the project apps define.
+    """
+    permissions = Permission.objects.filter(
+        content_type__app_label__in=settings.PROJECT_APP_LABELS
+    ).values_list("id", "codename")
 
-    mapping = {
-        RoleEnum.ADMINISTRATOR: permission,
-        RoleEnum.MEMBER: permission.filter(
-            codename__endswith="issues"
-        ),
-        RoleEnum.VIEWER: permission.filter(
-            codename__startswith="view_"
-        ),
+    wanted = {
+        (role, permission_id)
+        for permission_id, codename in permissions
+        for role, rule in ROLE_PERMISSION_RULES.items()
+        if rule(codename)
     }
+    existing = {
+        (role, permission_id): pk
+        for pk, role, permission_id in RolePermission.objects.values_list(
+            "id", "role", "permission_id"
+        )
+    }
+
+    to_create = wanted - existing.keys()
+    to_delete = [pk for pair, pk in existing.items() if pair not in wanted]
+
+    if to_create:
+        RolePermission.objects.bulk_create(
+            [
+                RolePermission(role=role, permission_id=permission_id)
+                for role, permission_id in to_create
+            ],
+            ignore_conflicts=True,
+        )
+    if to_delete:
+        RolePermission.objects.filter(pk__in=to_delete).delete()
+
+    if to_create or to_delete:
+        invalidate_role_permissions(sender)
+
+    if verbosity >= 1 and (to_create or to_delete):
+        (stdout or sys.stdout).write(
+            f"Role permissions: {len(to_create)} added, {len(to_delete)} removed\n"
+        )
+
+    return {"created": len(to_create), "deleted": len(to_delete)}
+
+
+def invalidate_role_permissions(sender, **kwargs):
+    """
+    Drop the cached role permissions once the change is committed.
+
+    Deleting inside the writing transaction would let a concurrent
+    request reload and re-cache the rows it can still see as they were.
+    """
+    from users.permissions import resolver
+
+    transaction.on_commit(resolver.invalidate_role_permissions, robust=True)
+
+
+def invalidate_membership_roles(sender, instance, **kwargs):
+    from users.permissions import resolver
 
-    for role, perms in mapping.items():
-        for perm in perms:
-            RolePermission.objects.get_or_create(
-                role=role,
-                permission=perm,
-            )
+    transaction.on_commit(
+        partial(resolver.invalidate_membership, instance.member_id), robust=True
+    )
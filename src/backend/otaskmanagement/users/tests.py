@@ -5,8 +5,13 @@ from django.contrib.contenttypes.models import ContentType
 from django.contrib.auth.models import Permission
 from django.urls import path
 from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
 
+from project.models import Project, ProjectMembership
 from users.models import CustomUser
+from users.permissions import has_user_permission, resolver
+from users.ruleset import RoleEnum
 
 # class TestPermissionSerializer(serializers.ModelSerializer):
 #     class Meta:
@@ -43,3 +48,39 @@ class TestCelery(APIView):
 api_test_urls = [
     path("test-api/", TestCelery.as_view(), name="api-testing"),
 ]
+
+
+class PermissionInvalidationTests(TestCase):
+    """Membership changes reach the cached permissions once committed."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.project = Project.objects.create(name="PERM project", key="PERM")
+        cls.user = CustomUser.objects.create_user(
+            email="member@example.com", password="secret"
+        )
+
+    def setUp(self):
+        cache.clear()
+        resolver.clear_local()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.membership = ProjectMembership.objects.create(
+                member=self.user, project=self.project, role=RoleEnum.MEMBER
+            )
+        self.assertTrue(self.can_change())
+
+    def can_change(self):
+        return has_user_permission(self.user, self.project, "change_issues")
+
+    def test_role_change_waits_for_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.membership.role = RoleEnum.VIEWER
+            self.membership.save()
+            self.assertTrue(self.can_change())
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(self.can_change())
+
+    def test_membership_delete_takes_effect(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.membership.delete()
+        self.assertFalse(self.can_change())